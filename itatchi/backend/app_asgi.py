@@ -0,0 +1,68 @@
+# itatchi/backend/app_asgi.py
+# Ponto de entrada ASGI alternativo (Starlette + SQLAlchemy asyncio).
+# Serve as rotas de documentos e o canal SSE (/eventos) com handlers assíncronos
+# (um ouvinte ocioso não ocupa thread); todas as outras rotas
+# (arquivos, vínculos, alertas, matriz, busca, relatórios, tendências...) caem na
+# app Flask (app_backend.py), montada por baixo via WSGI: BACKEND_MODO=asgi expõe
+# a mesma API que o Flask, inclusive o /pronto (healthcheck do docker-compose).
+#
+# Execução: uvicorn app_asgi:app --host 0.0.0.0 --port 5000
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import text
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.wsgi import WSGIMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Mount, Route
+
+from database.async_connection import banco_async
+from routes.documentos_async_routes import rotas_documentos
+from routes.eventos_async_routes import rotas_eventos
+import logic.conformidade  # noqa: F401 -- registra o listener do rollup por entidade
+from app_backend import app as app_flask
+from logic.prontidao import conexoes_aquecidas, prontidao
+
+
+@asynccontextmanager
+async def ciclo_de_vida(app: Starlette) -> AsyncIterator[None]:
+    """
+    Cria o engine assíncrono na subida e devolve as conexões do pool na parada.
+    O pool dele entra no aquecimento compartilhado com o Flask (mesmo /pronto).
+    """
+    await banco_async.iniciar()
+    prontidao.adicionar_etapa(
+        "pool_async", lambda: banco_async.aquecer_pool_de_outra_thread(conexoes_aquecidas())
+    )
+    yield
+    await banco_async.encerrar()
+
+
+async def index(request: Request) -> PlainTextResponse:
+    """Retorna uma mensagem de status simples para verificar se a API está no ar."""
+    return PlainTextResponse("API Itatchi (ASGI) está no ar. Use /documentos para listar documentos.")
+
+
+async def test_db(request: Request) -> PlainTextResponse:
+    """Tenta executar uma query simples no banco para testar a conexão."""
+    try:
+        async with banco_async.sessao() as sessao:
+            await sessao.execute(text("SELECT 1"))
+        return PlainTextResponse("✅ Conexão com o banco MySQL OK!")
+    except Exception as e:
+        return PlainTextResponse(f"❌ Erro ao conectar: {e}")
+
+
+app = Starlette(
+    routes=[
+        Route("/", index), Route("/test_db", test_db), *rotas_documentos, *rotas_eventos,
+        # Demais rotas (e métodos sem handler assíncrono) atendidas pelo Flask numa thread do pool
+        Mount("/", WSGIMiddleware(app_flask)),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])],
+    lifespan=ciclo_de_vida,
+)
@@ -1,19 +1,81 @@
 # itatchi/backend/app_backend.py
 # Ponto de entrada do servidor Flask. Configura o aplicativo e as rotas base.
 
+import logging
+import os
+
 # from itatchi.backend.database.connection import create_app, db -- removido para rodar no docker
 # from itatchi.backend.routes.documentos_routes import documento_bp
 from routes.documentos_routes import documento_bp
+from routes.eventos_routes import eventos_bp
+from routes.arquivos_routes import arquivos_bp
+from routes.vinculos_routes import vinculos_bp
+from routes.conformidade_routes import conformidade_bp
+from routes.busca_routes import busca_bp
+from routes.metricas_routes import metricas_bp
+from routes.relatorios_routes import relatorios_bp
+from routes.referencias_routes import referencias_bp
+from routes.tendencias_routes import tendencias_bp
 from database.connection import create_app, db
+from database.shards import mapa_shards
+from logic.eventos import barramento
+from logic.admissao import controle_admissao
+from logic.gravacao_em_grupo import gravacao_em_grupo
+from logic.relatorios import fila_relatorios
+from logic.prontidao import prontidao
+from logic.tendencias import fotografia_diaria
 
 from sqlalchemy import text # Necessário para executar comandos SQL brutos no SQLAlchemy 2.x
 
+# Logs dos módulos (logging.getLogger(__name__)) na saída do container; LOG_LEVEL ajusta o nível
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
 # Cria a aplicação Flask usando o padrão factory
 app = create_app()
 
+# Sharding por filial (opcional, ativado pela variável SHARD_MAP)
+mapa_shards.init_app(app)
+
+# Controle de admissão das rotas caras (limites ADMISSAO_*; contadores em /metricas)
+controle_admissao.init_app(app)
+app.register_blueprint(metricas_bp)
+
+# Commit em grupo opcional dos cadastros (GRUPO_COMMIT=1)
+gravacao_em_grupo.init_app(app)
+
 # Registra o Blueprint que contém as rotas de documentos (CRUD e alertas)
 app.register_blueprint(documento_bp)
 
+# Canal SSE (/eventos): o barramento usa a app para consultar o log de alterações
+barramento.init_app(app)
+app.register_blueprint(eventos_bp)
+
+# Upload/download dos arquivos dos documentos (armazenamento por SHA-256)
+app.register_blueprint(arquivos_bp)
+
+# Vínculos com motoristas/veículos/locais e conformidade por entidade
+app.register_blueprint(vinculos_bp)
+
+# Matriz de conformidade (filial × tipo obrigatório)
+app.register_blueprint(conformidade_bp)
+
+# Busca textual indexada (/documentos/busca)
+app.register_blueprint(busca_bp)
+
+# Relatórios Excel gerados em segundo plano (jobs e arquivos em RELATORIOS_DIR)
+fila_relatorios.init_app(app)
+app.register_blueprint(relatorios_bp)
+
+# Filiais, tipos e categorias para os formulários (ETag + Cache-Control)
+app.register_blueprint(referencias_bp)
+
+# Fotografia diária de status (status_diario) e séries de tendência (/tendencias)
+fotografia_diaria.init_app(app)
+app.register_blueprint(tendencias_bp)
+
+# Aquecimento em segundo plano (pool do banco e caches); /pronto responde 200 ao terminar
+prontidao.init_app(app)
+
 @app.route("/")
 def index() -> str:
     """Retorna uma mensagem de status simples para verificar se a API está no ar."""
@@ -31,4 +93,7 @@ def test_db() -> str:
 
 if __name__ == '__main__':
     # Inicia o servidor em modo de desenvolvimento (debug=True, porta 5000)
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # threaded=True: uma thread por conexão; cada ouvinte SSE (/eventos) segura a sua
+    # enquanto estiver conectado, então o total de ouvintes é limitado pelas threads
+    # (com BACKEND_MODO=asgi, o /eventos assíncrono do app_asgi não tem esse limite)
+    app.run(host="0.0.0.0", port=5000, debug=True, threaded=True)
@@ -0,0 +1,130 @@
+# itatchi/backend/benchmarks/bench_alertas.py
+# Benchmark da Central de Alertas: grupos inteiros estilizados célula a célula
+# (caminho antigo) x uma página por grupo vinda de GET /alertas com estilo por coluna.
+#
+# Execução (na pasta backend):  python -m benchmarks.bench_alertas [qtd1 qtd2 ...]
+# Usa um SQLite em memória com dados sintéticos; não toca no banco configurado.
+# O "render" é o que o Streamlit faz com um Styler: calcular os estilos e montar
+# a tabela (Styler.to_html cobre os dois passos).
+
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from database.connection import db
+from models.models import Documento, Filial, TipoDocumento
+from logic.documentos import consultar_documentos, contar_documentos
+
+REPETICOES = 3
+POR_PAGINA = 25
+COLUNAS = ["titulo", "validade", "responsavel", "filial", "tipo", "Status de Alerta"]
+ESTILOS_STATUS: Dict[str, str] = {
+    "VENCIDO": "background-color: #ffcccc; color: #cc0000; font-weight: bold;",
+    "A_VENCER": "background-color: #ffecb3; color: #ff9800; font-weight: bold;",
+}
+
+
+def popular(sessao: Session, qtd: int) -> None:
+    """Gera 'qtd' documentos em alerta: 2/3 vencidos e 1/3 a vencer."""
+    sessao.execute(insert(Filial), [{"id": i, "nome": f"Filial {i}", "codigo": f"F{i:02d}"} for i in range(1, 11)])
+    sessao.execute(insert(TipoDocumento), [
+        {"id": i, "categoria": f"Categoria {i % 3}", "nome": f"Tipo {i}", "obrigatorio": True, "prazo_padrao_dias": 365}
+        for i in range(1, 21)
+    ])
+    hoje = date.today()
+    sessao.execute(insert(Documento), [
+        {
+            "filial_id": i % 10 + 1,
+            "tipo_id": i % 20 + 1,
+            "titulo": f"Documento {i}",
+            "responsavel": f"Responsável {i % 50}",
+            "validade": hoje - timedelta(days=i % 700 + 1) if i % 3 else hoje + timedelta(days=i % 30),
+            "status_calc": "VENCIDO" if i % 3 else "A_VENCER",
+        }
+        for i in range(qtd)
+    ])
+    sessao.commit()
+
+
+def style_status(val: str) -> str:
+    """Estilo antigo: uma chamada Python por célula."""
+    return ESTILOS_STATUS.get(val, "")
+
+
+def estilo_status(coluna: pd.Series) -> pd.Series:
+    """Estilo novo: a coluna inteira de uma vez."""
+    return coluna.map(ESTILOS_STATUS).fillna("")
+
+
+def render_antigo(sessao: Session) -> int:
+    """Todos os alertas no navegador: cada grupo completo, estilizado célula a célula."""
+    linhas = 0
+    for status in ("VENCIDO", "A_VENCER"):
+        itens = [r.para_json() for r in consultar_documentos(sessao, None, status)]
+        df = pd.DataFrame(itens).rename(columns={"status": "Status de Alerta"})
+        df[COLUNAS].style.map(style_status, subset=["Status de Alerta"]).to_html()
+        linhas += len(df)
+    return linhas
+
+
+def render_paginado(sessao: Session) -> int:
+    """Primeira página de cada grupo com o total (mesmas consultas do GET /alertas), estilo por coluna."""
+    linhas = 0
+    for status in ("VENCIDO", "A_VENCER"):
+        itens = [r.para_json() for r in consultar_documentos(sessao, None, status, limite=POR_PAGINA)]
+        contar_documentos(sessao, None, status)
+        df = pd.DataFrame(itens).rename(columns={"status": "Status de Alerta"})
+        df[COLUNAS].style.apply(estilo_status, subset=["Status de Alerta"]).to_html()
+        linhas += len(df)
+    return linhas
+
+
+def medir(engine, funcao: Callable[[Session], int]) -> float:
+    """Melhor tempo (s) entre as repetições."""
+    tempos: List[float] = []
+    for _ in range(REPETICOES):
+        with Session(engine) as sessao:
+            inicio = time.perf_counter()
+            funcao(sessao)
+            tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+def main() -> None:
+    tamanhos = [int(a) for a in sys.argv[1:]] or [1_000, 5_000, 20_000]
+
+    # Mesmos estilos nos dois caminhos
+    amostra = pd.DataFrame({"Status de Alerta": ["VENCIDO", "A_VENCER", "VIGENTE"]})
+    assert amostra["Status de Alerta"].map(style_status).tolist() == estilo_status(amostra["Status de Alerta"]).tolist()
+
+    print(f"Melhor de {REPETICOES} execuções; página de {POR_PAGINA} linhas por grupo")
+    print(f"{'alertas':>10}{'antigo (s)':>14}{'paginado (s)':>15}{'ganho':>10}")
+    resultados: List[Dict[str, Any]] = []
+    for qtd in tamanhos:
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        db.metadata.create_all(engine)
+        with Session(engine) as sessao:
+            popular(sessao, qtd)
+        t_antigo = medir(engine, render_antigo)
+        t_novo = medir(engine, render_paginado)
+        resultados.append({"qtd": qtd, "novo": t_novo})
+        print(f"{qtd:>10}{t_antigo:>14.3f}{t_novo:>15.3f}{t_antigo / t_novo:>9.1f}x")
+        engine.dispose()
+
+    # Sem a contagem (O(n) no banco) o tempo paginado não depende do total de alertas
+    primeiro, ultimo = resultados[0], resultados[-1]
+    print(
+        f"paginado: {primeiro['novo'] * 1000:.1f} ms com {primeiro['qtd']} alertas, "
+        f"{ultimo['novo'] * 1000:.1f} ms com {ultimo['qtd']} ({ultimo['novo'] / primeiro['novo']:.1f}x "
+        f"para {ultimo['qtd'] / primeiro['qtd']:.0f}x mais alertas)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# itatchi/backend/benchmarks/bench_cadastro.py
+# Benchmark do POST /documentos: um commit por requisição (caminho direto) x
+# commit em grupo (logic/gravacao_em_grupo.py), com N clientes simultâneos.
+#
+# Execução (na pasta backend):
+#   python -m benchmarks.bench_cadastro [--documentos 2000] [--concorrencia 1,8,32]
+# Usa DATABASE_URL (ex: o MySQL do compose, onde cada commit custa um fsync) ou um
+# SQLite temporário em arquivo. As requisições passam pela app Flask inteira
+# (validação, listeners do log de alterações), sem HTTP.
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+
+def rodar(app, gravacao_em_grupo, documentos: int, concorrencia: int, grupo: bool) -> Dict[str, Any]:
+    """Dispara 'documentos' cadastros divididos entre 'concorrencia' threads; retorna as medidas."""
+    gravacao_em_grupo.ativo = grupo
+    if grupo:
+        gravacao_em_grupo._garantir_gravadora()
+    antes = gravacao_em_grupo.metricas()
+
+    latencias: List[float] = []
+    erros: List[int] = []
+    lock = threading.Lock()
+    por_thread = documentos // concorrencia
+
+    def cliente(n: int) -> None:
+        c = app.test_client()
+        minhas: List[float] = []
+        falhas = 0
+        for i in range(por_thread):
+            inicio = time.perf_counter()
+            r = c.post("/documentos", json={
+                "titulo": f"Bench {n}-{i}", "responsavel": "Bench", "filial_id": 1 + i % 2,
+                "tipo_id": 1, "validade": "2030-01-01",
+            })
+            minhas.append(time.perf_counter() - inicio)
+            falhas += r.status_code != 201
+        with lock:
+            latencias.extend(minhas)
+            erros.append(falhas)
+
+    threads = [threading.Thread(target=cliente, args=(n,)) for n in range(concorrencia)]
+    inicio = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    duracao = time.perf_counter() - inicio
+
+    depois = gravacao_em_grupo.metricas()
+    lotes = depois["lotes"] - antes["lotes"]
+    latencias.sort()
+    return {
+        "por_segundo": len(latencias) / duracao,
+        "p50": statistics.median(latencias) * 1000,
+        "p99": latencias[int(len(latencias) * 0.99) - 1] * 1000,
+        "erros": sum(erros),
+        "lote_medio": (depois["documentos"] - antes["documentos"]) / lotes if lotes else 1.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara o cadastro direto com o commit em grupo.")
+    parser.add_argument("--documentos", type=int, default=2000, help="Cadastros por rodada.")
+    parser.add_argument("--concorrencia", default="1,8,32", help="Clientes simultâneos (lista).")
+    parser.add_argument("--espera-ms", type=float, default=5.0, help="GRUPO_COMMIT_ESPERA_MS.")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        caminho = os.path.join(tempfile.mkdtemp(prefix="itatchi-cadastro-"), "cadastro.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{caminho}"
+        print(f"Banco: SQLite temporário em {caminho}")
+    else:
+        print(f"Banco: {os.environ['DATABASE_URL'].split('@')[-1]}")
+    # Sem limite de admissão (mediria a fila da admissão, não a gravação) e sem aquecimento
+    os.environ["ADMISSAO_MAX_GLOBAL"] = "0"
+    os.environ["PRONTIDAO_AQUECER"] = "0"
+    os.environ["GRUPO_COMMIT_ESPERA_MS"] = str(args.espera_ms)
+
+    from sqlalchemy import insert, select, func
+    from app_backend import app
+    from database.connection import db
+    from models.models import Filial, Parametro, TipoDocumento
+    from logic.gravacao_em_grupo import gravacao_em_grupo
+
+    with app.app_context():
+        gravacao_em_grupo.init_app(app)
+        if not db.session.execute(select(func.count(Filial.id))).scalar():
+            db.session.execute(insert(Filial), [{"id": 1, "nome": "Bench 1", "codigo": "B1"}, {"id": 2, "nome": "Bench 2", "codigo": "B2"}])
+            db.session.execute(insert(TipoDocumento), [{"id": 1, "categoria": "Bench", "nome": "Bench", "obrigatorio": False, "prazo_padrao_dias": 365}])
+            db.session.execute(insert(Parametro), [{"dias_alerta_json": "[30, 60, 90]"}])
+            db.session.commit()
+
+    print(f"{args.documentos} cadastros por rodada; espera do lote {args.espera_ms:g} ms")
+    print(f"{'modo':<8}{'clientes':>10}{'docs/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'lote':>7}{'erros':>7}")
+    for concorrencia in [int(c) for c in args.concorrencia.split(",")]:
+        resultados: Dict[str, Dict[str, Any]] = {}
+        for modo in ("direto", "grupo"):
+            r = rodar(app, gravacao_em_grupo, args.documentos, concorrencia, modo == "grupo")
+            resultados[modo] = r
+            print(f"{modo:<8}{concorrencia:>10}{r['por_segundo']:>10.0f}{r['p50']:>10.1f}{r['p99']:>10.1f}"
+                  f"{r['lote_medio']:>7.1f}{r['erros']:>7}")
+        print(f"{'  ganho':<18}{resultados['grupo']['por_segundo'] / resultados['direto']['por_segundo']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# itatchi/backend/benchmarks/bench_listagem.py
+# Benchmark da listagem de documentos: instâncias ORM (caminho antigo) x
+# colunas projetadas em registros compactos (logic/documentos.py).
+#
+# Execução (na pasta backend):  python -m benchmarks.bench_listagem [qtd_documentos]
+# Usa um SQLite em memória com dados sintéticos; não toca no banco configurado.
+
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from database.connection import db
+from models.models import Documento, Filial, TipoDocumento
+from logic.documentos import consultar_documentos, consultar_home
+
+REPETICOES = 3
+
+
+def popular(sessao: Session, qtd: int) -> None:
+    """Gera 'qtd' documentos com 'observacoes' preenchidas (o TEXT que a listagem não usa)."""
+    sessao.execute(insert(Filial), [{"id": i, "nome": f"Filial {i}", "codigo": f"F{i:02d}"} for i in range(1, 11)])
+    sessao.execute(insert(TipoDocumento), [
+        {"id": i, "categoria": f"Categoria {i % 3}", "nome": f"Tipo {i}", "obrigatorio": True, "prazo_padrao_dias": 365}
+        for i in range(1, 21)
+    ])
+    hoje = date.today()
+    observacao = "Observação de exemplo. " * 40
+    sessao.execute(insert(Documento), [
+        {
+            "filial_id": i % 10 + 1,
+            "tipo_id": i % 20 + 1,
+            "titulo": f"Documento {i}",
+            "responsavel": f"Responsável {i % 50}",
+            "validade": hoje + timedelta(days=i % 400 - 30),
+            "status_calc": "VIGENTE",
+            "observacoes": observacao,
+        }
+        for i in range(qtd)
+    ])
+    sessao.commit()
+
+
+def listar_orm(sessao: Session) -> List[Dict[str, Any]]:
+    """Caminho anterior: instâncias ORM completas copiadas para dicts."""
+    stmt = (
+        select(Documento, Filial.nome, TipoDocumento.nome)
+        .outerjoin(Filial, Documento.filial_id == Filial.id)
+        .outerjoin(TipoDocumento, Documento.tipo_id == TipoDocumento.id)
+        .order_by(Documento.validade, Documento.id)
+    )
+    return [
+        {
+            "id": d.id,
+            "titulo": d.titulo,
+            "responsavel": d.responsavel,
+            "filial": filial_nome or "",
+            "tipo": tipo_nome or "",
+            "validade": str(d.validade) if d.validade else "Sem Validade",
+            "status": d.status_calc,
+        }
+        for d, filial_nome, tipo_nome in sessao.execute(stmt).all()
+    ]
+
+
+def listar_home_orm(sessao: Session) -> List[Dict[str, Any]]:
+    stmt = (
+        select(Documento)
+        .join(TipoDocumento, Documento.tipo_id == TipoDocumento.id)
+        .order_by(Documento.validade, Documento.id)
+    )
+    return [
+        {
+            "id": d.id,
+            "titulo": d.titulo,
+            "tipo_id": d.tipo_id,
+            "filial_id": d.filial_id,
+            "validade": d.validade.isoformat() if d.validade else None,
+            "status": d.status_calc,
+            "responsavel": d.responsavel,
+        }
+        for d in sessao.execute(stmt).scalars()
+    ]
+
+
+def listar_projetado(sessao: Session) -> List[Dict[str, Any]]:
+    return [r.para_json() for r in consultar_documentos(sessao, None, None)]
+
+
+def listar_home_projetado(sessao: Session) -> List[Dict[str, Any]]:
+    return [r.para_json() for r in consultar_home(sessao, None, None, None)]
+
+
+def medir(engine, funcao: Callable[[Session], List[Dict[str, Any]]]) -> Tuple[float, float]:
+    """Melhor tempo (s) entre as repetições e pico de memória (MiB) de uma execução."""
+    tempos: List[float] = []
+    for _ in range(REPETICOES):
+        with Session(engine) as sessao:
+            inicio = time.perf_counter()
+            funcao(sessao)
+            tempos.append(time.perf_counter() - inicio)
+
+    with Session(engine) as sessao:
+        tracemalloc.start()
+        funcao(sessao)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return min(tempos), pico / 2**20
+
+
+def main() -> None:
+    qtd = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    db.metadata.create_all(engine)
+    with Session(engine) as sessao:
+        popular(sessao, qtd)
+
+    # Mesmo resultado nos dois caminhos
+    with Session(engine) as sessao:
+        assert listar_orm(sessao) == listar_projetado(sessao)
+        assert listar_home_orm(sessao) == listar_home_projetado(sessao)
+
+    print(f"{qtd} documentos, melhor de {REPETICOES} execuções")
+    print(f"{'caso':<24}{'tempo (s)':>12}{'pico (MiB)':>14}")
+    casos = [
+        ("GET /documentos", listar_orm, listar_projetado),
+        ("GET /home", listar_home_orm, listar_home_projetado),
+    ]
+    for nome, antigo, novo in casos:
+        t_antigo, m_antigo = medir(engine, antigo)
+        t_novo, m_novo = medir(engine, novo)
+        print(f"{nome + ' (ORM)':<24}{t_antigo:>12.3f}{m_antigo:>14.1f}")
+        print(f"{nome + ' (colunas)':<24}{t_novo:>12.3f}{m_novo:>14.1f}")
+        print(f"{'  ganho':<24}{t_antigo / t_novo:>11.1f}x{m_antigo / m_novo:>13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
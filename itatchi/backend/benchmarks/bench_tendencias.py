@@ -0,0 +1,106 @@
+# itatchi/backend/benchmarks/bench_tendencias.py
+# Benchmark das tendências: um ano de contagens diárias reconstruído dos documentos
+# (uma agregação por dia) x a mesma série lida da fotografia diária (status_diario).
+#
+# Execução (na pasta backend):  python -m benchmarks.bench_tendencias [qtd1 qtd2 ...]
+# Usa um SQLite em memória com dados sintéticos; não toca no banco configurado.
+
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from database.connection import db
+from models.models import Documento, Filial, TipoDocumento
+from logic.status_calculator import calcular_status
+from logic.tendencias import consultar_tendencias, contagens_do_dia, fotografar
+
+REPETICOES = 3
+DIAS = 365
+HORIZONTE = 90
+
+Serie = Dict[Tuple[str, str], int]
+
+
+def popular(sessao: Session, qtd: int) -> None:
+    """Gera 'qtd' documentos com validades e datas de criação espalhadas por ~2 anos."""
+    sessao.execute(insert(Filial), [{"id": i, "nome": f"Filial {i}", "codigo": f"F{i:02d}"} for i in range(1, 11)])
+    sessao.execute(insert(TipoDocumento), [
+        {"id": i, "categoria": f"Categoria {i % 5}", "nome": f"Tipo {i}", "obrigatorio": True, "prazo_padrao_dias": 365}
+        for i in range(1, 21)
+    ])
+    hoje = date.today()
+    agora = datetime.now()
+    documentos: List[Dict[str, Any]] = []
+    for i in range(qtd):
+        validade = hoje + timedelta(days=i % 730 - 365)
+        documentos.append({
+            "filial_id": i % 10 + 1,
+            "tipo_id": i % 20 + 1,
+            "titulo": f"Documento {i}",
+            "responsavel": f"Responsável {i % 50}",
+            "validade": validade,
+            "status_calc": calcular_status(validade, HORIZONTE),
+            "criado_em": agora - timedelta(days=i % 500),
+        })
+    sessao.execute(insert(Documento), documentos)
+    sessao.commit()
+
+
+def reconstruir(sessao: Session) -> Serie:
+    """Caminho sem a tabela: uma agregação sobre os documentos para cada dia do ano."""
+    serie: Serie = defaultdict(int)
+    hoje = date.today()
+    for i in range(DIAS):
+        dia = hoje - timedelta(days=DIAS - 1 - i)
+        for _, _, _, status, quantidade in sessao.execute(contagens_do_dia(dia, HORIZONTE)):
+            serie[(dia.isoformat(), status)] += quantidade
+    return serie
+
+
+def ler(sessao: Session) -> Serie:
+    """Caminho novo: o ano inteiro em uma consulta por faixa de datas (mesma do GET /tendencias)."""
+    hoje = date.today()
+    linhas = consultar_tendencias(sessao, hoje - timedelta(days=DIAS - 1), hoje)
+    return {(dia.isoformat(), status): int(quantidade) for dia, status, quantidade in linhas}
+
+
+def medir(engine, funcao: Callable[[Session], Serie]) -> Tuple[float, Serie]:
+    """Melhor tempo (s) entre as repetições e o resultado da última."""
+    tempos: List[float] = []
+    for _ in range(REPETICOES):
+        with Session(engine) as sessao:
+            inicio = time.perf_counter()
+            resultado = funcao(sessao)
+            tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main() -> None:
+    tamanhos = [int(a) for a in sys.argv[1:]] or [1_000, 5_000, 20_000]
+
+    print(f"Série de {DIAS} dias por status; melhor de {REPETICOES} execuções")
+    print(f"{'documentos':>10}{'backfill (s)':>14}{'reconstruir (s)':>17}{'leitura (ms)':>14}{'ganho':>10}")
+    for qtd in tamanhos:
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        db.metadata.create_all(engine)
+        with Session(engine) as sessao:
+            popular(sessao, qtd)
+            inicio = time.perf_counter()
+            fotografar(sessao, date.today(), DIAS - 1, HORIZONTE)
+            t_backfill = time.perf_counter() - inicio
+
+        t_antigo, esperado = medir(engine, reconstruir)
+        t_novo, lido = medir(engine, ler)
+        assert lido == dict(esperado), "série lida difere da reconstruída"
+        print(f"{qtd:>10}{t_backfill:>14.2f}{t_antigo:>17.3f}{t_novo * 1000:>14.1f}{t_antigo / t_novo:>9.0f}x")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
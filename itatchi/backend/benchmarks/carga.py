@@ -0,0 +1,396 @@
+# itatchi/backend/benchmarks/carga.py
+# Teste de carga ponta a ponta: N usuários simultâneos repetindo jornadas do frontend
+# (Central de Consultas, relatório Excel, Central de Alertas, Matriz e Cadastro) contra
+# o backend, com as mesmas chamadas que o Streamlit faz.
+#
+# Execução (na pasta backend):
+#   python -m benchmarks.carga --usuarios 200 --duracao 60
+#       sobe o backend no próprio processo (DATABASE_URL, ou um SQLite temporário)
+#       e gera a massa sintética antes de começar.
+#   python -m benchmarks.carga --url http://localhost:5000 --usuarios 50
+#       usa um backend já no ar (a massa de dados é a que estiver no banco).
+#
+# SLOs (--slo): "ROTA:pXX=ms" separados por vírgula, ex:
+#   --slo "GET /home:p95=500,POST /documentos:p99=800,*:p99=2000" --max-erros 0.01
+# Sai com código 1 se algum SLO for violado.
+# Vazão e latências contam só as requisições iniciadas depois da rampa de entrada.
+
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+CATEGORIAS: List[str] = ["Regulatórios", "Veículos", "Pessoas"]
+POR_PAGINA_ALERTAS = 25
+
+# Mesmos valores de frontend/utils/referencias.py e frontend/utils/relatorios.py
+MAX_AGE_REFERENCIAS_PADRAO = 300
+MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+RELATORIO_ESPERA_MAX = 3.0
+RELATORIO_INTERVALO = 0.5
+# Sem relatório pronto, o usuário clica em "Atualizar" depois de alguns segundos (até desistir)
+RELATORIO_ATUALIZAR_SEGUNDOS = 5.0
+RELATORIO_MAX_ATUALIZACOES = 12
+
+
+# -----------------------------
+# Massa sintética e backend local
+# -----------------------------
+def popular_banco(qtd_documentos: int, qtd_filiais: int) -> None:
+    """Insere filiais, tipos, parâmetro e documentos (via Core) se o banco estiver vazio."""
+    from sqlalchemy import insert, select, func
+    from database.connection import db
+    from models.models import Documento, Filial, Parametro, TipoDocumento
+    from logic.status_calculator import calcular_status
+
+    if db.session.execute(select(func.count(Documento.id))).scalar():
+        return
+
+    db.session.execute(insert(Filial), [
+        {"id": i, "nome": f"Filial {i:02d}", "codigo": f"F{i:03d}"} for i in range(1, qtd_filiais + 1)
+    ])
+    tipos = [
+        {"id": i, "categoria": CATEGORIAS[i % len(CATEGORIAS)], "nome": f"Tipo {i}",
+         "obrigatorio": i % 2 == 0, "prazo_padrao_dias": 365}
+        for i in range(1, 16)
+    ]
+    db.session.execute(insert(TipoDocumento), tipos)
+    db.session.execute(insert(Parametro), [{"dias_alerta_json": "[30, 60, 90]"}])
+
+    hoje = date.today()
+    aleatorio = random.Random(42)
+    lote: List[Dict[str, Any]] = []
+    for i in range(qtd_documentos):
+        validade = None if i % 25 == 0 else hoje + timedelta(days=aleatorio.randint(-120, 540))
+        lote.append({
+            "filial_id": aleatorio.randint(1, qtd_filiais),
+            "tipo_id": aleatorio.randint(1, len(tipos)),
+            "titulo": f"Documento {i} {aleatorio.choice(['Alvará', 'Licença', 'CNH', 'ANTT', 'Certificado'])}",
+            "numero": f"{i:08d}",
+            "responsavel": f"Responsável {i % 40}",
+            "validade": validade,
+            "sem_validade": validade is None,
+            "status_calc": calcular_status(validade, horizonte=90),
+            "observacoes": "Gerado pelo teste de carga.",
+        })
+        if len(lote) == 5000:
+            db.session.execute(insert(Documento), lote)
+            lote.clear()
+    if lote:
+        db.session.execute(insert(Documento), lote)
+    db.session.commit()
+
+
+def subir_backend_local(porta: int, qtd_documentos: int, qtd_filiais: int) -> Callable[[], None]:
+    """Sobe o app Flask num servidor WSGI com threads, no próprio processo. Retorna a função de parada."""
+    if not os.getenv("DATABASE_URL"):
+        caminho = os.path.join(tempfile.mkdtemp(prefix="itatchi-carga-"), "carga.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{caminho}"
+        print(f"Banco: SQLite temporário em {caminho}")
+    else:
+        print(f"Banco: {os.environ['DATABASE_URL'].split('@')[-1]}")
+
+    from werkzeug.serving import make_server
+    from app_backend import app
+
+    with app.app_context():
+        inicio = time.perf_counter()
+        popular_banco(qtd_documentos, qtd_filiais)
+        print(f"Massa sintética pronta em {time.perf_counter() - inicio:.1f}s")
+
+    # Sem o log de acesso por requisição (poluiria o relatório e custa tempo no servidor)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    servidor = make_server("127.0.0.1", porta, app, threaded=True)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor.shutdown
+
+
+# -----------------------------
+# Coleta de latências
+# -----------------------------
+class Coletor:
+    """
+    Latências (ms) e códigos por rota, compartilhados pelas threads de usuário.
+    Requisições iniciadas antes de 'medir_desde' (rampa de entrada) são descartadas.
+    """
+
+    def __init__(self, medir_desde: float = 0.0) -> None:
+        self._lock = threading.Lock()
+        self.medir_desde = medir_desde
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.codigos: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def registrar(self, rota: str, momento: float, ms: float, codigo: int) -> None:
+        """'momento' é o time.monotonic() do início da requisição."""
+        if momento < self.medir_desde:
+            return
+        with self._lock:
+            self.latencias[rota].append(ms)
+            self.codigos[rota][codigo] += 1
+
+
+class CacheReferencias:
+    """
+    /referencias como no frontend: uma cópia por processo Streamlit (aqui, do
+    teste inteiro), sem requisição dentro do max-age e revalidada com If-None-Match.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.etag: Optional[str] = None
+        self.expira_em: float = 0.0
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil pelo método nearest-rank (valores já ordenados)."""
+    if not valores:
+        return 0.0
+    indice = max(0, min(len(valores) - 1, int(round(p / 100 * len(valores) + 0.5)) - 1))
+    return valores[indice]
+
+
+# -----------------------------
+# Usuário emulado
+# -----------------------------
+class Usuario:
+    """
+    Uma sessão do frontend: mantém o token do feed incremental (como o session_state
+    do Streamlit) e o header X-Cliente-Id, e executa jornadas sorteadas por peso.
+    """
+
+    def __init__(
+        self, url: str, coletor: Coletor, referencias: CacheReferencias, pensar: float, aleatorio: random.Random
+    ) -> None:
+        self.url = url
+        self.coletor = coletor
+        self.referencias = referencias
+        self.pensar = pensar
+        self.aleatorio = aleatorio
+        self.http = requests.Session()
+        self.http.headers["X-Cliente-Id"] = f"carga-{id(self):x}"
+        self.token = 0
+
+    def chamar(self, metodo: str, caminho: str, rota: Optional[str] = None, **kwargs: Any) -> Optional[requests.Response]:
+        rota = rota or f"{metodo} {caminho}"
+        momento = time.monotonic()
+        inicio = time.perf_counter()
+        try:
+            resposta = self.http.request(metodo, self.url + caminho, timeout=30, **kwargs)
+            codigo = resposta.status_code
+        except requests.exceptions.RequestException:
+            resposta, codigo = None, 0
+        self.coletor.registrar(rota, momento, (time.perf_counter() - inicio) * 1000, codigo)
+        return resposta
+
+    def pausa(self) -> None:
+        if self.pensar > 0:
+            time.sleep(self.aleatorio.uniform(0.5, 1.5) * self.pensar)
+
+    def sincronizar(self) -> None:
+        """Mesma chamada de utils/sincronizacao.py: completo na 1ª vez, depois só o delta."""
+        resposta = self.chamar("GET", "/documentos/alteracoes", params={"desde": self.token})
+        if resposta is not None and resposta.status_code == 200:
+            self.token = resposta.json().get("token", self.token)
+
+    def obter_referencias(self) -> None:
+        """Cada página chama obter_referencias: só sai requisição depois do max-age."""
+        cache = self.referencias
+        with cache.lock:
+            if time.monotonic() < cache.expira_em:
+                return
+            headers = {"If-None-Match": cache.etag} if cache.etag else {}
+            resposta = self.chamar("GET", "/referencias", headers=headers)
+            if resposta is None or resposta.status_code not in (200, 304):
+                return
+            if resposta.status_code == 200:
+                cache.etag = resposta.headers.get("ETag")
+            achado = MAX_AGE_RE.search(resposta.headers.get("Cache-Control", ""))
+            cache.expira_em = time.monotonic() + (int(achado.group(1)) if achado else MAX_AGE_REFERENCIAS_PADRAO)
+
+    # Jornadas
+    def consulta(self) -> None:
+        """
+        Central de Consultas: cada "Buscar" sincroniza a cópia local pelo delta do
+        feed; paginação, troca de mês e filtros são locais (nenhuma requisição).
+        """
+        self.obter_referencias()
+        for _ in range(self.aleatorio.randint(1, 3)):
+            self.sincronizar()
+            self.pausa()
+
+    def relatorio(self) -> None:
+        """Relatório Excel da Central de Consultas: submete, acompanha o job e baixa o arquivo uma vez."""
+        self.obter_referencias()
+        hoje = date.today()
+        inicio = hoje - timedelta(days=self.aleatorio.randint(0, 60))
+        resposta = self.chamar("POST", "/relatorios", json={
+            "categoria": self.aleatorio.choice(CATEGORIAS + ["Todas"]),
+            "inicio": inicio.isoformat(),
+            "fim": (inicio + timedelta(days=self.aleatorio.choice([30, 90, 180]))).isoformat(),
+            "status": self.aleatorio.choice([[], ["A_VENCER", "VENCIDO"]]),
+        })
+        if resposta is None or resposta.status_code not in (200, 201, 202):
+            return
+        job: Dict[str, Any] = resposta.json()
+
+        # Cada rerun (envio ou "Atualizar") consulta o job por no máximo RELATORIO_ESPERA_MAX
+        for rerun in range(RELATORIO_MAX_ATUALIZACOES + 1):
+            if rerun:
+                time.sleep(RELATORIO_ATUALIZAR_SEGUNDOS)
+            limite = time.monotonic() + RELATORIO_ESPERA_MAX
+            while True:
+                resposta = self.chamar("GET", f"/relatorios/{job['id']}", rota="GET /relatorios/<id>")
+                if resposta is None or resposta.status_code != 200:
+                    return
+                job = resposta.json()
+                if job.get("status") in ("CONCLUIDO", "ERRO") or time.monotonic() >= limite:
+                    break
+                time.sleep(RELATORIO_INTERVALO)
+            if job.get("status") in ("CONCLUIDO", "ERRO"):
+                break
+
+        if job.get("arquivo_url"):
+            self.chamar("GET", job["arquivo_url"], rota="GET /relatorios/<id>/arquivo")
+        self.pausa()
+
+    def alertas(self) -> None:
+        """Central de Alertas: primeira página de cada grupo e, às vezes, as seguintes dos vencidos."""
+        for pagina in range(1, self.aleatorio.randint(1, 3) + 1):
+            self.chamar("GET", "/alertas", params={
+                "pagina_vencidos": pagina, "pagina_a_vencer": 1, "por_pagina": POR_PAGINA_ALERTAS,
+            })
+            self.pausa()
+
+    def matriz(self) -> None:
+        self.chamar("GET", "/conformidade/matriz")
+        self.pausa()
+
+    def cadastro(self) -> None:
+        validade = date.today() + timedelta(days=self.aleatorio.randint(-10, 400))
+        self.chamar("POST", "/documentos", json={
+            "titulo": f"Carga {self.aleatorio.randint(0, 10**9)}",
+            "responsavel": "Teste de carga",
+            "filial_id": self.aleatorio.randint(1, 5),
+            "tipo_id": self.aleatorio.randint(1, 15),
+            "validade": validade.isoformat(),
+        })
+        self.pausa()
+
+    def executar(self, fim: float, pesos: Dict[str, int]) -> None:
+        jornadas = [getattr(self, nome) for nome in pesos]
+        while time.monotonic() < fim:
+            self.aleatorio.choices(jornadas, weights=list(pesos.values()))[0]()
+
+
+# -----------------------------
+# Relatório e SLOs
+# -----------------------------
+def ler_slos(texto: str) -> List[Tuple[str, float, float]]:
+    """'GET /home:p95=500,*:p99=2000' -> [(rota, percentil, limite_ms)]."""
+    slos: List[Tuple[str, float, float]] = []
+    for item in filter(None, (parte.strip() for parte in texto.split(","))):
+        rota, regra = item.rsplit(":", 1)
+        p, limite = regra.split("=")
+        slos.append((rota.strip(), float(p.strip().lstrip("p")), float(limite)))
+    return slos
+
+
+def relatorio(coletor: Coletor, duracao: float, slos: List[Tuple[str, float, float]], max_erros: float) -> bool:
+    """Imprime vazão e p50/p95/p99 por rota e retorna True se todos os SLOs foram atendidos."""
+    print(f"\n{'rota':<32}{'req':>8}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'erros':>8}{'429/503':>9}")
+    total = erros_total = 0
+    ordenadas: Dict[str, List[float]] = {}
+    for rota in sorted(coletor.latencias):
+        valores = ordenadas[rota] = sorted(coletor.latencias[rota])
+        codigos = coletor.codigos[rota]
+        recusadas = codigos.get(429, 0) + codigos.get(503, 0)
+        erros = sum(q for c, q in codigos.items() if c == 0 or c >= 400) - recusadas
+        total += len(valores)
+        erros_total += erros + recusadas
+        print(
+            f"{rota:<32}{len(valores):>8}{len(valores) / duracao:>9.1f}"
+            f"{percentil(valores, 50):>9.0f}{percentil(valores, 95):>9.0f}{percentil(valores, 99):>9.0f}"
+            f"{erros:>8}{recusadas:>9}"
+        )
+    todas = sorted(v for valores in ordenadas.values() for v in valores)
+    print(
+        f"{'TOTAL':<32}{total:>8}{total / duracao:>9.1f}{percentil(todas, 50):>9.0f}"
+        f"{percentil(todas, 95):>9.0f}{percentil(todas, 99):>9.0f}{erros_total:>17}"
+    )
+    print("(latências em ms)")
+
+    ok = True
+    for rota, p, limite in slos:
+        valores = todas if rota == "*" else ordenadas.get(rota, [])
+        medido = percentil(valores, p)
+        atendido = medido <= limite
+        ok &= atendido
+        print(f"SLO {rota} p{p:g} <= {limite:g} ms: {medido:.0f} ms {'OK' if atendido else 'VIOLADO'}")
+
+    taxa = erros_total / total if total else 0.0
+    if taxa > max_erros:
+        ok = False
+    print(f"SLO taxa de erros <= {max_erros:.2%}: {taxa:.2%} {'OK' if taxa <= max_erros else 'VIOLADO'}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Teste de carga do backend Itatchi.")
+    parser.add_argument("--url", help="Backend já no ar (sem isso, sobe um local)")
+    parser.add_argument("--usuarios", type=int, default=50)
+    parser.add_argument("--duracao", type=float, default=30.0, help="Segundos de carga")
+    parser.add_argument("--rampa", type=float, default=5.0, help="Segundos para todos os usuários entrarem")
+    parser.add_argument("--pensar", type=float, default=1.0, help="Tempo médio de leitura entre ações (s)")
+    parser.add_argument("--documentos", type=int, default=20000, help="Massa sintética (backend local)")
+    parser.add_argument("--filiais", type=int, default=20, help="Massa sintética (backend local)")
+    parser.add_argument("--porta", type=int, default=5055, help="Porta do backend local")
+    parser.add_argument("--pesos", default="consulta=45,relatorio=5,alertas=30,matriz=10,cadastro=10")
+    parser.add_argument("--slo", default=os.getenv("CARGA_SLO", "*:p95=1000,*:p99=3000"))
+    parser.add_argument("--max-erros", type=float, default=0.01, help="Fração máxima de respostas != 2xx")
+    args = parser.parse_args()
+
+    parar: Optional[Callable[[], None]] = None
+    url = args.url
+    if not url:
+        parar = subir_backend_local(args.porta, args.documentos, args.filiais)
+        url = f"http://127.0.0.1:{args.porta}"
+
+    pesos = {nome: int(peso) for nome, peso in (par.split("=") for par in args.pesos.split(","))}
+    inicio = time.monotonic()
+    # A medição começa quando o último usuário entra (a rampa não conta na vazão)
+    estavel = inicio + args.rampa
+    fim = estavel + args.duracao
+    coletor = Coletor(medir_desde=estavel)
+    referencias = CacheReferencias()
+
+    def usuario(n: int) -> None:
+        time.sleep(args.rampa * n / max(1, args.usuarios))
+        Usuario(url, coletor, referencias, args.pensar, random.Random(n)).executar(fim, pesos)
+
+    print(f"{args.usuarios} usuários por {args.duracao:.0f}s (rampa de {args.rampa:.0f}s) contra {url}")
+    threads = [threading.Thread(target=usuario, args=(n,), daemon=True) for n in range(args.usuarios)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    decorrido = time.monotonic() - estavel
+
+    if parar:
+        parar()
+
+    ok = relatorio(coletor, decorrido, ler_slos(args.slo), args.max_erros)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
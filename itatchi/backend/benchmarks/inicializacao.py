@@ -0,0 +1,238 @@
+# itatchi/backend/benchmarks/inicializacao.py
+# Orçamento de subida (cold start): importação e prontidão do backend e primeira
+# execução de cada página do frontend, cada medida em um processo Python novo.
+#
+# Execução (na pasta backend):
+#   python -m benchmarks.inicializacao
+#   python -m benchmarks.inicializacao --orcamento "backend.importacao=1.5,backend.pronto=5,*=3"
+#
+# Sobe o backend com DATABASE_URL (ou um SQLite temporário com massa sintética),
+# mede a importação de app_backend e o tempo até /pronto responder 200, e roda cada
+# página do frontend com o AppTest do Streamlit apontando para esse backend.
+# Orçamentos (--orcamento) em segundos: "backend.importacao", "backend.pronto" e o
+# nome de cada página ("app_frontend", "1_cadastro_documento", ...); "*" vale para
+# as páginas sem orçamento próprio. Sai com código 1 se alguma mediana estourar ou
+# se alguma página levantar exceção; tests/test_prontidao.py roda o backend sozinho
+# (--sem-frontend) e o backend com as páginas a cada execução da suíte.
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FRONTEND_DIR = BACKEND_DIR.parent / "frontend"
+PAGINAS: List[Path] = [FRONTEND_DIR / "app_frontend.py", *sorted((FRONTEND_DIR / "pages").glob("*.py"))]
+
+# Módulos cuja presença após a subida indica importação antecipada
+MODULOS_PESADOS = ("pandas", "numpy", "pyarrow", "xlsxwriter", "openpyxl")
+
+ORCAMENTO_PADRAO = "backend.importacao=2,backend.pronto=10,*=5"
+
+
+# -----------------------------
+# Processos filhos (cada um mede uma subida a frio)
+# -----------------------------
+def _emitir(dados: Dict[str, Any]) -> None:
+    print(json.dumps(dados), flush=True)
+
+
+def filho_popular(qtd_documentos: int) -> None:
+    from benchmarks.carga import popular_banco
+    os.environ["PRONTIDAO_AQUECER"] = "0"
+    from app_backend import app
+
+    with app.app_context():
+        popular_banco(qtd_documentos, 10)
+    _emitir({"ok": True})
+
+
+def filho_backend(porta: int) -> None:
+    """Importa o app, serve na porta e espera o /pronto; fica no ar até o stdin fechar."""
+    inicio = time.perf_counter()
+    from app_backend import app
+    importacao = time.perf_counter() - inicio
+
+    import logging
+    import threading
+    import urllib.request
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    servidor = make_server("127.0.0.1", porta, app, threaded=True)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    while True:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{porta}/pronto", timeout=5) as resp:
+                if resp.status == 200:
+                    estado = json.load(resp)
+                    break
+        except OSError:
+            pass
+        time.sleep(0.05)
+
+    _emitir({
+        "importacao": importacao,
+        "pronto": time.perf_counter() - inicio,
+        "etapas_ms": estado.get("etapas_ms"),
+        "pesados": [m for m in MODULOS_PESADOS if m in sys.modules],
+    })
+    sys.stdin.read()
+    servidor.shutdown()
+
+
+def filho_pagina(caminho: str) -> None:
+    """Primeira execução da página (como na primeira visita após a subida do frontend)."""
+    sys.path.insert(0, str(FRONTEND_DIR))
+    os.chdir(FRONTEND_DIR)
+    inicio = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    importacao = time.perf_counter() - inicio
+
+    app = AppTest.from_file(caminho, default_timeout=120).run()
+    _emitir({
+        "importacao": importacao,
+        "execucao": time.perf_counter() - inicio - importacao,
+        "excecoes": [str(e.value) for e in app.exception],
+        "pesados": [m for m in MODULOS_PESADOS if m in sys.modules],
+    })
+
+
+# -----------------------------
+# Processo principal
+# -----------------------------
+def _comando(*args: str) -> List[str]:
+    return [sys.executable, "-m", "benchmarks.inicializacao", *args]
+
+
+def _porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _ler_linha(processo: subprocess.Popen, timeout: float) -> Dict[str, Any]:
+    """Primeira linha JSON do filho (o resto da saída é log do próprio app)."""
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        linha = processo.stdout.readline()
+        if not linha:
+            break
+        if linha.startswith("{"):
+            return json.loads(linha)
+    processo.kill()
+    raise RuntimeError(f"Processo {processo.args[-2:]} não respondeu em {timeout:.0f}s")
+
+
+def medir_backend(env: Dict[str, str], porta: int) -> Tuple[subprocess.Popen, Dict[str, Any]]:
+    """Sobe o backend num processo novo; retorna o processo (ainda no ar) e as medidas."""
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(
+        _comando("--filho-backend", str(porta)), cwd=BACKEND_DIR, env=env,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+    )
+    dados = _ler_linha(processo, 120)
+    # Tempo de parede desde o fork: inclui a subida do interpretador
+    dados["pronto"] = time.perf_counter() - inicio
+    return processo, dados
+
+
+def medir_pagina(env: Dict[str, str], pagina: Path) -> Dict[str, Any]:
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(
+        _comando("--filho-pagina", str(pagina)), cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    dados = _ler_linha(processo, 180)
+    dados["total"] = time.perf_counter() - inicio
+    processo.wait()
+    return dados
+
+
+def ler_orcamento(texto: str) -> Dict[str, float]:
+    return {nome.strip(): float(valor) for nome, valor in (item.split("=") for item in texto.split(",") if item.strip())}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mede a subida a frio do backend e das páginas do frontend.")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Subidas medidas (vale a mediana).")
+    parser.add_argument("--documentos", type=int, default=20_000, help="Massa do SQLite temporário.")
+    parser.add_argument("--orcamento", default=ORCAMENTO_PADRAO)
+    parser.add_argument("--sem-frontend", action="store_true", help="Mede só o backend.")
+    parser.add_argument("--filho-backend", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--filho-pagina", help=argparse.SUPPRESS)
+    parser.add_argument("--filho-popular", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho_backend:
+        return filho_backend(args.filho_backend)
+    if args.filho_pagina:
+        return filho_pagina(args.filho_pagina)
+    if args.filho_popular is not None:
+        return filho_popular(args.filho_popular)
+
+    orcamento = ler_orcamento(args.orcamento)
+    env = dict(os.environ)
+    if not env.get("DATABASE_URL"):
+        caminho = os.path.join(tempfile.mkdtemp(prefix="itatchi-subida-"), "subida.db")
+        env["DATABASE_URL"] = f"sqlite:///{caminho}"
+        print(f"Banco: SQLite temporário em {caminho} ({args.documentos} documentos)")
+        popular = subprocess.Popen(_comando("--filho-popular", str(args.documentos)),
+                                   cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, text=True)
+        _ler_linha(popular, 600)
+        popular.wait()
+
+    medidas: Dict[str, List[float]] = {}
+    detalhes: Dict[str, Dict[str, Any]] = {}
+
+    def registrar(nome: str, valor: float, dados: Dict[str, Any]) -> None:
+        medidas.setdefault(nome, []).append(valor)
+        detalhes[nome] = dados
+
+    for _ in range(args.repeticoes):
+        porta = _porta_livre()
+        backend, dados_backend = medir_backend(env, porta)
+        try:
+            registrar("backend.importacao", dados_backend["importacao"], dados_backend)
+            registrar("backend.pronto", dados_backend["pronto"], dados_backend)
+            if not args.sem_frontend:
+                env_paginas = dict(env, API_URL=f"http://127.0.0.1:{porta}")
+                for pagina in PAGINAS:
+                    dados = medir_pagina(env_paginas, pagina)
+                    registrar(pagina.stem, dados["total"], dados)
+        finally:
+            backend.stdin.close()
+            backend.wait(timeout=30)
+
+    print(f"\nMediana de {args.repeticoes} subidas a frio (s)")
+    print(f"{'medida':<34}{'mediana':>9}{'orçamento':>11}  detalhes")
+    estourou = False
+    for nome, valores in medidas.items():
+        mediana = statistics.median(valores)
+        limite: Optional[float] = orcamento.get(nome, orcamento.get("*") if not nome.startswith("backend.") else None)
+        dados = detalhes[nome]
+        ok = (limite is None or mediana <= limite) and not dados.get("excecoes")
+        estourou |= not ok
+        extra = f"pesados={','.join(dados['pesados']) or '-'}"
+        if nome == "backend.pronto":
+            extra += f" etapas_ms={dados.get('etapas_ms')}"
+        elif "execucao" in dados:
+            extra += f" streamlit={dados['importacao']:.2f}s script={dados['execucao']:.2f}s"
+            if dados["excecoes"]:
+                extra += f" EXCEÇÕES={dados['excecoes']}"
+        marca = "" if ok else "  << ESTOUROU"
+        print(f"{nome:<34}{mediana:>9.3f}{(f'{limite:.2f}' if limite is not None else '-'):>11}  {extra}{marca}")
+
+    sys.exit(1 if estourou else 0)
+
+
+if __name__ == "__main__":
+    main()
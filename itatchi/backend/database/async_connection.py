@@ -0,0 +1,62 @@
+# itatchi/backend/database/async_connection.py
+# Engine e sessões assíncronas (SQLAlchemy asyncio) usados pelo ponto de entrada ASGI.
+
+import asyncio
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from database.connection import db, montar_database_uri_async
+
+
+class BancoAsync:
+    """
+    Engine assíncrono (aiomysql em produção, aiosqlite local) criado sob demanda.
+
+    As sessões têm expire_on_commit=False para que os objetos continuem legíveis
+    depois do commit sem um novo round-trip (atributos expirados exigiriam I/O
+    implícito, que não é permitido fora de 'run_sync').
+    """
+
+    def __init__(self) -> None:
+        self._engine: Optional[AsyncEngine] = None
+        self._fabrica: Optional[async_sessionmaker[AsyncSession]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def iniciar(self) -> None:
+        """Cria o engine; em SQLite (testes/desenvolvimento), cria também as tabelas."""
+        url = montar_database_uri_async()
+        self._loop = asyncio.get_running_loop()
+        self._engine = create_async_engine(url, pool_pre_ping=True)
+        self._fabrica = async_sessionmaker(self._engine, expire_on_commit=False)
+
+        if url.startswith("sqlite"):
+            async with self._engine.begin() as conn:
+                await conn.run_sync(db.metadata.create_all)
+
+    async def aquecer_pool(self, quantidade: int) -> None:
+        """Abre 'quantidade' conexões ao mesmo tempo e as devolve ao pool."""
+        async def abrir() -> None:
+            async with self._engine.connect() as conexao:
+                await conexao.execute(text("SELECT 1"))
+
+        await asyncio.gather(*(abrir() for _ in range(quantidade)))
+
+    def aquecer_pool_de_outra_thread(self, quantidade: int, timeout: float = 30.0) -> None:
+        """Adaptador síncrono de aquecer_pool (thread do aquecimento): roda no loop do servidor."""
+        if self._loop is None:
+            raise RuntimeError("Engine assíncrono ainda não iniciado.")
+        asyncio.run_coroutine_threadsafe(self.aquecer_pool(quantidade), self._loop).result(timeout)
+
+    async def encerrar(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+
+    def sessao(self) -> AsyncSession:
+        """Nova AsyncSession (use com 'async with'). Uma por tarefa concorrente."""
+        return self._fabrica()
+
+
+# Instância única do processo (mesmo padrão do objeto 'db')
+banco_async = BancoAsync()
@@ -27,16 +27,11 @@ def _read_secret(path: str) -> str | None:
         # Qualquer outro erro de leitura, simplesmente não usa o secret
         return None
 
-def create_app():
+def montar_database_uri() -> str:
     """
-    Factory que cria e configura a aplicação Flask.
-    
-    Configura o CORS e a URI de conexão com o banco de dados
-    a partir das variáveis de ambiente (.env).
+    Monta a URL de conexão síncrona a partir das variáveis de ambiente (.env).
+    Usada pela app Flask e, convertida para drivers assíncronos, pelo app_asgi.py.
     """
-    app = Flask(__name__)
-    CORS(app)
-
     # 1. Obter variáveis de conexão do ambiente (.env local ou variáveis do Docker)
     db_user = os.getenv("DB_USER", "itatchi_user")
     db_host = os.getenv("DB_HOST", "itatchi-mysql")
@@ -51,13 +46,47 @@ def create_app():
     db_password = secret_password 
 
     # 3. Montar a URL de conexão para MySQL + PyMySQL
-    app.config["SQLALCHEMY_DATABASE_URI"] = (
+    # DATABASE_URL (opcional) substitui a URL inteira, ex: sqlite:///itatchi.db para testes locais
+    return os.getenv("DATABASE_URL") or (
         f"mysql+pymysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
     )
 
+
+def montar_database_uri_async() -> str:
+    """
+    URL equivalente para o engine assíncrono (app_asgi.py):
+    mysql+pymysql -> mysql+aiomysql e sqlite -> sqlite+aiosqlite.
+    ASYNC_DATABASE_URL (opcional) substitui a URL inteira.
+    """
+    url = os.getenv("ASYNC_DATABASE_URL")
+    if url:
+        return url
+    url = montar_database_uri()
+    if url.startswith("mysql+pymysql://"):
+        return "mysql+aiomysql://" + url[len("mysql+pymysql://"):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+def create_app():
+    """
+    Factory que cria e configura a aplicação Flask.
+    
+    Configura o CORS e a URI de conexão com o banco de dados
+    a partir das variáveis de ambiente (.env).
+    """
+    app = Flask(__name__)
+    CORS(app)
+
+    # 1-3. URL de conexão (MySQL + PyMySQL, ou DATABASE_URL)
+    app.config["SQLALCHEMY_DATABASE_URI"] = montar_database_uri()
+
     # Recomendado: desabilitar rastreamento de modificações para melhor performance
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+    # Downloads de arquivos: delega o envio ao proxy reverso (X-Sendfile) se habilitado
+    app.config["USE_X_SENDFILE"] = os.getenv("USE_X_SENDFILE", "0") == "1"
+
     # 3. Inicializa o SQLAlchemy com essa app
     db.init_app(app)
 
@@ -69,4 +98,9 @@ def create_app():
         # fallback para execução direta dentro do container (sem pacote itatchi)
         from models.models import Documento  # noqa: F401
 
+    # 5. SQLite (testes/desenvolvimento) não passa pelos scripts de mysql-init: cria as tabelas
+    if app.config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite"):
+        with app.app_context():
+            db.create_all()
+
     return app
\ No newline at end of file
@@ -0,0 +1,254 @@
+# itatchi/backend/database/shards.py
+# Particionamento horizontal (sharding) dos documentos por filial.
+
+import heapq
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+from flask import Flask
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from database.connection import db
+
+T = TypeVar("T")
+A = TypeVar("A")
+logger = logging.getLogger(__name__)
+
+# Faixa de ids reservada a cada shard: o shard de índice i gera ids a partir de i * FAIXA_IDS + 1
+FAIXA_IDS = int(os.getenv("SHARD_FAIXA_IDS", "100000000"))
+
+# Tabelas cujos ids aparecem nas rotas (/documentos/<id>, /vinculos/<id>, versões)
+TABELAS_COM_FAIXA = ("documento", "versao", "vinculo")
+
+# Tabelas de referência copiadas do banco padrão para os demais shards (joins locais)
+TABELAS_REFERENCIA = ("filial", "tipodocumento", "parametro")
+
+
+class MapaShards:
+    """
+    Roteia cada filial para o banco (shard) que guarda seus documentos.
+
+    Configuração pela variável SHARD_MAP: um JSON (ou caminho de arquivo JSON)
+    no formato {"<filial_id>": "<url do banco>"}. Filiais fora do mapa ficam no
+    banco padrão (SQLALCHEMY_DATABASE_URI), que também é tratado como shard.
+    Sem SHARD_MAP, tudo continua usando 'db.session' normalmente.
+
+    Os shards têm ordem fixa: o banco padrão é o 0 e os demais seguem a ordem em
+    que aparecem no SHARD_MAP (shards novos entram no FIM do mapa). Essa ordem
+    define os tokens compostos (um por shard) e a faixa de ids de cada shard:
+    documento, versão e vínculo do shard i têm ids a partir de i * SHARD_FAIXA_IDS + 1,
+    então o id já diz em que shard a linha está (rotas por id vão direto a ele).
+
+    Na preparação (preparar), cada shard tem o contador de ids levado ao início da
+    sua faixa e recebe as tabelas de referência (filial, tipodocumento, parametro)
+    que faltarem, copiadas do banco padrão.
+    """
+
+    def __init__(self) -> None:
+        self._urls_por_filial: Dict[int, str] = {}
+        self._urls: List[str] = []
+        self._engines: Dict[str, Engine] = {}
+        self._url_padrao: Optional[str] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def init_app(self, app: Flask) -> None:
+        """Lê SHARD_MAP e cria um engine (com pool próprio) por URL distinta."""
+        bruto = os.getenv("SHARD_MAP", "").strip()
+        if not bruto:
+            return
+        if not bruto.startswith("{"):
+            with open(bruto, encoding="utf-8") as f:
+                bruto = f.read()
+
+        self._url_padrao = app.config["SQLALCHEMY_DATABASE_URI"]
+        self._urls_por_filial = {int(k): v for k, v in json.loads(bruto).items()}
+
+        # Ordem estável entre processos: padrão primeiro, depois a ordem do SHARD_MAP
+        self._urls = [self._url_padrao]
+        for url in self._urls_por_filial.values():
+            if url not in self._urls:
+                self._urls.append(url)
+
+        for url in self._urls:
+            engine = create_engine(url, pool_pre_ping=True)
+            # Shards SQLite (testes locais) também não passam pelos scripts de mysql-init
+            if url.startswith("sqlite"):
+                db.metadata.create_all(engine)
+            self._engines[url] = engine
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self._engines), thread_name_prefix="shard"
+        )
+
+        # Banco fora do ar na subida: a etapa "shards" do aquecimento (/pronto) tenta de novo
+        try:
+            self.preparar()
+        except Exception as e:
+            logger.warning("Preparação dos shards adiada: %s", e)
+
+    # -----------------------------
+    # Preparação (faixas de ids e tabelas de referência)
+    # -----------------------------
+    def preparar(self) -> None:
+        """Idempotente: pode rodar a cada subida e em todas as réplicas."""
+        if not self.ativo:
+            return
+        padrao = self._engines[self._url_padrao]
+        with padrao.connect() as origem:
+            referencias = {
+                nome: [dict(linha) for linha in origem.execute(select(db.metadata.tables[nome])).mappings()]
+                for nome in TABELAS_REFERENCIA
+            }
+        for indice, url in enumerate(self._urls):
+            with self._engines[url].begin() as conn:
+                if indice > 0:
+                    _copiar_referencias(conn, referencias)
+                for tabela in TABELAS_COM_FAIXA:
+                    _reservar_faixa(conn, tabela, indice * FAIXA_IDS)
+
+    @property
+    def ativo(self) -> bool:
+        return bool(self._engines)
+
+    def engines(self) -> List[Engine]:
+        """Engines de todos os shards (sem sharding, o engine da 'db')."""
+        return list(self._engines.values()) if self.ativo else [db.engine]
+
+    def engine_da_filial(self, filial_id: Optional[int]) -> Engine:
+        url = self._urls_por_filial.get(int(filial_id)) if filial_id is not None else None
+        return self._engines[url or self._url_padrao]
+
+    def engine_do_id(self, id_linha: int) -> Engine:
+        """Shard dono do id (pela faixa); ids fora de qualquer faixa caem no padrão."""
+        indice = id_linha // FAIXA_IDS
+        url = self._urls[indice] if 0 <= indice < len(self._urls) else self._url_padrao
+        return self._engines[url]
+
+    @contextmanager
+    def sessao_da_filial(self, filial_id: Optional[int]) -> Iterator[Session]:
+        """
+        Sessão do shard da filial (escritas roteadas por filial_id).
+        Sem sharding, devolve a própria 'db.session'. Quem chama faz commit/rollback.
+        """
+        if not self.ativo:
+            yield db.session
+            return
+        with Session(self.engine_da_filial(filial_id)) as sessao:
+            yield sessao
+
+    @contextmanager
+    def sessao_do_id(self, id_linha: int) -> Iterator[Session]:
+        """
+        Sessão do shard que guarda o documento/versão/vínculo 'id_linha'.
+        Sem sharding, devolve a própria 'db.session'. Quem chama faz commit/rollback.
+        """
+        if not self.ativo:
+            yield db.session
+            return
+        with Session(self.engine_do_id(id_linha)) as sessao:
+            yield sessao
+
+    @contextmanager
+    def sessoes_de_todos(self) -> Iterator[List[Session]]:
+        """
+        Uma sessão aberta por shard, mantidas enquanto o bloco durar (ex: para
+        mesclar cursores de leitura sob demanda). Sem sharding, [db.session].
+        """
+        if not self.ativo:
+            yield [db.session]
+            return
+        with ExitStack() as pilha:
+            yield [pilha.enter_context(Session(engine)) for engine in self._engines.values()]
+
+    def em_todos(self, funcao: Callable[[Session], T]) -> List[T]:
+        """
+        Executa 'funcao(sessao)' em todos os shards EM PARALELO (scatter) e
+        devolve a lista de resultados (gather). Sem sharding, roda uma vez na 'db.session'.
+
+        A função roda fora do contexto da aplicação: não deve usar Model.query
+        nem 'db.session', apenas a sessão recebida.
+        """
+        if not self.ativo:
+            return [funcao(db.session)]
+
+        def executar(engine: Engine) -> T:
+            with Session(engine) as sessao:
+                return funcao(sessao)
+
+        return list(self._executor.map(executar, self._engines.values()))
+
+    def em_cada(self, funcao: Callable[[Session, A], T], argumentos: Sequence[A]) -> List[T]:
+        """
+        Como em_todos, mas o shard i recebe 'argumentos[i]' (ex: o seu token
+        dentro de um token composto). 'argumentos' segue a ordem dos shards.
+        """
+        if not self.ativo:
+            return [funcao(db.session, argumentos[0])]
+
+        def executar(engine: Engine, argumento: A) -> T:
+            with Session(engine) as sessao:
+                return funcao(sessao, argumento)
+
+        return list(self._executor.map(executar, self._engines.values(), argumentos))
+
+    def total(self) -> int:
+        """Quantidade de shards (1 sem sharding)."""
+        return len(self._engines) if self.ativo else 1
+
+
+def _reservar_faixa(conn: Connection, tabela: str, base: int) -> None:
+    """Leva o próximo id gerado em 'tabela' para depois de 'base' (nunca diminui o contador)."""
+    if base == 0:
+        return
+    maior: int = conn.execute(select(func.coalesce(func.max(db.metadata.tables[tabela].c.id), 0))).scalar()
+    if maior >= base:
+        return
+    if conn.dialect.name == "mysql":
+        conn.execute(text(f"ALTER TABLE {tabela} AUTO_INCREMENT = {base + 1}"))
+    elif conn.dialect.name == "sqlite":
+        # Tabelas com AUTOINCREMENT continuam a partir de sqlite_sequence.seq
+        ddl = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = :t"), {"t": tabela}).scalar() or ""
+        if "AUTOINCREMENT" not in ddl.upper():
+            logger.warning("Shard SQLite com '%s' sem AUTOINCREMENT (criada antes das faixas): recrie o arquivo.", tabela)
+            return
+        atual = conn.execute(text("SELECT seq FROM sqlite_sequence WHERE name = :t"), {"t": tabela}).scalar()
+        if atual is None:
+            conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES (:t, :s)"), {"t": tabela, "s": base})
+        elif atual < base:
+            conn.execute(text("UPDATE sqlite_sequence SET seq = :s WHERE name = :t"), {"t": tabela, "s": base})
+
+
+def _copiar_referencias(conn: Connection, referencias: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Insere no shard as linhas de referência que ainda não existem nele (pela chave primária)."""
+    for nome, linhas in referencias.items():
+        tabela = db.metadata.tables[nome]
+        existentes = set(conn.execute(select(tabela.c.id)).scalars())
+        faltantes = [linha for linha in linhas if linha["id"] not in existentes]
+        if faltantes:
+            conn.execute(insert(tabela), faltantes)
+
+
+def mesclar_ordenado(
+    listas: Iterable[List[T]],
+    chave: Callable[[T], Any],
+    inicio: int = 0,
+    fim: Optional[int] = None,
+) -> List[T]:
+    """Mescla listas JÁ ORDENADAS (uma por shard) e aplica a janela [inicio:fim] da paginação."""
+    mescladas: List[T] = []
+    for i, item in enumerate(heapq.merge(*listas, key=chave)):
+        if fim is not None and i >= fim:
+            break
+        if i >= inicio:
+            mescladas.append(item)
+    return mescladas
+
+
+# Instância única do processo (mesmo padrão do objeto 'db')
+mapa_shards = MapaShards()
\ No newline at end of file
@@ -1,4 +1,10 @@
 #!/bin/sh
 
+# BACKEND_MODO=asgi sobe o ponto de entrada assíncrono (app_asgi.py) no lugar do Flask
+if [ "$BACKEND_MODO" = "asgi" ]; then
+    echo "Iniciando o servidor ASGI (uvicorn)..."
+    exec uvicorn app_asgi:app --host 0.0.0.0 --port 5000
+fi
+
 echo "Iniciando o Flask..."
 python app_backend.py
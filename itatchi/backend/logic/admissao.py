@@ -0,0 +1,217 @@
+# itatchi/backend/logic/admissao.py
+# Controle de admissão (backpressure) das rotas caras: limites de concorrência,
+# fila de espera limitada e respostas rápidas 429/503 quando o backend está saturado.
+
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import Flask, Response, jsonify, make_response, request
+
+# Prioridades (menor = atende primeiro): escritas passam na frente das leituras do dashboard
+ESCRITA = 0
+LEITURA = 1
+
+
+class ControleAdmissao:
+    """
+    Limita quantas requisições caras rodam ao mesmo tempo no processo.
+
+    - max_global: vagas simultâneas (deve caber no pool do MySQL). 0 desliga o controle.
+    - reserva_escrita: vagas que leituras nunca ocupam, para um POST /documentos não
+      ficar atrás de um pico de leituras do dashboard.
+    - max_por_cliente: requisições (em execução + na fila) por cliente; acima disso, 429.
+      O cliente é o header X-Cliente-Id, ou o IP de origem.
+    - fila_max / espera_max: quem não tem vaga espera numa fila por prioridade; fila cheia
+      ou espera esgotada devolvem 503 na hora, em vez de segurar a conexão até o pool estourar.
+    """
+
+    def __init__(self) -> None:
+        self.max_global: int = 16
+        self.reserva_escrita: int = 2
+        self.max_por_cliente: int = 8
+        self.fila_max: int = 32
+        self.espera_max: float = 2.0
+
+        self._cond = threading.Condition()
+        self._ativos: int = 0
+        self._ativos_leitura: int = 0
+        self._por_cliente: Dict[str, int] = {}
+        # Heap de (prioridade, ordem de chegada): só o primeiro da fila pode entrar
+        self._fila: List[Tuple[int, int]] = []
+        self._sequencia = itertools.count()
+        self._contadores: Dict[str, int] = {
+            "admitidos": 0,
+            "admitidos_apos_espera": 0,
+            "rejeitados_cliente": 0,
+            "descartados_fila_cheia": 0,
+            "descartados_espera": 0,
+        }
+
+    def init_app(self, app: Flask) -> None:
+        """Lê os limites das variáveis de ambiente (ADMISSAO_*)."""
+        self.max_global = int(os.getenv("ADMISSAO_MAX_GLOBAL", self.max_global))
+        self.reserva_escrita = int(os.getenv("ADMISSAO_RESERVA_ESCRITA", self.reserva_escrita))
+        self.max_por_cliente = int(os.getenv("ADMISSAO_MAX_POR_CLIENTE", self.max_por_cliente))
+        self.fila_max = int(os.getenv("ADMISSAO_FILA_MAX", self.fila_max))
+        self.espera_max = float(os.getenv("ADMISSAO_ESPERA_MAX_SEGUNDOS", self.espera_max))
+
+    @property
+    def ativo(self) -> bool:
+        return self.max_global > 0
+
+    # -----------------------------
+    # Admissão
+    # -----------------------------
+    def _tem_vaga(self, prioridade: int) -> bool:
+        if self._ativos >= self.max_global:
+            return False
+        if prioridade == LEITURA:
+            return self._ativos_leitura < max(1, self.max_global - self.reserva_escrita)
+        return True
+
+    def _ocupar(self, prioridade: int) -> None:
+        self._ativos += 1
+        if prioridade == LEITURA:
+            self._ativos_leitura += 1
+
+    def _soltar_cliente(self, cliente: str) -> None:
+        restante = self._por_cliente.get(cliente, 0) - 1
+        if restante > 0:
+            self._por_cliente[cliente] = restante
+        else:
+            self._por_cliente.pop(cliente, None)
+
+    def admitir(self, cliente: str, prioridade: int) -> Optional[Tuple[Response, int]]:
+        """
+        Reserva uma vaga para a requisição. Retorna None se admitida, ou a
+        resposta 429/503 (com Retry-After) a ser devolvida imediatamente.
+        """
+        with self._cond:
+            if self.max_por_cliente > 0 and self._por_cliente.get(cliente, 0) >= self.max_por_cliente:
+                self._contadores["rejeitados_cliente"] += 1
+                return _resposta_saturado(429, "Muitas requisições simultâneas deste cliente.", 1)
+
+            # Caminho rápido: ninguém esperando e há vaga
+            if not self._fila and self._tem_vaga(prioridade):
+                self._ocupar(prioridade)
+                self._por_cliente[cliente] = self._por_cliente.get(cliente, 0) + 1
+                self._contadores["admitidos"] += 1
+                return None
+
+            if len(self._fila) >= self.fila_max:
+                self._contadores["descartados_fila_cheia"] += 1
+                return _resposta_saturado(503, "Servidor ocupado, tente novamente.", self._retry_after())
+
+            # Entra na fila por prioridade e espera ser o primeiro com vaga disponível
+            ficha = (prioridade, next(self._sequencia))
+            heapq.heappush(self._fila, ficha)
+            self._por_cliente[cliente] = self._por_cliente.get(cliente, 0) + 1
+            limite = time.monotonic() + self.espera_max
+
+            while not (self._fila[0] == ficha and self._tem_vaga(prioridade)):
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    self._fila.remove(ficha)
+                    heapq.heapify(self._fila)
+                    self._soltar_cliente(cliente)
+                    self._contadores["descartados_espera"] += 1
+                    self._cond.notify_all()
+                    return _resposta_saturado(503, "Servidor ocupado, tente novamente.", self._retry_after())
+                self._cond.wait(restante)
+
+            heapq.heappop(self._fila)
+            self._ocupar(prioridade)
+            self._contadores["admitidos"] += 1
+            self._contadores["admitidos_apos_espera"] += 1
+            # O próximo da fila pode ter vaga também (ex: uma escrita liberou a frente)
+            self._cond.notify_all()
+            return None
+
+    def liberar(self, cliente: str, prioridade: int) -> None:
+        with self._cond:
+            self._ativos -= 1
+            if prioridade == LEITURA:
+                self._ativos_leitura -= 1
+            self._soltar_cliente(cliente)
+            self._cond.notify_all()
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self.espera_max))
+
+    # -----------------------------
+    # Decorator das rotas
+    # -----------------------------
+    def limitar(self, prioridade: int = LEITURA) -> Callable:
+        """
+        Aplica o controle de admissão a uma rota. Em respostas em streaming
+        (ex: NDJSON), a vaga só é liberada quando a transmissão termina.
+        """
+        def decorador(view: Callable) -> Callable:
+            @wraps(view)
+            def envolvido(*args: Any, **kwargs: Any) -> Any:
+                if not self.ativo:
+                    return view(*args, **kwargs)
+
+                cliente = identificar_cliente()
+                recusa = self.admitir(cliente, prioridade)
+                if recusa is not None:
+                    return recusa
+
+                try:
+                    resposta = make_response(view(*args, **kwargs))
+                except BaseException:
+                    self.liberar(cliente, prioridade)
+                    raise
+
+                if resposta.is_streamed:
+                    resposta.call_on_close(lambda: self.liberar(cliente, prioridade))
+                else:
+                    self.liberar(cliente, prioridade)
+                return resposta
+            return envolvido
+        return decorador
+
+    # -----------------------------
+    # Monitoramento
+    # -----------------------------
+    def metricas(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "ativos": self._ativos,
+                "ativos_leitura": self._ativos_leitura,
+                "na_fila": len(self._fila),
+                "clientes": len(self._por_cliente),
+                "limites": {
+                    "max_global": self.max_global,
+                    "reserva_escrita": self.reserva_escrita,
+                    "max_por_cliente": self.max_por_cliente,
+                    "fila_max": self.fila_max,
+                    "espera_max_segundos": self.espera_max,
+                },
+                **self._contadores,
+            }
+
+
+def identificar_cliente() -> str:
+    """X-Cliente-Id (enviado pelo frontend, um por sessão) ou o primeiro IP de X-Forwarded-For."""
+    cliente = request.headers.get("X-Cliente-Id")
+    if cliente:
+        return cliente
+    encaminhado = request.headers.get("X-Forwarded-For", "")
+    return encaminhado.split(",")[0].strip() or request.remote_addr or "desconhecido"
+
+
+def _resposta_saturado(codigo: int, mensagem: str, retry_after: int) -> Tuple[Response, int]:
+    resposta = jsonify({"erro": mensagem})
+    resposta.headers["Retry-After"] = str(retry_after)
+    return resposta, codigo
+
+
+# Instância única do processo
+controle_admissao = ControleAdmissao()
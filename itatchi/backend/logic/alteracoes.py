@@ -0,0 +1,88 @@
+# itatchi/backend/logic/alteracoes.py
+# Registro automático de alterações em documentos (feed incremental por token).
+
+import os
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+# from itatchi.backend.database.connection import db
+# from itatchi.backend.models.models import Documento, DocumentoAlteracao
+from database.connection import db
+from models.models import Documento, DocumentoAlteracao
+
+# Ids do log são atribuídos no INSERT, mas só ficam visíveis no COMMIT (fora de ordem
+# entre transações). Entradas mais novas que isso podem ter vizinhas de id MENOR ainda
+# não confirmadas: o token devolvido aos clientes fica antes delas (ver token_seguro).
+# Deve ser maior que a duração da transação de escrita mais longa.
+JANELA_TOKEN_SEGUNDOS = int(os.getenv("ALTERACOES_JANELA_SEGUNDOS", "30"))
+
+
+@event.listens_for(Session, "after_flush")
+def _registrar_alteracoes(session: Session, flush_context: Any) -> None:
+    """
+    Após cada flush, grava no log uma entrada por documento inserido,
+    alterado ou removido — na MESMA transação da escrita.
+
+    Usa insert do Core (permitido dentro do after_flush), então qualquer
+    caminho que grave via ORM entra no feed sem precisar lembrar de chamar nada.
+    """
+    entradas: List[Dict[str, Any]] = []
+
+    for obj in session.new:
+        if isinstance(obj, Documento):
+            entradas.append({"documento_id": obj.id, "operacao": "INSERIDO", "status": obj.status_calc})
+
+    for obj in session.dirty:
+        if isinstance(obj, Documento) and session.is_modified(obj, include_collections=False):
+            mudou_status = inspect(obj).attrs.status_calc.history.has_changes()
+            entradas.append({
+                "documento_id": obj.id,
+                "operacao": "STATUS" if mudou_status else "ATUALIZADO",
+                "status": obj.status_calc,
+            })
+
+    for obj in session.deleted:
+        if isinstance(obj, Documento):
+            entradas.append({"documento_id": obj.id, "operacao": "REMOVIDO", "status": None})
+
+    if entradas:
+        session.connection().execute(DocumentoAlteracao.__table__.insert(), entradas)
+
+
+def token_atual(sessao: Optional[Session] = None) -> int:
+    """Retorna o maior id do log de alterações (0 se vazio). 'sessao' permite consultar um shard."""
+    sessao = sessao if sessao is not None else db.session
+    return sessao.execute(select(func.max(DocumentoAlteracao.id))).scalar() or 0
+
+
+def token_seguro(sessao: Optional[Session] = None) -> int:
+    """
+    Token para quem vai continuar lendo o log depois: o maior id gravado há mais de
+    JANELA_TOKEN_SEGUNDOS (relógio do banco). A próxima leitura a partir dele relê as
+    entradas recentes, inclusive as de transações que confirmaram fora de ordem;
+    quem lê descarta as repetidas pelo id do documento.
+    """
+    sessao = sessao if sessao is not None else db.session
+    limite = sessao.execute(select(func.now())).scalar() - timedelta(seconds=JANELA_TOKEN_SEGUNDOS)
+    # Varre o PK de trás para frente e para na primeira entrada antiga o bastante
+    stmt = (
+        select(DocumentoAlteracao.id)
+        .where(DocumentoAlteracao.criado_em <= limite)
+        .order_by(DocumentoAlteracao.id.desc())
+        .limit(1)
+    )
+    return sessao.execute(stmt).scalar() or 0
+
+
+def documentos_alterados_desde(desde: int, ate: int, sessao: Optional[Session] = None) -> List[int]:
+    """Lista (sem repetição) os ids de documentos com alteração no intervalo (desde, ate]."""
+    sessao = sessao if sessao is not None else db.session
+    stmt = (
+        select(DocumentoAlteracao.documento_id)
+        .where(DocumentoAlteracao.id > desde, DocumentoAlteracao.id <= ate)
+        .distinct()
+    )
+    return list(sessao.execute(stmt).scalars())
\ No newline at end of file
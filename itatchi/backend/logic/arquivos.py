@@ -0,0 +1,99 @@
+# itatchi/backend/logic/arquivos.py
+# Armazenamento de arquivos endereçado por conteúdo (SHA-256), com deduplicação.
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
+
+# Tamanho do bloco lido do corpo da requisição (upload em streaming)
+TAMANHO_BLOCO = 64 * 1024
+
+# Prefixo usado em Documento.caminho_atual / Versao.caminho_arquivo para referenciar um blob
+PREFIXO_BLOB = "sha256:"
+
+
+class ArmazemArquivos:
+    """
+    Guarda cada conteúdo uma única vez em <raiz>/ab/cd/<sha256>.
+
+    O upload é gravado em um arquivo temporário no mesmo disco enquanto o hash
+    é calculado bloco a bloco; ao final, o temporário é renomeado para o caminho
+    definitivo (operação atômica) ou descartado se o conteúdo já existir.
+    """
+
+    def __init__(self, raiz: Optional[str] = None) -> None:
+        self.raiz = Path(raiz or os.getenv("ARQUIVOS_DIR", "/data/arquivos"))
+
+    def caminho(self, sha256: str) -> Path:
+        """Caminho do blob no disco (dois níveis de diretório para não lotar uma pasta só)."""
+        return self.raiz / sha256[:2] / sha256[2:4] / sha256
+
+    def existe(self, sha256: str) -> bool:
+        return self.caminho(sha256).is_file()
+
+    def salvar_stream(self, stream: BinaryIO) -> Tuple[str, int, bool]:
+        """
+        Consome o stream em blocos, calculando o SHA-256 durante a gravação.
+
+        Retorna:
+            - (sha256, tamanho em bytes, novo) — 'novo' é False quando o conteúdo já existia.
+
+        Levanta:
+            - ValueError: stream vazio (nada é gravado no armazém).
+        """
+        tmp_dir = self.raiz / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+
+        hasher = hashlib.sha256()
+        tamanho = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while True:
+                    bloco = stream.read(TAMANHO_BLOCO)
+                    if not bloco:
+                        break
+                    hasher.update(bloco)
+                    tmp.write(bloco)
+                    tamanho += len(bloco)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+
+            if tamanho == 0:
+                raise ValueError("conteúdo vazio")
+
+            sha256 = hasher.hexdigest()
+            destino = self.caminho(sha256)
+            if destino.is_file():
+                # Conteúdo repetido: descarta a cópia, o blob existente é reaproveitado
+                os.unlink(tmp_path)
+                return sha256, tamanho, False
+
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, destino)
+            return sha256, tamanho, True
+
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def remover(self, sha256: str) -> None:
+        """Apaga o blob (usado para desfazer um upload cujo registro no banco falhou)."""
+        try:
+            os.unlink(self.caminho(sha256))
+        except FileNotFoundError:
+            pass
+
+
+def sha256_do_caminho(caminho: Optional[str]) -> Optional[str]:
+    """Extrai o hash de uma referência 'sha256:<hex>' (None para caminhos livres legados)."""
+    if caminho and caminho.startswith(PREFIXO_BLOB):
+        return caminho[len(PREFIXO_BLOB):]
+    return None
+
+
+# Instância única do processo
+armazem = ArmazemArquivos()
\ No newline at end of file
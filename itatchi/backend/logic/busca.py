@@ -0,0 +1,267 @@
+# itatchi/backend/logic/busca.py
+# Busca textual indexada em titulo, numero, orgao_emissor e observacoes.
+# MySQL: índice FULLTEXT (mantido pelo InnoDB a cada escrita).
+# SQLite/testes: índice de trigramas em memória, atualizado pelo log de alterações.
+# Com sharding, cada shard é buscado em paralelo e os resultados são mesclados por relevância.
+
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.dialects.mysql import match as mysql_match
+from sqlalchemy.orm import Session
+
+# from itatchi.backend.database.connection import db
+from database.shards import mapa_shards, mesclar_ordenado
+from models.models import Documento
+from logic.alteracoes import documentos_alterados_desde, token_atual, token_seguro
+
+# Campos indexados e seu peso na relevância
+PESOS_CAMPOS: Dict[str, int] = {
+    "titulo": 3,
+    "numero": 2,
+    "orgao_emissor": 1,
+    "observacoes": 1,
+}
+
+# Fração mínima dos trigramas da consulta que o documento precisa conter
+SIMILARIDADE_MINIMA = 0.5
+
+# Colunas devolvidas em cada resultado
+COLUNAS_RESULTADO = (
+    Documento.id, Documento.titulo, Documento.numero, Documento.orgao_emissor,
+    Documento.validade, Documento.status_calc,
+)
+
+
+def normalizar(texto: Optional[str]) -> str:
+    """Minúsculas e sem acentos ('Licença' → 'licenca')."""
+    if not texto:
+        return ""
+    decomposto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def trigramas(texto: Optional[str]) -> Set[str]:
+    """Trigramas de cada palavra, com espaços nas bordas (mesma ideia do pg_trgm)."""
+    resultado: Set[str] = set()
+    for palavra in normalizar(texto).split():
+        palavra = f"  {palavra} "
+        resultado.update(palavra[i:i + 3] for i in range(len(palavra) - 2))
+    return resultado
+
+
+class IndiceTrigramas:
+    """
+    Índice invertido trigrama → {documento_id: peso}.
+
+    É montado na primeira busca e, a cada busca seguinte, reaplica apenas os
+    documentos que mudaram desde o último token do log 'documento_alteracao'
+    — inclusive os gravados pela outra réplica. Um índice por shard (o token é
+    do log de cada shard).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._trigramas_doc: Dict[int, Set[str]] = {}
+        self._token: Optional[int] = None
+
+    def _remover(self, documento_id: int) -> None:
+        for tri in self._trigramas_doc.pop(documento_id, ()):
+            postagem = self._postings.get(tri)
+            if postagem is not None:
+                postagem.pop(documento_id, None)
+                if not postagem:
+                    del self._postings[tri]
+
+    def _indexar(self, documento_id: int, campos: Dict[str, Optional[str]]) -> None:
+        self._remover(documento_id)
+        pesos: Dict[str, int] = {}
+        for campo, peso in PESOS_CAMPOS.items():
+            for tri in trigramas(campos.get(campo)):
+                # O trigrama vale o peso do campo mais importante em que aparece
+                if peso > pesos.get(tri, 0):
+                    pesos[tri] = peso
+        for tri, peso in pesos.items():
+            self._postings[tri][documento_id] = peso
+        self._trigramas_doc[documento_id] = set(pesos)
+
+    def _carregar(self, sessao: Session, ids: Optional[Iterable[int]] = None) -> None:
+        """(Re)indexa os documentos informados, ou todos se ids=None."""
+        stmt = select(Documento.id, *[getattr(Documento, c) for c in PESOS_CAMPOS])
+        pendentes: Set[int] = set()
+        if ids is not None:
+            pendentes = set(ids)
+            if not pendentes:
+                return
+            stmt = stmt.where(Documento.id.in_(pendentes))
+
+        for linha in sessao.execute(stmt.execution_options(yield_per=1000)):
+            documento_id = linha[0]
+            self._indexar(documento_id, dict(zip(PESOS_CAMPOS, linha[1:])))
+            pendentes.discard(documento_id)
+
+        # Alterados que não existem mais: foram removidos
+        for documento_id in pendentes:
+            self._remover(documento_id)
+
+    def sincronizar(self, sessao: Session) -> None:
+        """Aplica no índice o que mudou no banco (do shard da sessão) desde a última sincronização."""
+        ultimo = token_atual(sessao)
+        # Guarda um token antes das entradas recentes: a próxima sincronização as reaplica
+        # (reindexar é idempotente) e pega as que confirmaram fora de ordem
+        token = min(token_seguro(sessao), ultimo)
+        with self._lock:
+            if self._token is None:
+                self._carregar(sessao)
+            elif ultimo > self._token:
+                self._carregar(sessao, documentos_alterados_desde(self._token, ultimo, sessao))
+            elif ultimo < self._token:
+                # Log recriado (ex: banco de testes zerado): reconstrói do zero
+                self._postings.clear()
+                self._trigramas_doc.clear()
+                self._carregar(sessao)
+            self._token = token
+
+    def buscar(self, consulta: str) -> List[Tuple[int, float]]:
+        """Retorna (documento_id, relevância 0..1) ordenados pela relevância."""
+        tris = trigramas(consulta)
+        if not tris:
+            return []
+
+        maximo = len(tris) * max(PESOS_CAMPOS.values())
+        pontos: Dict[int, int] = defaultdict(int)
+        encontrados: Dict[int, int] = defaultdict(int)
+        with self._lock:
+            for tri in tris:
+                for documento_id, peso in self._postings.get(tri, {}).items():
+                    pontos[documento_id] += peso
+                    encontrados[documento_id] += 1
+
+        minimo = SIMILARIDADE_MINIMA * len(tris)
+        ranking = [
+            (documento_id, pontos[documento_id] / maximo)
+            for documento_id, qtd in encontrados.items()
+            if qtd >= minimo
+        ]
+        ranking.sort(key=lambda item: (-item[1], item[0]))
+        return ranking
+
+
+class IndicesTrigramas:
+    """Um IndiceTrigramas por shard (chave: URL do engine), criado na primeira busca no shard."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._indices: Dict[str, IndiceTrigramas] = {}
+
+    def do_shard(self, sessao: Session) -> IndiceTrigramas:
+        chave = str(sessao.get_bind().url)
+        with self._lock:
+            if chave not in self._indices:
+                self._indices[chave] = IndiceTrigramas()
+            return self._indices[chave]
+
+    def sincronizar(self) -> None:
+        """Sincroniza o índice de cada shard que não é MySQL (aquecimento na subida)."""
+        def sincronizar_shard(sessao: Session) -> None:
+            if sessao.get_bind().dialect.name != "mysql":
+                self.do_shard(sessao).sincronizar(sessao)
+
+        mapa_shards.em_todos(sincronizar_shard)
+
+
+# Instância única do processo (usada nos shards que não são MySQL)
+indice_trigramas = IndicesTrigramas()
+
+
+def _serializar(linha: Any, relevancia: float) -> Dict[str, Any]:
+    documento_id, titulo, numero, orgao_emissor, validade, status = linha
+    return {
+        "id": documento_id,
+        "titulo": titulo,
+        "numero": numero,
+        "orgao_emissor": orgao_emissor,
+        "validade": validade.isoformat() if validade else None,
+        "status": status,
+        "relevancia": round(float(relevancia), 4),
+    }
+
+
+def _chave_relevancia(resultado: Dict[str, Any]) -> Tuple[float, int]:
+    """Ordem dos resultados: maior relevância primeiro, id como desempate."""
+    return -resultado["relevancia"], resultado["id"]
+
+
+def _buscar_mysql(sessao: Session, consulta: str, limite: int) -> Tuple[int, List[Dict[str, Any]]]:
+    """Usa o índice FULLTEXT ft_documento_busca (modo linguagem natural, ordenado por relevância)."""
+    match = mysql_match(
+        Documento.titulo, Documento.numero, Documento.orgao_emissor, Documento.observacoes,
+        against=consulta,
+    ).in_natural_language_mode()
+
+    total: int = sessao.execute(
+        select(func.count()).select_from(Documento).where(match)
+    ).scalar() or 0
+
+    stmt = (
+        select(*COLUNAS_RESULTADO, match.label("relevancia"))
+        .where(match)
+        .order_by(desc(match), Documento.id)
+        .limit(limite)
+    )
+    return total, [_serializar(linha[:-1], linha[-1]) for linha in sessao.execute(stmt)]
+
+
+def _buscar_trigramas(sessao: Session, consulta: str, limite: int) -> Tuple[int, List[Dict[str, Any]]]:
+    """Usa o índice de trigramas do shard e carrega do banco só os documentos até o fim da página."""
+    indice = indice_trigramas.do_shard(sessao)
+    indice.sincronizar(sessao)
+    ranking = indice.buscar(consulta)
+
+    candidatos = ranking[:limite]
+    if not candidatos:
+        return len(ranking), []
+
+    relevancias = dict(candidatos)
+    linhas = sessao.execute(
+        select(*COLUNAS_RESULTADO).where(Documento.id.in_(list(relevancias)))
+    ).all()
+    por_id = {linha[0]: linha for linha in linhas}
+    return len(ranking), [
+        _serializar(por_id[documento_id], relevancia)
+        for documento_id, relevancia in candidatos
+        if documento_id in por_id
+    ]
+
+
+def buscar_documentos(consulta: str, pagina: int = 1, por_pagina: int = 20) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Busca documentos por texto, ordenados por relevância e paginados.
+
+    Cada shard devolve seus melhores resultados até o fim da página pedida (em
+    paralelo); a mescla por relevância aplica a janela da página. No MySQL a
+    relevância do FULLTEXT é calculada por shard.
+
+    Retorna:
+        - (total de resultados, resultados da página)
+    """
+    inicio = (pagina - 1) * por_pagina
+    fim = inicio + por_pagina
+
+    def buscar_no_shard(sessao: Session) -> Tuple[int, List[Dict[str, Any]]]:
+        if sessao.get_bind().dialect.name == "mysql":
+            total, resultados = _buscar_mysql(sessao, consulta, fim)
+        else:
+            total, resultados = _buscar_trigramas(sessao, consulta, fim)
+        # A mescla exige a mesma ordem (relevância arredondada) em cada lista
+        return total, sorted(resultados, key=_chave_relevancia)
+
+    parciais = mapa_shards.em_todos(buscar_no_shard)
+    pagina_resultados = mesclar_ordenado(
+        [resultados for _, resultados in parciais], chave=_chave_relevancia, inicio=inicio, fim=fim
+    )
+    return sum(total for total, _ in parciais), pagina_resultados
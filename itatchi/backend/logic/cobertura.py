@@ -0,0 +1,117 @@
+# itatchi/backend/logic/cobertura.py
+# Matriz filial × tipo obrigatório: cada filial possui um documento válido de cada tipo obrigatório?
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, select, true
+from sqlalchemy.orm import Session
+
+from database.shards import mapa_shards
+from models.models import Documento, Filial, TipoDocumento
+from logic.alteracoes import token_atual
+
+# Estados de cada célula
+VALIDO = "VALIDO"        # há documento VIGENTE ou SEM_VALIDADE
+A_VENCER = "A_VENCER"    # o melhor documento existente está A_VENCER
+AUSENTE = "AUSENTE"      # nenhum documento, ou apenas documentos VENCIDOS
+
+# Tempo máximo (s) de cache mesmo sem escrita de documento (ex: nova filial cadastrada direto no banco)
+TTL_SEGUNDOS = 300
+
+
+def _melhores_por_celula(sessao: Session) -> List[Tuple[int, str, int, str, str, Optional[int]]]:
+    """
+    UMA consulta: filial CROSS JOIN tipos obrigatórios, LEFT JOIN documento e
+    GROUP BY, pegando o melhor status de cada célula (2 válido, 1 a vencer, 0/None ausente).
+    """
+    melhor = func.max(case(
+        (Documento.status_calc.in_(("VIGENTE", "SEM_VALIDADE")), 2),
+        (Documento.status_calc == "A_VENCER", 1),
+        else_=0,
+    ))
+    stmt = (
+        select(Filial.id, Filial.nome, TipoDocumento.id, TipoDocumento.nome, TipoDocumento.categoria, melhor)
+        .select_from(Filial)
+        .join(TipoDocumento, true())
+        .outerjoin(Documento, and_(Documento.filial_id == Filial.id, Documento.tipo_id == TipoDocumento.id))
+        .where(TipoDocumento.obrigatorio.is_(True))
+        .group_by(Filial.id, Filial.nome, TipoDocumento.id, TipoDocumento.nome, TipoDocumento.categoria)
+    )
+    return [tuple(linha) for linha in sessao.execute(stmt)]
+
+
+def calcular_matriz() -> Dict[str, Any]:
+    """
+    Calcula a matriz sem trazer nenhum documento individual do banco.
+    Com sharding, a consulta agregada roda em cada shard em paralelo e as
+    células são combinadas pelo melhor valor.
+    """
+    melhores: Dict[Tuple[int, int], int] = {}
+    filiais: Dict[int, Dict[str, Any]] = {}
+    tipos: Dict[int, Dict[str, Any]] = {}
+
+    for linhas in mapa_shards.em_todos(_melhores_por_celula):
+        for filial_id, filial_nome, tipo_id, tipo_nome, categoria, valor in linhas:
+            filiais.setdefault(filial_id, {"id": filial_id, "nome": filial_nome})
+            tipos.setdefault(tipo_id, {"id": tipo_id, "nome": tipo_nome, "categoria": categoria})
+            chave = (filial_id, tipo_id)
+            melhores[chave] = max(melhores.get(chave, 0), valor or 0)
+
+    ordem_filiais = sorted(filiais, key=lambda f: filiais[f]["nome"])
+    ordem_tipos = sorted(tipos, key=lambda t: (tipos[t]["categoria"], tipos[t]["nome"]))
+    estados = {2: VALIDO, 1: A_VENCER, 0: AUSENTE}
+
+    resumo: Dict[str, int] = {VALIDO: 0, A_VENCER: 0, AUSENTE: 0}
+    celulas: List[List[str]] = []
+    for f in ordem_filiais:
+        linha = [estados[melhores.get((f, t), 0)] for t in ordem_tipos]
+        for estado in linha:
+            resumo[estado] += 1
+        celulas.append(linha)
+
+    return {
+        "filiais": [filiais[f] for f in ordem_filiais],
+        "tipos": [tipos[t] for t in ordem_tipos],
+        # Uma linha por filial, colunas na ordem de 'tipos'
+        "celulas": celulas,
+        "resumo": resumo,
+    }
+
+
+class CacheMatriz:
+    """
+    Guarda a última matriz calculada junto com o token do log de alterações.
+    Enquanto nenhum documento for gravado (token igual), a matriz é reaproveitada;
+    como o log é compartilhado, uma escrita em qualquer réplica invalida o cache.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._token: Optional[Tuple[int, ...]] = None
+        self._calculado_em: float = 0.0
+        self._dados: Optional[Dict[str, Any]] = None
+
+    def obter(self) -> Dict[str, Any]:
+        # Com sharding, o cache só vale se NENHUM shard recebeu escrita
+        token = tuple(mapa_shards.em_todos(token_atual))
+        with self._lock:
+            valido = (
+                self._dados is not None
+                and self._token == token
+                and time.monotonic() - self._calculado_em < TTL_SEGUNDOS
+            )
+            if not valido:
+                self._dados = calcular_matriz()
+                self._token = token
+                self._calculado_em = time.monotonic()
+            return {**self._dados, "token": max(self._token), "cache": valido}
+
+    def invalidar(self) -> None:
+        with self._lock:
+            self._dados = None
+
+
+# Instância única do processo
+cache_matriz = CacheMatriz()
\ No newline at end of file
@@ -0,0 +1,102 @@
+# itatchi/backend/logic/conformidade.py
+# Rollup de conformidade por entidade vinculada (MOTORISTA, VEICULO, LOCAL).
+
+from datetime import date
+from typing import Any, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import and_, case, delete, event, func, inspect, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+# from itatchi.backend.models.models import ConformidadeEntidade, Documento, Vinculo
+from models.models import ConformidadeEntidade, Documento, Vinculo
+
+# Gravidade de cada status (maior = pior). SEM_VALIDADE não expira, então é o mais brando.
+GRAVIDADE_STATUS = {"SEM_VALIDADE": 1, "VIGENTE": 2, "A_VENCER": 3, "VENCIDO": 4}
+STATUS_POR_GRAVIDADE = {v: k for k, v in GRAVIDADE_STATUS.items()}
+
+Chave = Tuple[str, Optional[str]]
+
+
+def recalcular_entidades(conn: Connection, chaves: Iterable[Chave]) -> None:
+    """
+    Recalcula o rollup das entidades informadas.
+
+    Cada entidade tem poucos documentos e a agregação usa o índice
+    (tipo_alvo, alvo_id) de 'vinculo', então o custo é proporcional aos
+    documentos DA ENTIDADE, não ao tamanho da tabela.
+    """
+    hoje = date.today()
+    gravidade = case(
+        *[(Documento.status_calc == status, peso) for status, peso in GRAVIDADE_STATUS.items()],
+        else_=GRAVIDADE_STATUS["VIGENTE"],
+    )
+    tabela = ConformidadeEntidade.__table__
+
+    for tipo_alvo, alvo_id in set(chaves):
+        stmt = (
+            select(
+                func.max(gravidade),
+                func.min(case((Documento.validade >= hoje, Documento.validade))),
+                func.count(Documento.id),
+            )
+            .select_from(Vinculo)
+            .join(Documento, Documento.id == Vinculo.documento_id)
+            .where(Vinculo.tipo_alvo == tipo_alvo, Vinculo.alvo_id == alvo_id)
+        )
+        pior, proximo, total = conn.execute(stmt).one()
+
+        # Upsert portátil (MySQL e SQLite): remove e regrava na mesma transação
+        conn.execute(delete(tabela).where(and_(tabela.c.tipo_alvo == tipo_alvo, tabela.c.alvo_id == alvo_id)))
+        if total:
+            conn.execute(insert(tabela).values(
+                tipo_alvo=tipo_alvo,
+                alvo_id=alvo_id,
+                pior_status=STATUS_POR_GRAVIDADE.get(pior),
+                proximo_vencimento=proximo,
+                total_documentos=total,
+            ))
+
+
+def entidades_dos_documentos(conn: Connection, documento_ids: Iterable[int]) -> Set[Chave]:
+    """Entidades vinculadas aos documentos informados (usa o índice por documento_id)."""
+    ids = list(documento_ids)
+    if not ids:
+        return set()
+    stmt = select(Vinculo.tipo_alvo, Vinculo.alvo_id).where(Vinculo.documento_id.in_(ids)).distinct()
+    return {(t, a) for t, a in conn.execute(stmt)}
+
+
+@event.listens_for(Session, "after_flush")
+def _atualizar_rollup(session: Session, flush_context: Any) -> None:
+    """
+    Após cada flush, atualiza o rollup das entidades afetadas por:
+      - vínculos criados/removidos;
+      - documentos vinculados cujo status ou validade mudou.
+    """
+    chaves: Set[Chave] = set()
+    documento_ids: Set[int] = set()
+
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, Vinculo):
+            chaves.add((obj.tipo_alvo, obj.alvo_id))
+
+    for obj in session.dirty:
+        if isinstance(obj, Documento):
+            attrs = inspect(obj).attrs
+            if attrs.status_calc.history.has_changes() or attrs.validade.history.has_changes():
+                documento_ids.add(obj.id)
+        elif isinstance(obj, Vinculo) and session.is_modified(obj):
+            # Vínculo redirecionado: recalcula a entidade antiga e a nova
+            attrs = inspect(obj).attrs
+            antigo_tipo = (attrs.tipo_alvo.history.deleted or [obj.tipo_alvo])[0]
+            antigo_alvo = (attrs.alvo_id.history.deleted or [obj.alvo_id])[0]
+            chaves.add((antigo_tipo, antigo_alvo))
+            chaves.add((obj.tipo_alvo, obj.alvo_id))
+
+    if not chaves and not documento_ids:
+        return
+
+    conn = session.connection()
+    chaves |= entidades_dos_documentos(conn, documento_ids)
+    recalcular_entidades(conn, chaves)
\ No newline at end of file
@@ -0,0 +1,397 @@
+# itatchi/backend/logic/documentos.py
+# Consultas e validações de documentos compartilhadas pelas rotas Flask (síncronas)
+# e pelas rotas ASGI (assíncronas, via AsyncSession.run_sync).
+#
+# Todas as funções recebem a sessão explicitamente: db.session, a sessão de um
+# shard ou a sessão síncrona por trás de uma AsyncSession.
+#
+# As listagens não carregam instâncias ORM de Documento: selecionam só as colunas
+# usadas (nada de 'observacoes' TEXT nem identity map), lidas em lotes com yield_per,
+# e cada linha vira um registro compacto (NamedTuple) que o serializador consome.
+
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Type, TypeVar
+
+from sqlalchemy import Select, delete, func, select
+from sqlalchemy.orm import Session
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+# from itatchi.backend.models.models import Documento, Filial, TipoDocumento
+from models.models import Documento, Filial, TipoDocumento, Versao, Vinculo
+from logic.status_calculator import atualizar_status_pendentes, calcular_status
+from logic.alteracoes import documentos_alterados_desde, token_atual, token_seguro
+from logic.conformidade import entidades_dos_documentos, recalcular_entidades
+
+ChaveOrdenacao = Tuple[bool, date, int]
+
+# Tamanho do lote lido do cursor nas listagens (server-side cursor no MySQL)
+LOTE_LEITURA = 1000
+
+# Formato da listagem em streaming (GET /documentos com Accept: application/x-ndjson)
+MIMETYPE_NDJSON = "application/x-ndjson"
+
+
+def chave_ordenacao(validade: Optional[date], documento_id: int) -> ChaveOrdenacao:
+    """
+    Mesma ordem do ORDER BY validade, id (sem validade primeiro, como no MySQL/SQLite),
+    usada para mesclar os resultados já ordenados de cada shard.
+    """
+    return (validade is not None, validade or date.min, documento_id)
+
+
+def ler_data(valor: Optional[str]) -> Optional[date]:
+    """Converte 'YYYY-MM-DD' em date (None se vazio). Lança ValueError se inválido."""
+    if not valor:
+        return None
+    return datetime.strptime(valor, "%Y-%m-%d").date()
+
+
+# -----------------------------
+# Registros compactos (uma tupla por linha, sem ORM)
+# -----------------------------
+class RegistroDocumento(NamedTuple):
+    """Linha do GET /documentos (colunas na ordem do select de consultar_documentos)."""
+    id: int
+    titulo: str
+    responsavel: str
+    filial: Optional[str]
+    tipo: Optional[str]
+    validade: Optional[date]
+    status: Optional[str]
+
+    @property
+    def chave(self) -> ChaveOrdenacao:
+        return chave_ordenacao(self.validade, self.id)
+
+    def para_json(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "titulo": self.titulo,
+            "responsavel": self.responsavel,
+            "filial": self.filial or "",
+            "tipo": self.tipo or "",
+            "validade": str(self.validade) if self.validade else "Sem Validade",
+            "status": self.status,
+        }
+
+
+class RegistroHome(NamedTuple):
+    """Linha do GET /home (colunas na ordem do select de consultar_home)."""
+    id: int
+    titulo: str
+    tipo_id: int
+    filial_id: int
+    validade: Optional[date]
+    status: Optional[str]
+    responsavel: str
+
+    @property
+    def chave(self) -> ChaveOrdenacao:
+        return chave_ordenacao(self.validade, self.id)
+
+    def para_json(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "titulo": self.titulo,
+            "tipo_id": self.tipo_id,
+            "filial_id": self.filial_id,
+            "validade": self.validade.isoformat() if self.validade else None,
+            "status": self.status,
+            "responsavel": self.responsavel,
+        }
+
+
+class RegistroAlteracao(NamedTuple):
+    """Linha do GET /documentos/alteracoes (colunas na ordem do select de montar_alteracoes)."""
+    id: int
+    titulo: str
+    responsavel: str
+    filial_id: int
+    filial: Optional[str]
+    tipo_id: int
+    tipo: Optional[str]
+    categoria: Optional[str]
+    validade: Optional[date]
+    status: Optional[str]
+
+    def para_json(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "titulo": self.titulo,
+            "responsavel": self.responsavel,
+            "filial_id": self.filial_id,
+            "filial": self.filial or "",
+            "tipo_id": self.tipo_id,
+            "tipo": self.tipo or "",
+            "categoria": self.categoria or "",
+            "validade": self.validade.isoformat() if self.validade else None,
+            "status": self.status,
+        }
+
+
+R = TypeVar("R", RegistroDocumento, RegistroHome, RegistroAlteracao)
+
+
+def _ler_registros(sessao: Session, stmt: Select, registro: Type[R]) -> List[R]:
+    """Executa 'stmt' lendo em lotes (yield_per) e monta um registro por linha."""
+    resultado = sessao.execute(stmt.execution_options(yield_per=LOTE_LEITURA))
+    return list(map(registro._make, resultado.tuples()))
+
+
+# -----------------------------
+# GET /documentos
+# -----------------------------
+def _filtrar_documentos(stmt, titulo: Optional[str], status: Optional[str]):
+    if titulo:
+        stmt = stmt.where(Documento.titulo.ilike(f'%{titulo}%'))
+    if status:
+        stmt = stmt.where(Documento.status_calc == status)
+    return stmt
+
+
+def select_documentos(titulo: Optional[str], status: Optional[str]) -> Select:
+    """Select projetado do GET /documentos (colunas de RegistroDocumento), ordenado por validade."""
+    stmt = (
+        select(
+            Documento.id, Documento.titulo, Documento.responsavel,
+            Filial.nome, TipoDocumento.nome, Documento.validade, Documento.status_calc,
+        )
+        .outerjoin(Filial, Documento.filial_id == Filial.id)
+        .outerjoin(TipoDocumento, Documento.tipo_id == TipoDocumento.id)
+    )
+    return _filtrar_documentos(stmt, titulo, status).order_by(Documento.validade, Documento.id)
+
+
+def consultar_documentos(
+    sessao: Session,
+    titulo: Optional[str],
+    status: Optional[str],
+    limite: Optional[int] = None,
+) -> List[RegistroDocumento]:
+    """
+    Lista documentos (com nome da Filial e do Tipo) ordenados por validade.
+    Os filtros são executados no banco; 'limite' corta a consulta no fim da página pedida.
+    """
+    stmt = select_documentos(titulo, status)
+    if limite is not None:
+        stmt = stmt.limit(limite)
+
+    return _ler_registros(sessao, stmt, RegistroDocumento)
+
+
+def iterar_documentos(sessao: Session, titulo: Optional[str], status: Optional[str]) -> Iterator[RegistroDocumento]:
+    """
+    Mesma listagem de consultar_documentos, mas lida sob demanda do cursor
+    (lotes de LOTE_LEITURA): nunca mantém a tabela inteira em memória.
+    """
+    resultado = sessao.execute(select_documentos(titulo, status).execution_options(yield_per=LOTE_LEITURA))
+    for lote in resultado.tuples().partitions():
+        yield from map(RegistroDocumento._make, lote)
+
+
+def quer_ndjson(accept: Optional[str]) -> bool:
+    """True se o header Accept pede NDJSON explicitamente (preferido a application/json)."""
+    aceitos = parse_accept_header(accept or "", MIMEAccept)
+    return aceitos[MIMETYPE_NDJSON] > aceitos["application/json"]
+
+
+def linhas_ndjson(registros: Iterable[RegistroDocumento]) -> str:
+    """Serializa um lote de registros em NDJSON (um objeto JSON por linha)."""
+    return "".join(json.dumps(r.para_json(), ensure_ascii=False) + "\n" for r in registros)
+
+
+def contar_documentos(sessao: Session, titulo: Optional[str], status: Optional[str]) -> int:
+    """Total de documentos com os mesmos filtros de consultar_documentos (para paginação)."""
+    stmt = _filtrar_documentos(select(func.count(Documento.id)), titulo, status)
+    return sessao.execute(stmt).scalar() or 0
+
+
+# -----------------------------
+# GET /home
+# -----------------------------
+def consultar_home(
+    sessao: Session,
+    categoria: Optional[str],
+    inicio: Optional[date],
+    fim: Optional[date],
+) -> List[RegistroHome]:
+    """Documentos do período/categoria (Central de Consultas), ordenados por validade."""
+    # Junta com TipoDocumento para poder filtrar pela categoria
+    stmt = (
+        select(
+            Documento.id, Documento.titulo, Documento.tipo_id, Documento.filial_id,
+            Documento.validade, Documento.status_calc, Documento.responsavel,
+        )
+        .join(TipoDocumento, Documento.tipo_id == TipoDocumento.id)
+    )
+
+    # Filtro por categoria (se diferente de "Todas")
+    if categoria and categoria.lower() != "todas":
+        stmt = stmt.where(TipoDocumento.categoria == categoria)
+
+    # Filtro por período de validade
+    if inicio:
+        stmt = stmt.where(Documento.validade >= inicio)
+    if fim:
+        stmt = stmt.where(Documento.validade <= fim)
+
+    return _ler_registros(sessao, stmt.order_by(Documento.validade, Documento.id), RegistroHome)
+
+
+def separar_alertas(registros: List[RegistroHome]) -> Dict[str, List[Dict[str, Any]]]:
+    """Payload do /home: todos os documentos e o subset A_VENCER/VENCIDO."""
+    itens: List[Dict[str, Any]] = [r.para_json() for r in registros]
+    return {
+        "documentos_relacionados": itens,
+        "proximos_vencimento": [i for i in itens if i["status"] in ("A_VENCER", "VENCIDO")],
+    }
+
+
+# -----------------------------
+# POST /documentos
+# -----------------------------
+def montar_documento(dados: Dict[str, Any], horizonte: int) -> Tuple[Optional[Documento], Optional[str]]:
+    """
+    Valida o JSON de cadastro e monta o Documento com o status calculado.
+
+    Retorna:
+        - (Documento, None) se válido, ou (None, mensagem de erro) para responder 400.
+    """
+    # 1. Validação mínima de campos obrigatórios
+    required_fields = ['titulo', 'responsavel', 'filial_id', 'tipo_id']
+    if not all(k in dados for k in required_fields):
+        return None, "Campos obrigatórios (titulo, responsavel, filial_id, tipo_id) ausentes."
+
+    # 2. Ids inteiros positivos (filial_id também escolhe o shard do documento)
+    try:
+        filial_id, tipo_id = int(dados['filial_id']), int(dados['tipo_id'])
+    except (TypeError, ValueError):
+        return None, "Campos 'filial_id' e 'tipo_id' devem ser números inteiros."
+    if filial_id <= 0 or tipo_id <= 0:
+        return None, "Campos 'filial_id' e 'tipo_id' devem ser maiores que zero."
+
+    # 3. Conversão e validação de datas
+    try:
+        data_validade: Optional[date] = ler_data(dados.get('validade'))
+        data_emissao: Optional[date] = ler_data(dados.get('emissao'))
+    except ValueError:
+        return None, "Formato de data inválido. Use YYYY-MM-DD."
+
+    # 4. Cria o novo objeto Documento com o status calculado
+    return Documento(
+        filial_id=filial_id,
+        tipo_id=tipo_id,
+        titulo=dados.get('titulo'),
+        numero=dados.get('numero'),
+        responsavel=dados.get('responsavel'),
+        emissao=data_emissao,
+        validade=data_validade,
+        sem_validade=dados.get('sem_validade', False),
+        orgao_emissor=dados.get('orgao_emissor'),
+        observacoes=dados.get('observacoes'),
+        caminho_atual=dados.get('caminho_atual'),
+        status_calc=calcular_status(data_validade, horizonte),
+    ), None
+
+
+# -----------------------------
+# DELETE /documentos/<id>
+# -----------------------------
+def excluir_documento(sessao: Session, documento: Documento) -> None:
+    """
+    Remove o documento junto com as linhas que apontam para ele (versões e vínculos),
+    na mesma transação, e recalcula o rollup das entidades que perderam o documento.
+    Os blobs (tabela 'arquivo') ficam: são compartilhados por conteúdo.
+    Quem chama faz commit/rollback.
+    """
+    conn = sessao.connection()
+    chaves = entidades_dos_documentos(conn, [documento.id])
+
+    # DELETE em massa não passa pelo after_flush: o rollup é recalculado abaixo
+    sessao.execute(delete(Vinculo).where(Vinculo.documento_id == documento.id))
+    sessao.execute(delete(Versao).where(Versao.documento_id == documento.id))
+    sessao.delete(documento)
+    sessao.flush()
+
+    if chaves:
+        recalcular_entidades(conn, chaves)
+
+
+# -----------------------------
+# GET /documentos/alteracoes
+# -----------------------------
+def ler_token_composto(valor: Optional[str], partes: int) -> List[Optional[int]]:
+    """
+    Converte o 'desde' do feed em um token por shard ("t1-t2-...", na ordem dos
+    shards; um número só sem sharding). None em uma posição pede o retrato completo.
+    Sem token (ou "0") ou com outra quantidade de partes (mapa de shards mudou),
+    todos recebem None. Lança ValueError se o formato for inválido.
+    """
+    if not valor or valor == "0":
+        return [None] * partes
+    pedacos = valor.split("-")
+    if not all(p.isdigit() for p in pedacos):
+        raise ValueError(valor)
+    if len(pedacos) != partes:
+        return [None] * partes
+    return [int(p) for p in pedacos]
+
+
+def mesclar_alteracoes(resultados: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Junta as respostas de montar_alteracoes de cada shard (token composto na mesma ordem)."""
+    if len(resultados) == 1:
+        return resultados[0]
+    return {
+        "documentos": [d for r in resultados for d in r["documentos"]],
+        "removidos": [i for r in resultados for i in r["removidos"]],
+        "token": "-".join(str(r["token"]) for r in resultados),
+        "completo": all(r["completo"] for r in resultados),
+    }
+
+
+def montar_alteracoes(sessao: Session, desde: Optional[int], horizonte: int) -> Dict[str, Any]:
+    """
+    Documentos inseridos/alterados desde o token 'desde', ids removidos e o novo token.
+    Com desde=None, devolve o retrato completo.
+    """
+    # 1. Status que "venceram" com a passagem do tempo também viram alteração no log
+    atualizar_status_pendentes(sessao, horizonte)
+
+    # 2. Fixa o fim da leitura ANTES de ler os documentos (nada entre os dois se perde).
+    #    O token devolvido fica antes das entradas recentes: a próxima chamada as relê
+    #    (o cliente substitui pelo id) e pega as que confirmaram fora de ordem.
+    ultimo: int = token_atual(sessao)
+    token: int = min(token_seguro(sessao), ultimo)
+    completo: bool = desde is None or desde > ultimo
+
+    stmt = (
+        select(
+            Documento.id, Documento.titulo, Documento.responsavel,
+            Documento.filial_id, Filial.nome, Documento.tipo_id, TipoDocumento.nome,
+            TipoDocumento.categoria, Documento.validade, Documento.status_calc,
+        )
+        .outerjoin(Filial, Documento.filial_id == Filial.id)
+        .outerjoin(TipoDocumento, Documento.tipo_id == TipoDocumento.id)
+    )
+
+    removidos: List[int] = []
+    if completo:
+        registros = _ler_registros(sessao, stmt, RegistroAlteracao)
+    else:
+        ids_alterados: List[int] = documentos_alterados_desde(desde, ultimo, sessao)
+        registros = (
+            _ler_registros(sessao, stmt.where(Documento.id.in_(ids_alterados)), RegistroAlteracao)
+            if ids_alterados else []
+        )
+        # O que mudou e não existe mais é reportado como tombstone
+        encontrados = {r.id for r in registros}
+        removidos = [i for i in ids_alterados if i not in encontrados]
+
+    return {
+        "documentos": [r.para_json() for r in registros],
+        "removidos": removidos,
+        "token": token,
+        "completo": completo,
+    }
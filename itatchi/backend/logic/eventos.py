@@ -0,0 +1,329 @@
+# itatchi/backend/logic/eventos.py
+# Pub/sub em processo para o canal de eventos (SSE) da Central de Alertas.
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from flask import Flask
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+# from itatchi.backend.database.connection import db
+from database.connection import db
+from database.shards import mapa_shards
+from models.models import Documento, DocumentoAlteracao
+from logic.alteracoes import token_atual, token_seguro
+from logic.documentos import ler_token_composto
+from logic.status_calculator import atualizar_status_pendentes, obter_dias_alerta, obter_horizonte_alerta
+
+logger = logging.getLogger(__name__)
+
+# Operações do log que viram evento (ATUALIZADO sem mudança de status não interessa aos alertas)
+TIPOS_EVENTO: Dict[str, str] = {
+    "INSERIDO": "documento_criado",
+    "STATUS": "status_alterado",
+    "REMOVIDO": "documento_removido",
+}
+
+# Máximo de entradas do log lidas por consulta
+LOTE_EVENTOS = 500
+
+# Intervalo (s) do comentário de keep-alive enviado a ouvintes ociosos
+HEARTBEAT_SEGUNDOS = 15
+
+# Quanto um novo ouvinte espera o poller ler a posição inicial dos shards (banco lento na subida)
+ESPERA_POLLER_SEGUNDOS = 5.0
+
+FilaEventos = Union["queue.Queue[Dict[str, Any]]", "asyncio.Queue[Dict[str, Any]]"]
+
+
+class Barramento:
+    """
+    Distribui eventos de documentos para os assinantes do processo.
+
+    Uma ÚNICA thread por processo consulta o log 'documento_alteracao' de cada
+    shard (mapa_shards.em_todos) e faz o fan-out para as filas dos assinantes.
+    Como as réplicas leem os mesmos logs, eles fazem o papel de broker entre elas:
+    o custo no banco não cresce com o número de ouvintes. Ouvintes da app Flask
+    recebem uma queue.Queue (cada um ocupa a thread da sua conexão); os da app
+    ASGI recebem uma asyncio.Queue (assinar_async) e não ocupam thread nenhuma.
+
+    O poller relê cada shard a partir do seu token seguro (logic.alteracoes.token_seguro)
+    e descarta o que já publicou: uma entrada com id menor que a última vista, mas
+    cujo commit terminou depois, ainda vira evento.
+    """
+
+    def __init__(self, intervalo: float = 2.0, tamanho_fila: int = 100) -> None:
+        self.intervalo = intervalo
+        self.tamanho_fila = tamanho_fila
+        self._app: Optional[Flask] = None
+        self._assinantes: Set["queue.Queue[Dict[str, Any]]"] = set()
+        self._assinantes_async: Dict["asyncio.Queue[Dict[str, Any]]", asyncio.AbstractEventLoop] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        # Quantos shards o poller já posicionou (muda junto com o mapa de shards)
+        self._shards_lidos = 0
+        self._posicionado = threading.Condition()
+
+    def init_app(self, app: Flask) -> None:
+        """Associa o barramento à aplicação (necessário para o poller acessar o banco)."""
+        self._app = app
+        self.intervalo = float(os.getenv("EVENTOS_INTERVALO_SEGUNDOS", self.intervalo))
+
+    # -----------------------------
+    # Assinaturas
+    # -----------------------------
+    def assinar(self) -> "queue.Queue[Dict[str, Any]]":
+        """Cria a fila de um novo ouvinte e garante que o poller está rodando."""
+        fila: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=self.tamanho_fila)
+        with self._lock:
+            self._assinantes.add(fila)
+        self._garantir_poller()
+        return fila
+
+    def assinar_async(self) -> "asyncio.Queue[Dict[str, Any]]":
+        """Como assinar, para um ouvinte no event loop atual (app ASGI)."""
+        fila: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=self.tamanho_fila)
+        with self._lock:
+            self._assinantes_async[fila] = asyncio.get_running_loop()
+        self._garantir_poller()
+        return fila
+
+    def cancelar(self, fila: FilaEventos) -> None:
+        """Remove a fila de um ouvinte desconectado."""
+        with self._lock:
+            self._assinantes.discard(fila)
+            self._assinantes_async.pop(fila, None)
+
+    def total_assinantes(self) -> int:
+        with self._lock:
+            return len(self._assinantes) + len(self._assinantes_async)
+
+    def publicar(self, evento: Dict[str, Any]) -> None:
+        """
+        Entrega o evento a todos os assinantes do processo.
+        Ouvinte lento (fila cheia) perde o evento em vez de travar os demais;
+        ao reconectar com Last-Event-ID ele recupera o que perdeu.
+        """
+        with self._lock:
+            assinantes = list(self._assinantes)
+            assinantes_async = list(self._assinantes_async.items())
+        for fila in assinantes:
+            try:
+                fila.put_nowait(evento)
+            except queue.Full:
+                pass
+        for fila_async, loop in assinantes_async:
+            try:
+                loop.call_soon_threadsafe(_entregar_async, fila_async, evento)
+            except RuntimeError:
+                # Event loop encerrado sem cancelar a assinatura
+                self.cancelar(fila_async)
+
+    def retomar(self, ultimo_id: Optional[str]) -> Tuple[List[int], List[Dict[str, Any]]]:
+        """
+        Posição inicial de um novo stream: o cursor (um seq por shard, na ordem
+        dos shards) e os eventos perdidos desde 'ultimo_id' (Last-Event-ID, no
+        formato do cursor). Sem 'ultimo_id' válido, o cursor parte do fim do log
+        de cada shard e não há reposição.
+
+        Chamar DEPOIS de assinar: o que for publicado enquanto o histórico é lido
+        fica na fila em vez de se perder entre as duas etapas.
+        """
+        # Espera o poller posicionar os shards: o que entrar no log depois disso é publicado
+        with self._posicionado:
+            self._posicionado.wait_for(
+                lambda: self._shards_lidos == mapa_shards.total(), timeout=ESPERA_POLLER_SEGUNDOS
+            )
+
+        with self._app.app_context():
+            try:
+                tokens = ler_token_composto(ultimo_id, mapa_shards.total())
+            except ValueError:
+                tokens = [None] * mapa_shards.total()
+            if None in tokens:
+                return mapa_shards.em_todos(token_atual), []
+
+            def ler(sessao: Session, argumento: Tuple[int, int]) -> List[Dict[str, Any]]:
+                shard, desde = argumento
+                return eventos_desde(sessao, desde, shard)
+
+            lotes = mapa_shards.em_cada(ler, list(enumerate(tokens)))
+            return tokens, [evento for lote in lotes for evento in lote]
+
+    # -----------------------------
+    # Poller (uma thread por processo)
+    # -----------------------------
+    def _garantir_poller(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._app is None:
+                raise RuntimeError("Barramento sem aplicação. Chame barramento.init_app(app).")
+            self._thread = threading.Thread(target=self._loop, name="barramento-eventos", daemon=True)
+            self._thread.start()
+
+    def _loop(self) -> None:
+        with self._app.app_context():
+            # Posição de cada shard e, por shard, os seqs da janela já publicados
+            desde: List[int] = []
+            publicados: List[Set[int]] = []
+            ultimo_dia: Optional[date] = None
+
+            while True:
+                try:
+                    # Subida (ou mapa de shards alterado): o que já estava no log não é novidade para ninguém
+                    if len(desde) != mapa_shards.total():
+                        iniciais: List[int] = mapa_shards.em_todos(token_seguro)
+                        publicados = [{e["seq"] for e in janela} for janela in self._janelas(iniciais)]
+                        desde = iniciais
+                        with self._posicionado:
+                            self._shards_lidos = len(desde)
+                            self._posicionado.notify_all()
+
+                    # Virada do dia: status que venceram com o tempo e novos limiares de alerta
+                    if ultimo_dia != date.today():
+                        hoje = date.today()
+                        horizonte = obter_horizonte_alerta()
+                        dias = obter_dias_alerta()
+                        mapa_shards.em_todos(lambda sessao: atualizar_status_pendentes(sessao, horizonte))
+                        for lote in mapa_shards.em_todos(lambda sessao: eventos_de_limiar(sessao, hoje, dias)):
+                            for evento in lote:
+                                self.publicar(evento)
+                        ultimo_dia = hoje
+
+                    # Janela desde o token seguro de cada shard; só os seqs ainda não publicados viram evento
+                    for shard, janela in enumerate(self._janelas(desde)):
+                        for evento in janela:
+                            if evento["seq"] not in publicados[shard]:
+                                publicados[shard].add(evento["seq"])
+                                self.publicar(evento)
+                    seguros: List[int] = mapa_shards.em_todos(token_seguro)
+                    desde = [max(atual, seguro) for atual, seguro in zip(desde, seguros)]
+                    publicados = [{seq for seq in vistos if seq > d} for vistos, d in zip(publicados, desde)]
+                except Exception:
+                    db.session.rollback()
+                    logger.exception("Erro no poller de eventos")
+                finally:
+                    # Não segura conexão do pool entre as consultas
+                    db.session.remove()
+
+                time.sleep(self.intervalo)
+
+    @staticmethod
+    def _janelas(desde: List[int]) -> List[List[Dict[str, Any]]]:
+        """Eventos de cada shard após a sua posição em 'desde' (shards consultados em paralelo)."""
+        def ler(sessao: Session, argumento: Tuple[int, int]) -> List[Dict[str, Any]]:
+            shard, inicio = argumento
+            return list(_janela(sessao, inicio, shard))
+
+        return mapa_shards.em_cada(ler, list(enumerate(desde)))
+
+
+def _entregar_async(fila: "asyncio.Queue[Dict[str, Any]]", evento: Dict[str, Any]) -> None:
+    """Roda no event loop do ouvinte ASGI (mesma regra de fila cheia de publicar)."""
+    try:
+        fila.put_nowait(evento)
+    except asyncio.QueueFull:
+        pass
+
+
+def _janela(sessao: Session, desde: int, shard: int) -> Iterator[Dict[str, Any]]:
+    """Todos os eventos do shard após 'desde', em páginas (a janela pode ter mais que um lote)."""
+    while True:
+        lote = eventos_desde(sessao, desde, shard)
+        yield from lote
+        if len(lote) < LOTE_EVENTOS:
+            return
+        desde = lote[-1]["seq"]
+
+
+def eventos_desde(sessao: Session, ultimo_id: int, shard: int = 0, limite: int = LOTE_EVENTOS) -> List[Dict[str, Any]]:
+    """
+    Converte as entradas do log do shard após 'ultimo_id' em eventos compactos.
+    'seq' é o id no log do próprio shard; 'shard' diz a que log ele pertence.
+    """
+    stmt = (
+        select(DocumentoAlteracao.id, DocumentoAlteracao.documento_id,
+               DocumentoAlteracao.operacao, DocumentoAlteracao.status)
+        .where(DocumentoAlteracao.id > ultimo_id, DocumentoAlteracao.operacao.in_(list(TIPOS_EVENTO)))
+        .order_by(DocumentoAlteracao.id)
+        .limit(limite)
+    )
+    eventos: List[Dict[str, Any]] = []
+    for seq, documento_id, operacao, status in sessao.execute(stmt):
+        tipo = TIPOS_EVENTO.get(operacao)
+        if tipo is None:
+            continue
+        eventos.append({"seq": seq, "shard": shard, "tipo": tipo, "id": documento_id, "status": status})
+    return eventos
+
+
+def eventos_de_limiar(sessao: Session, hoje: date, dias_alerta: List[int]) -> List[Dict[str, Any]]:
+    """
+    Documentos do shard que atingem hoje um dos dias de alerta configurados
+    (ex: faltam exatamente 30, 60 ou 90 dias para a validade).
+    """
+    limiares: Dict[date, int] = {hoje + timedelta(days=d): d for d in dias_alerta}
+    stmt = (
+        select(Documento.id, Documento.validade, Documento.status_calc)
+        .where(Documento.validade.in_(list(limiares)))
+    )
+    return [
+        {"seq": None, "tipo": "limiar_alerta", "id": doc_id, "status": status, "dias": limiares[validade]}
+        for doc_id, validade, status in sessao.execute(stmt)
+    ]
+
+
+class FluxoSSE:
+    """
+    Texto SSE de um ouvinte (comum às apps Flask e ASGI).
+
+    O id de cada evento é o cursor do ouvinte: o maior seq já enviado de cada
+    shard, no formato do token composto ("t1-t2-..."; um número só sem sharding).
+    O EventSource o devolve em Last-Event-ID ao reconectar (ver Barramento.retomar).
+    """
+
+    def __init__(self, cursor: List[int], pendentes: List[Dict[str, Any]]) -> None:
+        self.cursor = list(cursor)
+        self._pendentes = pendentes
+        self._enviados: Set[Tuple[int, int]] = set()
+
+    def inicio(self) -> Iterator[str]:
+        """Instrução de reconexão e a reposição do que o ouvinte perdeu."""
+        # Orienta o EventSource a reconectar após 5s se a conexão cair
+        yield "retry: 5000\n\n"
+        for evento in self._pendentes:
+            self._enviados.add((evento["shard"], evento["seq"]))
+            yield self._formatar(evento)
+
+    def formatar(self, evento: Dict[str, Any]) -> Optional[str]:
+        """Texto do evento vindo do barramento (None se já saiu na reposição)."""
+        # O mesmo evento chega pelos dois caminhos quando é publicado durante a reposição
+        chave = (evento.get("shard"), evento.get("seq"))
+        if chave in self._enviados:
+            self._enviados.discard(chave)
+            return None
+        return self._formatar(evento)
+
+    def _formatar(self, evento: Dict[str, Any]) -> str:
+        """Formata um evento no protocolo SSE (id só para eventos vindos do log)."""
+        linhas = ""
+        shard = evento.get("shard")
+        if evento.get("seq") is not None and shard is not None and shard < len(self.cursor):
+            self.cursor[shard] = max(self.cursor[shard], evento["seq"])
+            linhas += f"id: {'-'.join(str(seq) for seq in self.cursor)}\n"
+        linhas += f"event: {evento['tipo']}\n"
+        linhas += f"data: {json.dumps(evento, separators=(',', ':'))}\n\n"
+        return linhas
+
+
+# Instância única do processo (mesmo padrão do objeto 'db')
+barramento = Barramento()
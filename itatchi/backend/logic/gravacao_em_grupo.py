@@ -0,0 +1,214 @@
+# itatchi/backend/logic/gravacao_em_grupo.py
+# Commit em grupo (group commit) dos cadastros unitários: POSTs simultâneos viram
+# uma transação multi-linha por shard, com resposta individual para cada requisição.
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future, TimeoutError as FuturoExpirado
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Flask
+
+from database.connection import db
+from database.shards import mapa_shards
+from models.models import Documento
+
+Pedido = Tuple[Documento, "Future[Dict[str, Any]]"]
+
+logger = logging.getLogger(__name__)
+
+
+class CadastroNaoGravado(TimeoutError):
+    """Espera esgotada com o pedido ainda na fila: foi retirado e nunca será gravado (repetir é seguro)."""
+
+
+class ResultadoDesconhecido(TimeoutError):
+    """Espera esgotada com o lote do pedido já em gravação: o commit pode ou não ter acontecido."""
+
+
+class GravacaoEmGrupo:
+    """
+    Fila do processo para o POST /documentos, ligada por GRUPO_COMMIT=1.
+
+    Uma thread gravadora junta os cadastros que chegam até fechar um lote, por
+    tamanho (GRUPO_COMMIT_MAX_LOTE) ou por tempo (GRUPO_COMMIT_ESPERA_MS contados
+    do primeiro da fila), e grava cada shard em UMA transação: um commit (um fsync
+    no MySQL) para o lote inteiro, em vez de um por requisição.
+
+    Durabilidade: igual ao caminho direto. A requisição só recebe 201 (com o seu id)
+    depois do COMMIT do lote. Se o processo cair antes disso, ninguém recebeu
+    confirmação e o cliente repete o POST como faria com uma conexão perdida. O custo
+    é a latência extra de até GRUPO_COMMIT_ESPERA_MS por cadastro.
+
+    Isolamento de erros: se o lote falhar (ex: filial inexistente em um dos
+    documentos), ele é desfeito e cada documento é regravado sozinho. Só quem
+    causou o erro recebe 500; os demais recebem 201 normalmente.
+
+    O lote é limitado pelas escritas simultâneas admitidas (ADMISSAO_MAX_GLOBAL).
+
+    Espera esgotada (GRUPO_COMMIT_TIMEOUT_SEGUNDOS): se o pedido ainda estava na
+    fila, ele é cancelado (a gravadora o descarta) e gravar() levanta
+    CadastroNaoGravado: o POST pode ser repetido sem duplicar. Se o lote dele já
+    estava sendo gravado, não dá para desfazer: gravar() levanta ResultadoDesconhecido
+    e o cliente precisa conferir (ex: pelo feed de alterações) antes de repetir.
+    """
+
+    def __init__(self) -> None:
+        self.ativo: bool = False
+        self.max_lote: int = 64
+        self.espera: float = 0.005
+        self.timeout: float = 30.0
+        self._app: Optional[Flask] = None
+        self._fila: "queue.Queue[Pedido]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._contadores: Dict[str, int] = {"lotes": 0, "documentos": 0, "regravados_sozinhos": 0, "maior_lote": 0}
+
+    def init_app(self, app: Flask) -> None:
+        """Lê GRUPO_COMMIT_* e, se ligado, sobe a thread gravadora."""
+        self._app = app
+        self.ativo = os.getenv("GRUPO_COMMIT", "0") == "1"
+        self.max_lote = int(os.getenv("GRUPO_COMMIT_MAX_LOTE", self.max_lote))
+        self.espera = float(os.getenv("GRUPO_COMMIT_ESPERA_MS", self.espera * 1000)) / 1000
+        self.timeout = float(os.getenv("GRUPO_COMMIT_TIMEOUT_SEGUNDOS", self.timeout))
+        if self.ativo:
+            self._garantir_gravadora()
+
+    def _garantir_gravadora(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._gravadora, name="grupo-commit", daemon=True)
+                self._thread.start()
+
+    # -----------------------------
+    # Lado da requisição
+    # -----------------------------
+    def gravar(self, documento: Documento) -> Dict[str, Any]:
+        """
+        Enfileira o documento e espera o commit do lote em que ele entrar.
+        Retorna {id, status}; relança a exceção do banco se o documento falhar.
+        Levanta CadastroNaoGravado ou ResultadoDesconhecido se a espera esgotar.
+        """
+        # Devolve ao pool a conexão que a requisição ainda segura (ex: leitura do horizonte):
+        # com muitos cadastros esperando, a gravadora ficaria sem conexão para o lote
+        db.session.close()
+        self._garantir_gravadora()
+
+        futuro: "Future[Dict[str, Any]]" = Future()
+        self._fila.put((documento, futuro))
+        try:
+            return futuro.result(timeout=self.timeout)
+        except FuturoExpirado:
+            # Só sai da fila se a gravadora ainda não o pegou; senão o commit está em andamento
+            if futuro.cancel():
+                raise CadastroNaoGravado(f"Cadastro não gravado: espera de {self.timeout:g}s esgotada na fila.")
+            if futuro.done():
+                return futuro.result()
+            raise ResultadoDesconhecido(
+                f"Espera de {self.timeout:g}s esgotada durante a gravação do lote; o cadastro pode ter sido gravado."
+            )
+
+    # -----------------------------
+    # Thread gravadora
+    # -----------------------------
+    def _proximo_lote(self) -> List[Pedido]:
+        """Bloqueia até o primeiro pedido e junta os seguintes até encher o lote ou esgotar a espera."""
+        lote: List[Pedido] = [self._fila.get()]
+        limite = time.monotonic() + self.espera
+        while len(lote) < self.max_lote:
+            restante = limite - time.monotonic()
+            try:
+                lote.append(self._fila.get(timeout=restante) if restante > 0 else self._fila.get_nowait())
+            except queue.Empty:
+                break
+        return lote
+
+    def _gravadora(self) -> None:
+        while True:
+            # Pedidos cancelados por espera esgotada saem do lote sem gravar
+            lote = [pedido for pedido in self._proximo_lote() if pedido[1].set_running_or_notify_cancel()]
+            if not lote:
+                continue
+            with self._app.app_context():
+                try:
+                    por_filial: Dict[Any, List[Pedido]] = defaultdict(list)
+                    for pedido in lote:
+                        por_filial[pedido[0].filial_id].append(pedido)
+                    # Um commit por shard (sem sharding, um único grupo)
+                    por_shard: Dict[Any, List[Pedido]] = defaultdict(list)
+                    for filial_id, pedidos in por_filial.items():
+                        chave = mapa_shards.engine_da_filial(filial_id) if mapa_shards.ativo else None
+                        por_shard[chave].extend(pedidos)
+                    for pedidos in por_shard.values():
+                        self._gravar_grupo(pedidos)
+                except Exception as e:
+                    # Nenhum pedido pode ficar sem resposta
+                    for _, futuro in lote:
+                        if not futuro.done():
+                            futuro.set_exception(e)
+                finally:
+                    db.session.remove()
+
+            with self._lock:
+                self._contadores["lotes"] += 1
+                self._contadores["documentos"] += len(lote)
+                self._contadores["maior_lote"] = max(self._contadores["maior_lote"], len(lote))
+
+    def _gravar_grupo(self, pedidos: List[Pedido]) -> None:
+        """Grava os pedidos de um shard numa transação; se falhar, regrava um a um."""
+        falha: Optional[Exception] = None
+        with mapa_shards.sessao_da_filial(pedidos[0][0].filial_id) as sessao:
+            try:
+                sessao.add_all([documento for documento, _ in pedidos])
+                sessao.flush()
+                # Lidos antes do commit (depois dele os objetos expiram e exigiriam nova consulta)
+                resultados = [{"id": d.id, "status": d.status_calc} for d, _ in pedidos]
+                sessao.commit()
+            except Exception as e:
+                sessao.rollback()
+                falha = e
+
+        if falha is None:
+            for (_, futuro), resultado in zip(pedidos, resultados):
+                futuro.set_result(resultado)
+            return
+
+        if len(pedidos) == 1:
+            pedidos[0][1].set_exception(falha)
+            return
+
+        logger.warning("Lote de %d cadastros falhou, regravando um a um: %s", len(pedidos), falha)
+        with self._lock:
+            self._contadores["regravados_sozinhos"] += len(pedidos)
+        for documento, futuro in pedidos:
+            self._gravar_grupo([(_copiar(documento), futuro)])
+
+    def metricas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ativo": self.ativo,
+                "na_fila": self._fila.qsize(),
+                **self._contadores,
+                "limites": {"max_lote": self.max_lote, "espera_ms": self.espera * 1000},
+            }
+
+
+def _copiar(documento: Documento) -> Documento:
+    """
+    Documento novo (transitório) com os valores informados no cadastro, para regravar
+    depois de um lote desfeito. Não copia o id nem as colunas preenchidas pelo banco.
+    """
+    carregados = documento.__dict__
+    return Documento(**{
+        c.key: carregados[c.key]
+        for c in Documento.__table__.columns
+        if c.key in carregados and not c.primary_key and c.server_default is None
+    })
+
+
+# Instância única do processo
+gravacao_em_grupo = GravacaoEmGrupo()
@@ -0,0 +1,164 @@
+# itatchi/backend/logic/prontidao.py
+# Aquecimento do processo na subida (pool do banco e caches) e estado de prontidão (/pronto).
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import Flask
+from sqlalchemy import text
+
+from database.connection import db
+from database.shards import mapa_shards
+from logic.busca import indice_trigramas
+from logic.cobertura import cache_matriz
+
+logger = logging.getLogger(__name__)
+
+
+def conexoes_aquecidas() -> int:
+    """Conexões abertas por pool no aquecimento (PRONTIDAO_CONEXOES)."""
+    return int(os.getenv("PRONTIDAO_CONEXOES", "4"))
+
+
+def _aquecer_pool() -> None:
+    """Abre PRONTIDAO_CONEXOES conexões por shard ao mesmo tempo e as devolve ao pool."""
+    quantidade = conexoes_aquecidas()
+    for engine in mapa_shards.engines():
+        conexoes = []
+        try:
+            for _ in range(quantidade):
+                conexao = engine.connect()
+                conexao.execute(text("SELECT 1"))
+                conexoes.append(conexao)
+        finally:
+            for conexao in conexoes:
+                conexao.close()
+
+
+def _aquecer_matriz() -> None:
+    cache_matriz.obter()
+
+
+def _aquecer_busca() -> None:
+    # No MySQL a busca usa o FULLTEXT; nos demais bancos o índice de trigramas de cada shard é montado aqui
+    indice_trigramas.sincronizar()
+
+
+ETAPAS: List[Tuple[str, Callable[[], None]]] = [
+    # Faixas de ids e tabelas de referência dos shards (se o init_app não conseguiu)
+    ("shards", mapa_shards.preparar),
+    ("pool", _aquecer_pool),
+    ("matriz", _aquecer_matriz),
+    ("busca", _aquecer_busca),
+]
+
+
+class Prontidao:
+    """
+    Aquece o processo em segundo plano logo após a subida: preparação dos shards,
+    conexões do pool de cada shard, cache da matriz de conformidade e índice de busca. Enquanto isso, /pronto
+    responde 503 e o orquestrador não manda tráfego para a réplica; a primeira
+    requisição de um usuário não paga a conexão ao banco nem a montagem dos caches.
+
+    Os dois pontos de entrada usam a mesma instância: o app_asgi acrescenta a etapa
+    do pool assíncrono (adicionar_etapa) e serve o mesmo /pronto do Flask.
+
+    Se o banco ainda não estiver no ar (ex: subida junto com o MySQL), tenta de novo
+    a cada PRONTIDAO_INTERVALO_SEGUNDOS. PRONTIDAO_AQUECER=0 desliga o aquecimento
+    (o processo fica pronto na hora).
+    """
+
+    def __init__(self) -> None:
+        self.intervalo: float = 2.0
+        self._app: Optional[Flask] = None
+        self._pronto = threading.Event()
+        self._inicio: float = time.monotonic()
+        self._extras: List[Tuple[str, Callable[[], None]]] = []
+        self._etapas: Dict[str, float] = {}
+        self._tentativas: int = 0
+        self._erro: Optional[str] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def init_app(self, app: Flask) -> None:
+        self._app = app
+        self._inicio = time.monotonic()
+        self.intervalo = float(os.getenv("PRONTIDAO_INTERVALO_SEGUNDOS", self.intervalo))
+        with self._lock:
+            self._iniciar()
+
+    def adicionar_etapa(self, nome: str, etapa: Callable[[], None]) -> None:
+        """
+        Etapa extra do aquecimento (ex: pool do engine assíncrono na subida do ASGI).
+        Uma etapa com o mesmo nome é substituída e roda de novo; se o aquecimento já
+        tinha terminado, o processo volta a "não pronto" até ela concluir.
+        """
+        with self._lock:
+            self._extras = [(n, e) for n, e in self._extras if n != nome] + [(nome, etapa)]
+            self._etapas.pop(nome, None)
+            self._iniciar()
+
+    def _iniciar(self) -> None:
+        """Sobe a thread de aquecimento se ela não estiver rodando (chamado com o lock)."""
+        if os.getenv("PRONTIDAO_AQUECER", "1") == "0":
+            self._pronto.set()
+            return
+        if self._thread is not None:
+            # A thread em andamento confere as etapas pendentes antes de marcar pronto
+            return
+        self._pronto.clear()
+        self._thread = threading.Thread(target=self._aquecer, name="prontidao", daemon=True)
+        self._thread.start()
+
+    @property
+    def pronto(self) -> bool:
+        return self._pronto.is_set()
+
+    def aguardar(self, timeout: Optional[float] = None) -> bool:
+        return self._pronto.wait(timeout)
+
+    def _pendentes(self) -> List[Tuple[str, Callable[[], None]]]:
+        with self._lock:
+            return [(n, e) for n, e in [*ETAPAS, *self._extras] if n not in self._etapas]
+
+    def _aquecer(self) -> None:
+        while True:
+            self._tentativas += 1
+            try:
+                with self._app.app_context():
+                    try:
+                        for nome, etapa in self._pendentes():
+                            inicio = time.perf_counter()
+                            etapa()
+                            self._etapas[nome] = round((time.perf_counter() - inicio) * 1000, 1)
+                    finally:
+                        db.session.remove()
+                self._erro = None
+                with self._lock:
+                    # Etapa acrescentada durante esta rodada: roda mais uma
+                    if any(n not in self._etapas for n, _ in [*ETAPAS, *self._extras]):
+                        continue
+                    self._thread = None
+                    self._pronto.set()
+                logger.info("Processo pronto em %.2fs (etapas em ms: %s)", time.monotonic() - self._inicio, self._etapas)
+                return
+            except Exception as e:
+                self._erro = str(e)
+                logger.warning("Aquecimento falhou (tentativa %d), tentando de novo: %s", self._tentativas, e)
+                time.sleep(self.intervalo)
+
+    def estado(self) -> Dict[str, Any]:
+        return {
+            "pronto": self.pronto,
+            "segundos_desde_subida": round(time.monotonic() - self._inicio, 2),
+            "etapas_ms": dict(self._etapas),
+            "tentativas": self._tentativas,
+            "erro": self._erro,
+        }
+
+
+# Instância única do processo
+prontidao = Prontidao()
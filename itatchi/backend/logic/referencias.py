@@ -0,0 +1,45 @@
+# itatchi/backend/logic/referencias.py
+# Dados de referência (filiais, tipos de documento e categorias) para os formulários e filtros.
+
+import hashlib
+import json
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.models import Filial, TipoDocumento
+
+
+def carregar_referencias(sessao: Session) -> Tuple[Dict[str, Any], str]:
+    """
+    Lê filiais, tipos e categorias (tabelas pequenas, replicadas em todos os shards)
+    e devolve os dados junto com o ETag forte: hash do JSON canônico, que só muda
+    quando algum cadastro de referência muda.
+    """
+    filiais = sessao.execute(
+        select(Filial.id, Filial.nome, Filial.codigo).order_by(Filial.nome, Filial.id)
+    ).all()
+    tipos = sessao.execute(
+        select(
+            TipoDocumento.id, TipoDocumento.nome, TipoDocumento.categoria,
+            TipoDocumento.obrigatorio, TipoDocumento.prazo_padrao_dias,
+        ).order_by(TipoDocumento.categoria, TipoDocumento.nome, TipoDocumento.id)
+    ).all()
+
+    dados: Dict[str, Any] = {
+        "filiais": [{"id": f.id, "nome": f.nome, "codigo": f.codigo} for f in filiais],
+        "tipos": [
+            {
+                "id": t.id,
+                "nome": t.nome,
+                "categoria": t.categoria,
+                "obrigatorio": bool(t.obrigatorio),
+                "prazo_padrao_dias": t.prazo_padrao_dias,
+            }
+            for t in tipos
+        ],
+        "categorias": sorted({t.categoria for t in tipos}),
+    }
+    canonico = json.dumps(dados, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return dados, hashlib.sha256(canonico).hexdigest()[:32]
@@ -0,0 +1,264 @@
+# itatchi/backend/logic/relatorios.py
+# Fila de relatórios Excel gerados em segundo plano, com cache dos arquivos prontos.
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from flask import Flask
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database.connection import db
+from database.shards import mapa_shards
+from models.models import Documento, Filial, TipoDocumento
+from logic.alteracoes import token_atual
+
+# pandas (e o xlsxwriter, que ele carrega ao gravar) só é importado pelo worker,
+# no primeiro relatório: a subida do processo não paga essa importação
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Estados de um job
+NA_FILA = "NA_FILA"
+PROCESSANDO = "PROCESSANDO"
+CONCLUIDO = "CONCLUIDO"
+ERRO = "ERRO"
+
+# Job "em andamento" sem atualização há mais que isso é considerado abandonado (ex: réplica reiniciada)
+JOB_ABANDONADO_SEGUNDOS = 600
+
+ID_JOB_RE = re.compile(r"^[0-9a-f]{16}-[0-9-]+$")
+logger = logging.getLogger(__name__)
+
+COLUNAS: List[str] = [
+    "id", "titulo", "numero", "responsavel", "filial", "categoria",
+    "tipo", "emissao", "validade", "status",
+]
+
+
+def normalizar_filtros(dados: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Valida e normaliza os filtros do relatório (mesmos da Central de Consultas).
+    Lança ValueError com a mensagem para o cliente se algo for inválido.
+    """
+    filtros: Dict[str, Any] = {
+        "categoria": dados.get("categoria") or "Todas",
+        "inicio": dados.get("inicio"),
+        "fim": dados.get("fim"),
+        "status": sorted(set(dados.get("status") or [])),
+        "filial_id": int(dados["filial_id"]) if dados.get("filial_id") else None,
+    }
+    for campo in ("inicio", "fim"):
+        if filtros[campo]:
+            filtros[campo] = datetime.strptime(filtros[campo], "%Y-%m-%d").date().isoformat()
+    if filtros["inicio"] and filtros["fim"] and filtros["fim"] < filtros["inicio"]:
+        raise ValueError("A data final não pode ser menor que a data inicial.")
+    return filtros
+
+
+def hash_filtros(filtros: Dict[str, Any]) -> str:
+    """Hash estável dos filtros normalizados (mesmos filtros, mesmo hash)."""
+    return hashlib.sha256(json.dumps(filtros, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def versao_dados() -> str:
+    """Versão dos dados: token do log de alterações de cada shard. Muda a cada escrita."""
+    return "-".join(str(t) for t in mapa_shards.em_todos(token_atual))
+
+
+def _consultar(sessao: Session, filtros: Dict[str, Any]) -> List[Tuple[Any, ...]]:
+    """Linhas do relatório (só as colunas exportadas, sem instâncias ORM)."""
+    stmt = (
+        select(
+            Documento.id, Documento.titulo, Documento.numero, Documento.responsavel,
+            Filial.nome, TipoDocumento.categoria, TipoDocumento.nome,
+            Documento.emissao, Documento.validade, Documento.status_calc,
+        )
+        .outerjoin(Filial, Documento.filial_id == Filial.id)
+        .outerjoin(TipoDocumento, Documento.tipo_id == TipoDocumento.id)
+        .order_by(Documento.validade, Documento.id)
+    )
+    if filtros["categoria"].lower() != "todas":
+        stmt = stmt.where(TipoDocumento.categoria == filtros["categoria"])
+    if filtros["inicio"]:
+        stmt = stmt.where(Documento.validade >= date.fromisoformat(filtros["inicio"]))
+    if filtros["fim"]:
+        stmt = stmt.where(Documento.validade <= date.fromisoformat(filtros["fim"]))
+    if filtros["status"]:
+        stmt = stmt.where(Documento.status_calc.in_(filtros["status"]))
+    if filtros["filial_id"]:
+        stmt = stmt.where(Documento.filial_id == filtros["filial_id"])
+    return [tuple(linha) for linha in sessao.execute(stmt)]
+
+
+def _nome_aba(nome: str, usados: set) -> str:
+    """Nome de aba válido no Excel (até 31 caracteres, sem []:*?/\\) e sem repetição."""
+    base = re.sub(r"[\[\]:*?/\\]", "-", nome or "Sem filial")[:31]
+    candidato, n = base, 2
+    while candidato.lower() in usados:
+        sufixo = f" ({n})"
+        candidato, n = base[:31 - len(sufixo)] + sufixo, n + 1
+    usados.add(candidato.lower())
+    return candidato
+
+
+class FilaRelatorios:
+    """
+    Gera relatórios em um pool de workers e guarda o resultado em disco.
+
+    Cada job é identificado por <hash dos filtros>-<versão dos dados>: pedir o mesmo
+    relatório sem que nenhum documento tenha mudado devolve o arquivo já pronto, e
+    pedidos simultâneos iguais caem no mesmo job. O estado do job fica em um JSON
+    ao lado do .xlsx, então qualquer réplica que monte o mesmo volume responde o progresso.
+    """
+
+    def __init__(self) -> None:
+        self.raiz = Path(os.getenv("RELATORIOS_DIR", "/data/relatorios"))
+        self._app: Optional[Flask] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self._app = app
+        self.raiz = Path(os.getenv("RELATORIOS_DIR", str(self.raiz)))
+        workers = int(os.getenv("RELATORIOS_WORKERS", "2"))
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="relatorio")
+
+    # -----------------------------
+    # Estado dos jobs (JSON em disco)
+    # -----------------------------
+    def caminho_arquivo(self, job_id: str) -> Path:
+        return self.raiz / f"{job_id}.xlsx"
+
+    def _caminho_estado(self, job_id: str) -> Path:
+        return self.raiz / f"{job_id}.json"
+
+    def obter(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._caminho_estado(job_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _gravar(self, job: Dict[str, Any], **mudancas: Any) -> Dict[str, Any]:
+        """Atualiza o estado e grava de forma atômica (temporário + rename)."""
+        job.update(mudancas, atualizado_em=time.time())
+        self.raiz.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.raiz, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp, self._caminho_estado(job["id"]))
+        return job
+
+    # -----------------------------
+    # Submissão
+    # -----------------------------
+    def submeter(self, filtros: Dict[str, Any]) -> Dict[str, Any]:
+        """Cria (ou reaproveita) o job dos filtros na versão atual dos dados."""
+        job_id = f"{hash_filtros(filtros)}-{versao_dados()}"
+
+        with self._lock:
+            existente = self.obter(job_id)
+            if existente:
+                pronto = existente["status"] == CONCLUIDO and self.caminho_arquivo(job_id).is_file()
+                andando = (
+                    existente["status"] in (NA_FILA, PROCESSANDO)
+                    and time.time() - existente["atualizado_em"] < JOB_ABANDONADO_SEGUNDOS
+                )
+                if pronto or andando:
+                    return existente
+
+            job = self._gravar({
+                "id": job_id,
+                "filtros": filtros,
+                "status": NA_FILA,
+                "progresso": 0,
+                "etapa": "Aguardando na fila",
+                "erro": None,
+                "criado_em": time.time(),
+            })
+        self._executor.submit(self._executar, dict(job))
+        return job
+
+    # -----------------------------
+    # Worker
+    # -----------------------------
+    def _executar(self, job: Dict[str, Any]) -> None:
+        import pandas as pd
+
+        with self._app.app_context():
+            try:
+                self._gravar(job, status=PROCESSANDO, progresso=5, etapa="Consultando documentos")
+                linhas = [l for lista in mapa_shards.em_todos(lambda s: _consultar(s, job["filtros"])) for l in lista]
+                self._gerar_planilha(job, pd.DataFrame(linhas, columns=COLUNAS))
+                self._gravar(job, status=CONCLUIDO, progresso=100, etapa="Concluído",
+                             documentos=len(linhas), tamanho=self.caminho_arquivo(job["id"]).stat().st_size)
+                self._limpar_versoes_antigas(job["id"])
+            except Exception as e:
+                logger.exception("Erro ao gerar relatório %s", job["id"])
+                self._gravar(job, status=ERRO, etapa="Falhou", erro=str(e))
+            finally:
+                db.session.remove()
+
+    def _gerar_planilha(self, job: Dict[str, Any], df: "pd.DataFrame") -> None:
+        """Resumo por status, pivôs por mês e uma aba por filial. Grava em temporário e renomeia."""
+        import pandas as pd
+
+        df["mes"] = pd.to_datetime(df["validade"]).dt.strftime("%Y-%m").fillna("Sem validade")
+        filiais = sorted(df["filial"].fillna("Sem filial").unique())
+
+        fd, tmp = tempfile.mkstemp(dir=self.raiz, suffix=".tmp.xlsx")
+        os.close(fd)
+        try:
+            with pd.ExcelWriter(tmp, engine="xlsxwriter") as writer:
+                self._gravar(job, progresso=15, etapa="Resumo por status")
+                resumo = df.groupby("status").size().rename("documentos").reset_index()
+                resumo.to_excel(writer, sheet_name="Resumo", index=False)
+                if not df.empty:
+                    pd.crosstab(df["filial"].fillna("Sem filial"), df["status"], margins=True, margins_name="Total") \
+                        .to_excel(writer, sheet_name="Resumo", startcol=3)
+
+                self._gravar(job, progresso=25, etapa="Pivôs por mês")
+                if not df.empty:
+                    pd.crosstab(df["mes"], df["status"], margins=True, margins_name="Total") \
+                        .to_excel(writer, sheet_name="Por mês")
+                    pd.crosstab(df["mes"], df["categoria"].fillna(""), margins=True, margins_name="Total") \
+                        .to_excel(writer, sheet_name="Mês x Categoria")
+
+                usados = {"resumo", "por mês", "mês x categoria"}
+                colunas_filial = [c for c in COLUNAS if c != "filial"]
+                for i, filial in enumerate(filiais, start=1):
+                    aba = _nome_aba(filial, usados)
+                    df[df["filial"].fillna("Sem filial") == filial][colunas_filial] \
+                        .to_excel(writer, sheet_name=aba, index=False)
+                    self._gravar(job, progresso=25 + int(70 * i / len(filiais)), etapa=f"Filial {filial}")
+
+            os.replace(tmp, self.caminho_arquivo(job["id"]))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _limpar_versoes_antigas(self, job_id: str) -> None:
+        """Remove os arquivos dos mesmos filtros em versões de dados anteriores (já obsoletos)."""
+        prefixo = job_id.split("-", 1)[0]
+        for caminho in self.raiz.glob(f"{prefixo}-*"):
+            if not caminho.name.startswith(f"{job_id}."):
+                try:
+                    caminho.unlink()
+                except OSError:
+                    pass
+
+
+# Instância única do processo
+fila_relatorios = FilaRelatorios()
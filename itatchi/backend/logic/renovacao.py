@@ -0,0 +1,181 @@
+# itatchi/backend/logic/renovacao.py
+# Renovação em lote de documentos: nova emissão e validade pelo prazo padrão do tipo.
+
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import Integer, String, and_, case, cast, func, insert, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from models.models import Documento, DocumentoAlteracao, TipoDocumento, Versao, Vinculo
+from logic.conformidade import Chave, recalcular_entidades
+
+
+def montar_seletor(dados: Dict[str, Any]) -> List[Any]:
+    """
+    Critérios SQL do lote a partir do JSON (ids, filial_id, tipo_id, validade_de, validade_ate).
+    Lança ValueError se nenhum critério for informado ou se algum for inválido.
+    """
+    criterios: List[Any] = []
+    if dados.get("ids"):
+        criterios.append(Documento.id.in_([int(i) for i in dados["ids"]]))
+    if dados.get("filial_id"):
+        criterios.append(Documento.filial_id == int(dados["filial_id"]))
+    if dados.get("tipo_id"):
+        criterios.append(Documento.tipo_id == int(dados["tipo_id"]))
+    if dados.get("validade_de"):
+        criterios.append(Documento.validade >= date.fromisoformat(dados["validade_de"]))
+    if dados.get("validade_ate"):
+        criterios.append(Documento.validade <= date.fromisoformat(dados["validade_ate"]))
+    if not criterios:
+        raise ValueError("Informe ao menos um critério: ids, filial_id, tipo_id, validade_de ou validade_ate.")
+    return criterios
+
+
+def numero_versao_atual() -> Any:
+    """
+    Número principal de Documento.versao_atual ("N.0.0" -> N) em SQL portável
+    (INSTR/SUBSTR existem no MySQL e no SQLite). É a sequência de versões do documento.
+    """
+    ponto = func.instr(Documento.versao_atual, ".")
+    return func.coalesce(case(
+        (ponto > 0, cast(func.substr(Documento.versao_atual, 1, ponto - 1), Integer)),
+        else_=cast(Documento.versao_atual, Integer),
+    ), 1)
+
+
+def proxima_versao(versao_atual: Optional[str]) -> str:
+    """
+    Número da versão criada por uma alteração (upload ou renovação): versao_atual + 1.
+    Cada linha de 'versao' é o estado DEPOIS da alteração; quem chama tem a linha travada.
+    """
+    try:
+        atual = int((versao_atual or "1").split(".")[0])
+    except ValueError:
+        atual = 1
+    return f"{atual + 1}.0.0"
+
+
+def renovar_documentos(
+    sessao: Session,
+    criterios: List[Any],
+    emissao: date,
+    horizonte: int,
+    motivo: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Renova o lote inteiro com poucos comandos SET-BASED, na mesma transação:
+
+      1. INSERT ... SELECT em 'versao': a nova versão (versao_atual + 1, mesma regra
+         do upload) com o estado anterior de cada documento nos campos *_anterior;
+      2. INSERT ... SELECT no log de alterações (feed incremental, SSE, caches);
+      3. UPDATE único: emissao, validade = emissao + prazo_padrao_dias do tipo,
+         status_calc por CASE sobre a nova validade e versao_atual + 1;
+      4. rollup das entidades vinculadas.
+
+    As linhas do lote ficam bloqueadas (SELECT ... FOR UPDATE) até o commit: um
+    upload simultâneo do mesmo documento espera e numera a partir da nova versão.
+
+    Documentos SEM_VALIDADE ou de tipos sem prazo padrão ficam de fora (contados).
+    """
+    hoje = date.today()
+
+    # Poucos tipos: a nova validade vira um CASE tipo_id -> data (sem aritmética de datas por dialeto)
+    prazos: Dict[int, int] = dict(sessao.execute(
+        select(TipoDocumento.id, TipoDocumento.prazo_padrao_dias).where(TipoDocumento.prazo_padrao_dias > 0)
+    ).all())
+
+    selecao = and_(*criterios)
+    selecionados: int = sessao.execute(select(func.count(Documento.id)).where(selecao)).scalar() or 0
+    resultado: Dict[str, Any] = {
+        "selecionados": selecionados,
+        "renovados": 0,
+        "ignorados": selecionados,
+        "versoes_criadas": 0,
+        "por_status": {},
+    }
+    if not prazos or not selecionados:
+        return resultado
+
+    filtro = and_(
+        selecao,
+        Documento.tipo_id.in_(list(prazos)),
+        or_(Documento.sem_validade.is_(False), Documento.sem_validade.is_(None)),
+    )
+    # Trava os documentos do lote: versao_atual é a sequência lida e incrementada abaixo
+    sessao.execute(select(Documento.id).where(filtro).with_for_update())
+    nova_validade = case(
+        {tipo_id: emissao + timedelta(days=prazo) for tipo_id, prazo in prazos.items()},
+        value=Documento.tipo_id,
+    )
+    novo_status = case(
+        (nova_validade < hoje, "VENCIDO"),
+        (nova_validade <= hoje + timedelta(days=horizonte), "A_VENCER"),
+        else_="VIGENTE",
+    )
+
+    # Contagem por status resultante e entidades afetadas (lidas ANTES do UPDATE mudar a seleção)
+    por_status: Dict[str, int] = dict(sessao.execute(
+        select(novo_status, func.count(Documento.id)).where(filtro).group_by(novo_status)
+    ).all())
+    renovados = sum(por_status.values())
+    if not renovados:
+        return resultado
+    chaves: Set[Chave] = {
+        (t, a) for t, a in sessao.execute(
+            select(Vinculo.tipo_alvo, Vinculo.alvo_id)
+            .join(Documento, Documento.id == Vinculo.documento_id)
+            .where(filtro)
+            .distinct()
+        )
+    }
+
+    versao = numero_versao_atual()
+
+    # 1. Histórico: linha da nova versão (mesma regra do upload) com o estado anterior
+    sessao.execute(insert(Versao).from_select(
+        ["documento_id", "numero_versao", "caminho_arquivo", "motivo",
+         "emissao_anterior", "validade_anterior", "status_anterior"],
+        select(
+            Documento.id,
+            cast(versao + 1, String) + ".0.0",
+            func.coalesce(Documento.caminho_atual, ""),
+            literal(motivo or f"Renovação em lote (emissão {emissao.isoformat()})"),
+            Documento.emissao,
+            Documento.validade,
+            Documento.status_calc,
+        ).where(filtro),
+    ))
+
+    # 2. Log de alterações (UPDATE em massa não passa pelo after_flush)
+    sessao.execute(insert(DocumentoAlteracao).from_select(
+        ["documento_id", "operacao", "status"],
+        select(
+            Documento.id,
+            case((Documento.status_calc == novo_status, "ATUALIZADO"), else_="STATUS"),
+            novo_status,
+        ).where(filtro),
+    ))
+
+    # 3. UPDATE único do lote
+    sessao.execute(
+        update(Documento).where(filtro).values(
+            emissao=emissao,
+            validade=nova_validade,
+            status_calc=novo_status,
+            versao_atual=cast(versao + 1, String) + ".0.0",
+        ),
+        execution_options={"synchronize_session": False},
+    )
+
+    # 4. Rollup das entidades vinculadas aos documentos renovados
+    if chaves:
+        recalcular_entidades(sessao.connection(), chaves)
+
+    resultado.update(
+        renovados=renovados,
+        ignorados=selecionados - renovados,
+        versoes_criadas=renovados,
+        por_status=por_status,
+    )
+    return resultado
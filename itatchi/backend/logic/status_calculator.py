@@ -1,34 +1,52 @@
-from datetime import date
+from datetime import date, timedelta
 import json
-# from ..models.models import Parametro 
-from models.models import Parametro
+from typing import List, Optional
+# from ..models.models import Parametro
+from database.connection import db
+from models.models import Documento, Parametro
+from sqlalchemy import and_, or_
 
-def calcular_status(data_validade):
+def obter_dias_alerta(sessao=None) -> List[int]:
+    """
+    Retorna a lista de dias de alerta configurada (ex: [30, 60, 90]).
+    Usa [30] como padrão se não houver parâmetro válido.
+    """
+    sessao = sessao if sessao is not None else db.session
+    try:
+        config = sessao.query(Parametro).first()
+        if config and config.dias_alerta_json:
+            alerta_list = json.loads(config.dias_alerta_json)
+            if isinstance(alerta_list, list) and alerta_list:
+                return sorted(int(d) for d in alerta_list)
+
+    except Exception:
+        pass
+
+    return [30] # Valor padrão
+
+def obter_horizonte_alerta(sessao=None) -> int:
+    """
+    Retorna o horizonte 'A_VENCER' em dias: o maior valor de alerta configurado.
+    """
+    return max(obter_dias_alerta(sessao))
+
+def calcular_status(data_validade, horizonte: Optional[int] = None):
     """
     Calcula o status do documento (VIGENTE, A_VENCER, VENCIDO, SEM_VALIDADE)
     com base na data de validade e no maior período de alerta configurado.
+
+    Se 'horizonte' for informado, evita consultar a tabela de parâmetros
+    (útil ao recalcular vários documentos de uma vez).
     """
-    # SEM_VALIDADE 
+    # SEM_VALIDADE
     if data_validade is None:
         return 'SEM_VALIDADE'
 
     hoje = date.today()
     diferenca = data_validade - hoje
 
-    # 1. Obter período de alerta 
-    N = 30 # Valor padrão 
-
-    try:
-        # Tenta buscar o maior valor de alerta configurado
-        config = Parametro.query.first() 
-        if config and config.dias_alerta_json:
-            alerta_list = json.loads(config.dias_alerta_json)
-            # N é o maior valor configurado para definir o horizonte 'A_VENCER'
-            if isinstance(alerta_list, list) and alerta_list:
-                N = max(alerta_list)
-        
-    except Exception:
-        pass 
+    # 1. Obter período de alerta
+    N = horizonte if horizonte is not None else obter_horizonte_alerta()
 
     if diferenca.days < 0:
         # VENCIDO (validade < hoje)
@@ -38,4 +56,35 @@ def calcular_status(data_validade):
         return 'A_VENCER'
     else:
         # VIGENTE (validade futura distante)
-        return 'VIGENTE'
\ No newline at end of file
+        return 'VIGENTE'
+
+def atualizar_status_pendentes(sessao=None, horizonte: Optional[int] = None) -> int:
+    """
+    Recalcula apenas os documentos cujo status gravado não corresponde mais
+    à data de hoje (ex: passaram de A_VENCER para VENCIDO durante a noite).
+
+    A seleção é feita no banco, sem carregar a tabela inteira.
+    'sessao' permite rodar em um shard específico (padrão: db.session); nesse
+    caso informe também 'horizonte', lido antes no contexto da aplicação.
+    Retorna a quantidade de documentos atualizados (já com commit).
+    """
+    sessao = sessao if sessao is not None else db.session
+    hoje = date.today()
+    N = horizonte if horizonte is not None else obter_horizonte_alerta()
+    limite = hoje + timedelta(days=N)
+
+    pendentes: List[Documento] = sessao.query(Documento).filter(or_(
+        Documento.status_calc.is_(None),
+        and_(Documento.validade.is_(None), Documento.status_calc != 'SEM_VALIDADE'),
+        and_(Documento.validade < hoje, Documento.status_calc != 'VENCIDO'),
+        and_(Documento.validade >= hoje, Documento.validade <= limite, Documento.status_calc != 'A_VENCER'),
+        and_(Documento.validade > limite, Documento.status_calc != 'VIGENTE'),
+    )).all()
+
+    for d in pendentes:
+        d.status_calc = calcular_status(d.validade, N)
+
+    if pendentes:
+        sessao.commit()
+
+    return len(pendentes)
\ No newline at end of file
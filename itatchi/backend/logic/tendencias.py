@@ -0,0 +1,257 @@
+# itatchi/backend/logic/tendencias.py
+# Fotografia diária das contagens por (data, filial, categoria, status) e leitura das séries de tendência.
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from flask import Flask
+from sqlalchemy import Select, case, delete, func, insert, literal, or_, select, text
+from sqlalchemy.orm import Session
+
+from database.connection import db
+from database.shards import mapa_shards
+from models.models import Documento, StatusDiario, StatusDiarioData, TipoDocumento, Versao
+from logic.prontidao import prontidao
+from logic.status_calculator import atualizar_status_pendentes, obter_horizonte_alerta
+
+logger = logging.getLogger(__name__)
+
+# Dimensões que /tendencias pode manter separadas (sem elas, soma tudo por data e status)
+DIMENSOES: Dict[str, Any] = {
+    "filial": StatusDiario.filial_id,
+    "categoria": StatusDiario.categoria,
+}
+
+
+def _validade_em(dia: date) -> Any:
+    """
+    Validade que o documento tinha no fim de 'dia': se ele foi renovado depois,
+    vale a 'validade_anterior' da primeira renovação após a data; senão, a atual.
+    """
+    limite = datetime.combine(dia + timedelta(days=1), datetime.min.time())
+    anterior = (
+        select(Versao.validade_anterior)
+        .where(
+            Versao.documento_id == Documento.id,
+            Versao.criado_em >= limite,
+            Versao.validade_anterior.is_not(None),
+        )
+        .order_by(Versao.criado_em, Versao.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    return func.coalesce(anterior, Documento.validade)
+
+
+def _status_em(dia: date, horizonte: int) -> Any:
+    """Mesma regra do calcular_status, avaliada no banco para a data 'dia'."""
+    validade = _validade_em(dia)
+    return case(
+        (or_(Documento.sem_validade.is_(True), validade.is_(None)), "SEM_VALIDADE"),
+        (validade < dia, "VENCIDO"),
+        (validade <= dia + timedelta(days=horizonte), "A_VENCER"),
+        else_="VIGENTE",
+    )
+
+
+def contagens_do_dia(dia: date, horizonte: int) -> Select:
+    """
+    SELECT agrupado (data, filial_id, categoria, status, quantidade) de 'dia'.
+
+    Hoje: usa o status_calc gravado (exato; quem chama atualiza os pendentes antes).
+    Dias passados (backfill): status estimado a partir da validade na época, só
+    com os documentos já criados naquele dia. Documentos excluídos desde então
+    não entram, e o horizonte de alerta usado é o atual.
+    """
+    passado = dia < date.today()
+    status = _status_em(dia, horizonte) if passado else Documento.status_calc
+    contagens = (
+        select(
+            literal(dia, db.Date),
+            Documento.filial_id,
+            TipoDocumento.categoria,
+            status,
+            func.count(Documento.id),
+        )
+        .join(TipoDocumento, Documento.tipo_id == TipoDocumento.id)
+        .group_by(Documento.filial_id, TipoDocumento.categoria, status)
+    )
+    if passado:
+        limite = datetime.combine(dia + timedelta(days=1), datetime.min.time())
+        contagens = contagens.where(or_(Documento.criado_em.is_(None), Documento.criado_em < limite))
+    return contagens
+
+
+def gravar_dia(sessao: Session, dia: date, horizonte: int) -> int:
+    """
+    Regrava as contagens de 'dia' com um único INSERT ... SELECT agrupado e marca a
+    data como fotografada (status_diario_data), mesmo que nenhuma linha tenha saído.
+    Retorna o número de linhas gravadas. Quem chama faz commit/rollback.
+    """
+    sessao.execute(delete(StatusDiario).where(StatusDiario.data == dia))
+    resultado = sessao.execute(insert(StatusDiario).from_select(
+        ["data", "filial_id", "categoria", "status", "quantidade"], contagens_do_dia(dia, horizonte)
+    ))
+    sessao.execute(delete(StatusDiarioData).where(StatusDiarioData.data == dia))
+    sessao.execute(insert(StatusDiarioData).values(data=dia))
+    return resultado.rowcount or 0
+
+
+def fotografar(sessao: Session, hoje: date, dias_retroativos: int, horizonte: int) -> int:
+    """
+    Regrava o dia de hoje e preenche, dentro dos últimos 'dias_retroativos', as
+    datas que ainda não têm fotografia (primeira execução ou dias com o serviço fora).
+    Um commit por data, para não segurar locks durante o backfill inteiro.
+    Retorna quantas datas foram gravadas.
+    """
+    inicio = hoje - timedelta(days=dias_retroativos)
+    existentes: Set[date] = set(sessao.execute(
+        select(StatusDiarioData.data).where(StatusDiarioData.data >= inicio, StatusDiarioData.data < hoje)
+    ).scalars())
+
+    faltantes = [
+        inicio + timedelta(days=i)
+        for i in range(dias_retroativos)
+        if inicio + timedelta(days=i) not in existentes
+    ]
+    for dia in [*faltantes, hoje]:
+        try:
+            gravar_dia(sessao, dia, horizonte)
+            sessao.commit()
+        except Exception:
+            sessao.rollback()
+            raise
+    return len(faltantes) + 1
+
+
+@contextmanager
+def trava_fotografia(sessao: Session) -> Iterator[bool]:
+    """
+    Trava da fotografia no shard da sessão (GET_LOCK do MySQL, sem espera): com
+    várias réplicas, só uma grava por rodada; as outras recebem False e pulam o
+    shard. Outros bancos (SQLite local, um processo) sempre recebem True.
+    """
+    engine = sessao.get_bind()
+    if engine.dialect.name != "mysql":
+        yield True
+        return
+    nome = f"itatchi_fotografia_{engine.url.database}"
+    # Conexão própria: a da sessão volta ao pool a cada commit e levaria a trava junto
+    with engine.connect() as conexao:
+        obtida = conexao.execute(text("SELECT GET_LOCK(:nome, 0)"), {"nome": nome}).scalar() == 1
+        try:
+            yield obtida
+        finally:
+            if obtida:
+                conexao.execute(text("SELECT RELEASE_LOCK(:nome)"), {"nome": nome})
+
+
+def consultar_tendencias(
+    sessao: Session,
+    inicio: date,
+    fim: date,
+    agrupar: Sequence[str] = (),
+    filial_id: Optional[int] = None,
+    categoria: Optional[str] = None,
+    status: Sequence[str] = (),
+) -> List[Tuple[Any, ...]]:
+    """
+    Linhas (data, status, [dimensões...], quantidade) de um shard no intervalo.
+    O filtro por data é o prefixo da chave primária: uma faixa do índice, sem
+    tocar na tabela de documentos.
+    """
+    dimensoes = [DIMENSOES[d] for d in agrupar]
+    stmt = (
+        select(StatusDiario.data, StatusDiario.status, *dimensoes, func.sum(StatusDiario.quantidade))
+        .where(StatusDiario.data >= inicio, StatusDiario.data <= fim)
+        .group_by(StatusDiario.data, StatusDiario.status, *dimensoes)
+    )
+    if filial_id:
+        stmt = stmt.where(StatusDiario.filial_id == filial_id)
+    if categoria:
+        stmt = stmt.where(StatusDiario.categoria == categoria)
+    if status:
+        stmt = stmt.where(StatusDiario.status.in_(list(status)))
+    return [tuple(linha) for linha in sessao.execute(stmt)]
+
+
+class FotografiaDiaria:
+    """
+    Job em segundo plano que mantém a tabela status_diario.
+
+    A cada TENDENCIAS_INTERVALO_SEGUNDOS a fotografia de hoje é regravada em cada
+    shard; ao virar o dia, a última gravação vira o valor definitivo do dia anterior.
+    Na primeira execução, os últimos TENDENCIAS_DIAS_RETROATIVOS dias sem fotografia
+    são preenchidos a partir da validade.
+
+    Com várias réplicas, cada rodada grava um shard só se obtiver a trava do banco
+    (trava_fotografia); a réplica que não obteve pula o shard até a próxima rodada.
+    TENDENCIAS_FOTOGRAFIA=0 desliga o job no processo.
+    """
+
+    def __init__(self) -> None:
+        self.intervalo: float = 600.0
+        self.dias_retroativos: int = 365
+        self._app: Optional[Flask] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ultima: Dict[str, Any] = {}
+
+    def init_app(self, app: Flask) -> None:
+        self._app = app
+        self.intervalo = float(os.getenv("TENDENCIAS_INTERVALO_SEGUNDOS", self.intervalo))
+        self.dias_retroativos = int(os.getenv("TENDENCIAS_DIAS_RETROATIVOS", self.dias_retroativos))
+        if os.getenv("TENDENCIAS_FOTOGRAFIA", "1") == "0":
+            return
+        self._thread = threading.Thread(target=self._loop, name="fotografia-diaria", daemon=True)
+        self._thread.start()
+
+    def executar(self) -> Dict[str, Any]:
+        """Uma rodada em todos os shards (no contexto da aplicação)."""
+        inicio = time.perf_counter()
+        hoje = date.today()
+        horizonte: int = obter_horizonte_alerta()
+        # Status que venceram com a passagem do tempo entram na fotografia de hoje
+        mapa_shards.em_todos(lambda sessao: atualizar_status_pendentes(sessao, horizonte))
+
+        def fotografar_shard(sessao: Session) -> Optional[int]:
+            with trava_fotografia(sessao) as obtida:
+                if not obtida:
+                    return None
+                return fotografar(sessao, hoje, self.dias_retroativos, horizonte)
+
+        datas = mapa_shards.em_todos(fotografar_shard)
+        gravadas = [d for d in datas if d is not None]
+        self._ultima = {
+            "data": hoje.isoformat(),
+            "datas_gravadas": max(gravadas, default=0),
+            "shards_com_outra_replica": len(datas) - len(gravadas),
+            "ms": round((time.perf_counter() - inicio) * 1000, 1),
+        }
+        return self._ultima
+
+    def _loop(self) -> None:
+        # Só começa com o processo pronto: banco no ar e o backfill fora do aquecimento
+        prontidao.aguardar()
+        while True:
+            try:
+                with self._app.app_context():
+                    try:
+                        self.executar()
+                    finally:
+                        db.session.remove()
+            except Exception:
+                # Banco fora: tenta na próxima rodada
+                logger.exception("Erro na fotografia diária de status")
+            time.sleep(self.intervalo)
+
+    def estado(self) -> Dict[str, Any]:
+        return {"ativo": self._thread is not None, "ultima": dict(self._ultima)}
+
+
+# Instância única do processo
+fotografia_diaria = FotografiaDiaria()
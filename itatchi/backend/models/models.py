@@ -29,7 +29,9 @@ class TipoDocumento(db.Model):
 class Documento(db.Model):
     """Modelo principal para o registro e acompanhamento de documentos."""
     __tablename__ = 'documento'
-    
+    # SQLite: ids seguem sqlite_sequence (faixa de ids por shard, ver database/shards.py)
+    __table_args__ = {'sqlite_autoincrement': True}
+
     id = db.Column(db.Integer, primary_key=True)
     
     # Chaves Estrangeiras
@@ -53,6 +55,114 @@ class Documento(db.Model):
     # Status de Cálculo (VIGENTE, A_VENCER, VENCIDO, SEM_VALIDADE)
     status_calc = db.Column(db.String(20), default='VIGENTE')
 
+    # Auditoria (preenchidos pelo banco)
+    criado_em = db.Column(db.DateTime, server_default=db.func.now())
+    atualizado_em = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
+
+
+class DocumentoAlteracao(db.Model):
+    """
+    Log sequencial de alterações em documentos (feed incremental).
+
+    O 'id' auto-incremento funciona como token monotônico: clientes guardam o
+    último id visto e pedem apenas o que mudou depois dele.
+    """
+    __tablename__ = 'documento_alteracao'
+
+    id = db.Column(db.Integer, primary_key=True)
+    # Sem FK: a entrada precisa sobreviver à remoção do documento (tombstone)
+    documento_id = db.Column(db.Integer, nullable=False, index=True)
+    # INSERIDO, ATUALIZADO, STATUS ou REMOVIDO
+    operacao = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20))
+    criado_em = db.Column(db.DateTime, server_default=db.func.now())
+
+
+class Versao(db.Model):
+    """Histórico de versões do arquivo de um documento."""
+    __tablename__ = 'versao'
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    id = db.Column(db.Integer, primary_key=True)
+    documento_id = db.Column(db.Integer, db.ForeignKey('documento.id'), nullable=False, index=True)
+    numero_versao = db.Column(db.String(20), nullable=False)
+    # Caminho livre (legado) ou referência ao blob: "sha256:<hex>"
+    caminho_arquivo = db.Column(db.String(500), nullable=False)
+    motivo = db.Column(db.String(255))
+    # Estado do documento antes desta versão (preenchido pela renovação em lote)
+    emissao_anterior = db.Column(db.Date)
+    validade_anterior = db.Column(db.Date)
+    status_anterior = db.Column(db.String(20))
+    criado_em = db.Column(db.DateTime, server_default=db.func.now())
+
+
+class Arquivo(db.Model):
+    """Metadados de um arquivo armazenado uma única vez, endereçado pelo SHA-256 do conteúdo."""
+    __tablename__ = 'arquivo'
+
+    sha256 = db.Column(db.String(64), primary_key=True)
+    tamanho = db.Column(db.BigInteger, nullable=False)
+    tipo_conteudo = db.Column(db.String(100))
+    nome_original = db.Column(db.String(255))
+    criado_em = db.Column(db.DateTime, server_default=db.func.now())
+
+
+class Vinculo(db.Model):
+    """Vínculo de um documento com uma entidade (MOTORISTA, VEICULO ou LOCAL)."""
+    __tablename__ = 'vinculo'
+    __table_args__ = (
+        # Consulta principal: "quais documentos pertencem a esta entidade?"
+        db.Index('idx_vinculo_alvo', 'tipo_alvo', 'alvo_id'),
+        {'sqlite_autoincrement': True},
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    documento_id = db.Column(db.Integer, db.ForeignKey('documento.id'), nullable=False, index=True)
+    tipo_alvo = db.Column(db.String(20), nullable=False)  # MOTORISTA, VEICULO, LOCAL
+    alvo_id = db.Column(db.String(100))
+    criado_em = db.Column(db.DateTime, server_default=db.func.now())
+
+
+class ConformidadeEntidade(db.Model):
+    """
+    Resumo (rollup) da conformidade de cada entidade vinculada.
+    Mantido incrementalmente a cada escrita de documento/vínculo.
+    """
+    __tablename__ = 'conformidade_entidade'
+
+    tipo_alvo = db.Column(db.String(20), primary_key=True)
+    alvo_id = db.Column(db.String(100), primary_key=True)
+    pior_status = db.Column(db.String(20))
+    proximo_vencimento = db.Column(db.Date)
+    total_documentos = db.Column(db.Integer, nullable=False, default=0)
+    atualizado_em = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
+
+
+class StatusDiario(db.Model):
+    """
+    Fotografia diária compacta: quantos documentos havia em cada status, por filial
+    e categoria, em cada data. Alimenta os gráficos de tendência (/tendencias).
+    """
+    __tablename__ = 'status_diario'
+
+    # Chave (data, ...) primeiro: um intervalo de datas é uma única faixa do índice
+    data = db.Column(db.Date, primary_key=True)
+    filial_id = db.Column(db.Integer, primary_key=True)
+    categoria = db.Column(db.String(50), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    quantidade = db.Column(db.Integer, nullable=False, default=0)
+
+
+class StatusDiarioData(db.Model):
+    """
+    Datas já fotografadas em status_diario, inclusive as sem nenhum documento
+    (que não geram linhas lá): o backfill não recalcula esses dias a cada rodada.
+    """
+    __tablename__ = 'status_diario_data'
+
+    data = db.Column(db.Date, primary_key=True)
+    gravado_em = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
+
 
 class Parametro(db.Model):
     """Modelo para armazenar parâmetros globais do sistema (ex: dias de alerta)."""
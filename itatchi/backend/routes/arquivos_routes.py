@@ -0,0 +1,198 @@
+# itatchi/backend/routes/arquivos_routes.py
+# Rotas de upload/download dos arquivos dos documentos (armazenamento por SHA-256).
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Blueprint, jsonify, request, Response, send_file
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database.shards import mapa_shards
+from models.models import Arquivo, Documento, Versao
+from logic.arquivos import PREFIXO_BLOB, armazem, sha256_do_caminho
+from logic.renovacao import proxima_versao
+
+arquivos_bp = Blueprint('arquivos_bp', __name__)
+logger = logging.getLogger(__name__)
+
+SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _metadados_arquivo(sha256: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    """(tipo_conteudo, nome_original) do blob, procurado em todos os shards (o armazém é comum)."""
+    def consultar(sessao: Session) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        meta: Optional[Arquivo] = sessao.get(Arquivo, sha256)
+        return (meta.tipo_conteudo, meta.nome_original) if meta else None
+
+    return next((m for m in mapa_shards.em_todos(consultar) if m is not None), None)
+
+
+def _descartar_blob_orfao(sha256: str) -> None:
+    """
+    Apaga o blob recém-criado por um upload cujo commit falhou. Se outro upload do
+    mesmo conteúdo já registrou o Arquivo (em qualquer shard), o blob fica.
+    """
+    try:
+        if _metadados_arquivo(sha256) is None:
+            armazem.remover(sha256)
+    except Exception:
+        logger.exception("Erro ao descartar arquivo não registrado")
+
+
+# -----------------------------
+# POST /documentos/<id>/arquivo (upload em streaming)
+# -----------------------------
+@arquivos_bp.route("/documentos/<int:documento_id>/arquivo", methods=["POST", "PUT"])
+def enviar_arquivo(documento_id: int) -> Tuple[Response, int]:
+    """
+    Recebe o arquivo do documento no CORPO da requisição (sem multipart) e o grava
+    em blocos, calculando o SHA-256 durante a leitura. Conteúdos iguais são
+    armazenados uma única vez; a nova versão apenas aponta para o blob.
+
+    Query Params:
+        - nome (str, opcional): Nome original do arquivo (ex: Licenca.pdf).
+        - motivo (str, opcional): Motivo da nova versão.
+
+    Retorna:
+        - JSON: sha256, tamanho, versão criada e se o conteúdo já existia (201 Created).
+    """
+    if request.content_length == 0:
+        return jsonify({"erro": "Corpo da requisição vazio. Envie o conteúdo do arquivo."}), 400
+
+    # O id diz em que shard o documento está (faixa de ids por shard)
+    with mapa_shards.sessao_do_id(documento_id) as sessao:
+        if sessao.get(Documento, documento_id) is None:
+            return jsonify({"erro": "Documento não encontrado."}), 404
+
+    # 1. Conteúdo no armazém ANTES da transação: um cliente lento não segura lock nenhum
+    try:
+        sha256, tamanho, novo = armazem.salvar_stream(request.stream)
+    except ValueError:
+        # Sem Content-Length (chunked): o vazio só aparece depois da leitura, antes de virar blob
+        return jsonify({"erro": "Corpo da requisição vazio. Envie o conteúdo do arquivo."}), 400
+    except OSError as e:
+        logger.exception("Erro ao gravar arquivo")
+        return jsonify({"erro": f"Erro ao gravar arquivo. {str(e)}"}), 500
+
+    # 2. Transação curta: trava o documento, numera a partir de versao_atual e registra a versão
+    with mapa_shards.sessao_do_id(documento_id) as sessao:
+        try:
+            documento: Optional[Documento] = sessao.get(Documento, documento_id, with_for_update=True)
+            if documento is None:
+                # Excluído durante o upload
+                sessao.rollback()
+                if novo:
+                    _descartar_blob_orfao(sha256)
+                return jsonify({"erro": "Documento não encontrado."}), 404
+
+            if sessao.get(Arquivo, sha256) is None:
+                sessao.add(Arquivo(
+                    sha256=sha256,
+                    tamanho=tamanho,
+                    tipo_conteudo=request.mimetype or "application/octet-stream",
+                    nome_original=request.args.get("nome"),
+                ))
+
+            referencia = f"{PREFIXO_BLOB}{sha256}"
+            numero_versao = proxima_versao(documento.versao_atual)
+            sessao.add(Versao(
+                documento_id=documento_id,
+                numero_versao=numero_versao,
+                caminho_arquivo=referencia,
+                motivo=request.args.get("motivo"),
+            ))
+            documento.caminho_atual = referencia
+            documento.versao_atual = numero_versao
+            sessao.commit()
+
+        except Exception as e:
+            sessao.rollback()
+            if novo:
+                _descartar_blob_orfao(sha256)
+            logger.exception("Erro ao registrar versão do arquivo")
+            return jsonify({"erro": f"Erro interno ao registrar arquivo. {str(e)}"}), 500
+
+    return jsonify({
+        "mensagem": "Arquivo armazenado com sucesso.",
+        "sha256": sha256,
+        "tamanho": tamanho,
+        "versao": numero_versao,
+        "deduplicado": not novo,
+    }), 201
+
+
+# -----------------------------
+# GET /arquivos/<sha256> (download com Range)
+# -----------------------------
+@arquivos_bp.route("/arquivos/<sha256>", methods=["GET"])
+def baixar_arquivo(sha256: str) -> Tuple[Response, int]:
+    """
+    Serve o blob pelo hash. Suporta requisições Range (206) e If-None-Match.
+
+    O corpo é entregue via wsgi.file_wrapper, que servidores como o gunicorn
+    transformam em sendfile (zero-copy). Com USE_X_SENDFILE=1 o envio é
+    delegado ao proxy reverso.
+    """
+    if not SHA256_RE.match(sha256) or not armazem.existe(sha256):
+        return jsonify({"erro": "Arquivo não encontrado."}), 404
+
+    tipo_conteudo, nome_original = _metadados_arquivo(sha256) or (None, None)
+    resposta = send_file(
+        armazem.caminho(sha256),
+        mimetype=tipo_conteudo or "application/octet-stream",
+        download_name=nome_original or sha256,
+        conditional=True,
+        etag=sha256,
+        max_age=31536000,
+    )
+    # Conteúdo endereçado por hash nunca muda
+    resposta.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return resposta, resposta.status_code
+
+
+# -----------------------------
+# GET /documentos/<id>/arquivo (arquivo atual do documento)
+# -----------------------------
+@arquivos_bp.route("/documentos/<int:documento_id>/arquivo", methods=["GET"])
+def baixar_arquivo_documento(documento_id: int) -> Tuple[Response, int]:
+    """Serve o arquivo da versão atual do documento (se ele estiver no armazenamento)."""
+    with mapa_shards.sessao_do_id(documento_id) as sessao:
+        documento: Optional[Documento] = sessao.get(Documento, documento_id)
+        if documento is None:
+            return jsonify({"erro": "Documento não encontrado."}), 404
+        caminho_atual: Optional[str] = documento.caminho_atual
+
+    sha256 = sha256_do_caminho(caminho_atual)
+    if sha256 is None:
+        return jsonify({
+            "erro": "Documento sem arquivo armazenado.",
+            "caminho_atual": caminho_atual,
+        }), 404
+
+    return baixar_arquivo(sha256)
+
+
+# -----------------------------
+# GET /documentos/<id>/versoes (histórico)
+# -----------------------------
+@arquivos_bp.route("/documentos/<int:documento_id>/versoes", methods=["GET"])
+def listar_versoes(documento_id: int) -> Tuple[Response, int]:
+    """Lista as versões do documento, da mais recente para a mais antiga."""
+    with mapa_shards.sessao_do_id(documento_id) as sessao:
+        versoes: List[Versao] = list(sessao.execute(
+            select(Versao).where(Versao.documento_id == documento_id).order_by(Versao.id.desc())
+        ).scalars())
+        lista: List[Dict[str, Any]] = [
+            {
+                "id": v.id,
+                "numero_versao": v.numero_versao,
+                "caminho_arquivo": v.caminho_arquivo,
+                "sha256": sha256_do_caminho(v.caminho_arquivo),
+                "motivo": v.motivo,
+                "criado_em": v.criado_em.isoformat() if v.criado_em else None,
+            }
+            for v in versoes
+        ]
+    return jsonify(lista), 200
\ No newline at end of file
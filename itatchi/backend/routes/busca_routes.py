@@ -0,0 +1,55 @@
+# itatchi/backend/routes/busca_routes.py
+# Rota de busca textual de documentos (relevância + paginação).
+
+from typing import Tuple
+
+from flask import Blueprint, jsonify, request, Response
+
+from logic.admissao import controle_admissao
+from logic.busca import buscar_documentos
+
+busca_bp = Blueprint('busca_bp', __name__)
+
+# Limite de itens por página aceito pela API
+MAX_POR_PAGINA = 100
+
+
+# -----------------------------
+# GET /documentos/busca
+# -----------------------------
+@busca_bp.route("/documentos/busca", methods=["GET"])
+@controle_admissao.limitar()
+def buscar() -> Tuple[Response, int]:
+    """
+    Busca documentos por texto em titulo, numero, orgao_emissor e observacoes.
+
+    Usa o índice FULLTEXT no MySQL e um índice de trigramas em memória nos
+    demais bancos (SQLite/testes). Nunca faz LIKE '%termo%' na tabela.
+
+    Query Params:
+        - q (str): Texto buscado.
+        - pagina (int, opcional): Página (padrão 1).
+        - por_pagina (int, opcional): Itens por página (padrão 20, máximo 100).
+
+    Retorna:
+        - JSON: { q, total, pagina, por_pagina, resultados: [...] } ordenados por relevância.
+    """
+    consulta: str = (request.args.get("q") or "").strip()
+    if not consulta:
+        return jsonify({"erro": "Informe o texto da busca no parâmetro 'q'."}), 400
+
+    try:
+        pagina: int = max(1, int(request.args.get("pagina", 1)))
+        por_pagina: int = min(MAX_POR_PAGINA, max(1, int(request.args.get("por_pagina", 20))))
+    except ValueError:
+        return jsonify({"erro": "Parâmetros 'pagina' e 'por_pagina' devem ser números inteiros."}), 400
+
+    total, resultados = buscar_documentos(consulta, pagina, por_pagina)
+
+    return jsonify({
+        "q": consulta,
+        "total": total,
+        "pagina": pagina,
+        "por_pagina": por_pagina,
+        "resultados": resultados,
+    }), 200
@@ -0,0 +1,36 @@
+# itatchi/backend/routes/conformidade_routes.py
+# Rotas de conformidade por filial (matriz de documentos obrigatórios).
+
+from typing import Tuple
+
+from flask import Blueprint, jsonify, Response
+
+from database.shards import mapa_shards
+from logic.admissao import controle_admissao
+from logic.cobertura import cache_matriz
+from logic.status_calculator import atualizar_status_pendentes, obter_horizonte_alerta
+
+conformidade_bp = Blueprint('conformidade_bp', __name__)
+
+
+# -----------------------------
+# GET /conformidade/matriz
+# -----------------------------
+@conformidade_bp.route("/conformidade/matriz", methods=["GET"])
+@controle_admissao.limitar()
+def matriz_conformidade() -> Tuple[Response, int]:
+    """
+    Retorna a matriz filial × tipo obrigatório (TipoDocumento.obrigatorio).
+
+    Cada célula vale VALIDO, A_VENCER ou AUSENTE (sem documento ou só vencidos).
+    O cálculo é feito em uma única consulta agregada e fica em cache até a
+    próxima escrita de documento.
+
+    Retorna:
+        - JSON: { filiais: [...], tipos: [...], celulas: [[...]], resumo: {...}, token, cache }
+    """
+    # Status vencidos pela passagem do tempo geram escrita e, portanto, invalidam o cache
+    horizonte: int = obter_horizonte_alerta()
+    mapa_shards.em_todos(lambda sessao: atualizar_status_pendentes(sessao, horizonte))
+
+    return jsonify(cache_matriz.obter()), 200
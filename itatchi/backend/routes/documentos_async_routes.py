@@ -0,0 +1,194 @@
+# itatchi/backend/routes/documentos_async_routes.py
+# Versão assíncrona (ASGI/Starlette) das rotas de documentos_routes.py.
+# As consultas são as mesmas de logic/documentos.py, executadas via AsyncSession.run_sync.
+
+import asyncio
+import json
+import logging
+from datetime import date
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, TypeVar
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from database.async_connection import banco_async
+from models.models import Documento
+from logic.status_calculator import atualizar_status_pendentes, obter_horizonte_alerta
+from logic.documentos import (
+    LOTE_LEITURA, MIMETYPE_NDJSON, RegistroDocumento, consultar_documentos, contar_documentos,
+    consultar_home, excluir_documento, ler_data, ler_token_composto, linhas_ndjson, montar_alteracoes,
+    montar_documento, quer_ndjson, select_documentos, separar_alertas,
+)
+
+T = TypeVar("T")
+logger = logging.getLogger(__name__)
+
+
+async def _executar(funcao: Callable[..., T], *args: Any) -> T:
+    """Roda 'funcao(sessao, *args)' em uma AsyncSession própria (permite asyncio.gather)."""
+    async with banco_async.sessao() as sessao:
+        return await sessao.run_sync(funcao, *args)
+
+
+async def _preparar_consulta() -> int:
+    """Lê o horizonte de alerta e atualiza os status vencidos pela passagem do tempo."""
+    async with banco_async.sessao() as sessao:
+        horizonte: int = await sessao.run_sync(obter_horizonte_alerta)
+        await sessao.run_sync(atualizar_status_pendentes, horizonte)
+        return horizonte
+
+
+# -----------------------------
+# GET /documentos (lista simples)
+# -----------------------------
+async def listar_documentos(request: Request) -> Response:
+    """
+    Mesmo contrato do GET /documentos da app Flask (filtros status/titulo,
+    paginação opcional com X-Total-Count, NDJSON em streaming com
+    Accept: application/x-ndjson). Com paginação, a lista e o total são
+    consultados em paralelo, cada um em sua própria conexão.
+    """
+    status_filtro: Optional[str] = request.query_params.get('status')
+    titulo_filtro: Optional[str] = request.query_params.get('titulo')
+
+    try:
+        pagina: Optional[int] = int(request.query_params['pagina']) if 'pagina' in request.query_params else None
+        por_pagina: int = int(request.query_params.get('por_pagina', 50))
+    except ValueError:
+        return JSONResponse({"erro": "Parâmetros 'pagina' e 'por_pagina' devem ser números inteiros."}, 400)
+    if por_pagina <= 0:
+        return JSONResponse({"erro": "Parâmetro 'por_pagina' deve ser maior que zero."}, 400)
+
+    inicio: int = (max(1, pagina) - 1) * por_pagina if pagina else 0
+    fim: Optional[int] = inicio + por_pagina if pagina else None
+
+    # 1. Atualiza os status antes de ler (as duas consultas abaixo dependem disso)
+    await _preparar_consulta()
+
+    if pagina is None and quer_ndjson(request.headers.get("accept")):
+        return StreamingResponse(_transmitir_documentos(titulo_filtro, status_filtro), media_type=MIMETYPE_NDJSON)
+
+    # 2. Lista e total são independentes: rodam ao mesmo tempo
+    if pagina:
+        itens, total = await asyncio.gather(
+            _executar(consultar_documentos, titulo_filtro, status_filtro, fim),
+            _executar(contar_documentos, titulo_filtro, status_filtro),
+        )
+    else:
+        itens = await _executar(consultar_documentos, titulo_filtro, status_filtro)
+        total = len(itens)
+
+    lista: List[Dict[str, Any]] = [r.para_json() for r in itens[inicio:fim]]
+    headers = {"X-Total-Count": str(total)} if pagina else None
+    return JSONResponse(lista, 200, headers=headers)
+
+
+async def _transmitir_documentos(titulo: Optional[str], status: Optional[str]) -> AsyncIterator[str]:
+    """Lê a listagem do cursor assíncrono em lotes e envia cada lote assim que chega."""
+    async with banco_async.sessao() as sessao:
+        stmt = select_documentos(titulo, status).execution_options(yield_per=LOTE_LEITURA)
+        resultado = await sessao.stream(stmt)
+        async for lote in resultado.tuples().partitions():
+            yield linhas_ndjson(map(RegistroDocumento._make, lote))
+
+
+# -----------------------------
+# POST /documentos (cadastro)
+# -----------------------------
+async def cadastrar_documento(request: Request) -> JSONResponse:
+    """Cadastra um novo documento. Body JSON (obrigatórios): titulo, responsavel, filial_id, tipo_id."""
+    try:
+        dados: Dict[str, Any] = await request.json() or {}
+    except json.JSONDecodeError:
+        dados = {}
+
+    async with banco_async.sessao() as sessao:
+        # 1. Validação, conversão de datas e cálculo do status
+        horizonte: int = await sessao.run_sync(obter_horizonte_alerta)
+        novo_documento, erro = montar_documento(dados, horizonte)
+        if erro:
+            return JSONResponse({"erro": erro}, 400)
+
+        # 2. Salva no banco (os listeners de log/rollup rodam no flush, na mesma transação)
+        try:
+            sessao.add(novo_documento)
+            await sessao.commit()
+            return JSONResponse({
+                "mensagem": "Documento cadastrado com sucesso.",
+                "status": novo_documento.status_calc,
+                "id": novo_documento.id
+            }, 201)
+        except Exception as e:
+            await sessao.rollback()
+            logger.exception("Erro ao salvar documento")
+            return JSONResponse({"erro": f"Erro interno ao salvar documento. {str(e)}"}, 500)
+
+
+# -----------------------------
+# GET /home (para Home/Alertas)
+# -----------------------------
+async def listar_alertas(request: Request) -> JSONResponse:
+    """Documentos do período/categoria para a Central de Consultas (mesmo payload da app Flask)."""
+    categoria: Optional[str] = request.query_params.get("categoria")
+
+    try:
+        data_inicio: Optional[date] = ler_data(request.query_params.get("inicio"))
+        data_fim: Optional[date] = ler_data(request.query_params.get("fim"))
+    except ValueError:
+        return JSONResponse({"erro": "Parâmetros de data inválidos. Use YYYY-MM-DD."}, 400)
+
+    await _preparar_consulta()
+    registros = await _executar(consultar_home, categoria, data_inicio, data_fim)
+    return JSONResponse(separar_alertas(registros), 200)
+
+
+# -----------------------------
+# GET /documentos/alteracoes (feed incremental)
+# -----------------------------
+async def listar_alteracoes(request: Request) -> JSONResponse:
+    """Documentos inseridos/alterados desde o token 'desde', mais o novo token."""
+    try:
+        desde: Optional[int] = ler_token_composto(request.query_params.get("desde"), 1)[0]
+    except ValueError:
+        return JSONResponse({"erro": "Parâmetro 'desde' deve ser um token numérico."}, 400)
+
+    async with banco_async.sessao() as sessao:
+        horizonte: int = await sessao.run_sync(obter_horizonte_alerta)
+        dados = await sessao.run_sync(montar_alteracoes, desde, horizonte)
+    return JSONResponse(dados, 200)
+
+
+# -----------------------------
+# DELETE /documentos/<id> (remoção)
+# -----------------------------
+async def remover_documento(request: Request) -> JSONResponse:
+    """
+    Remove um documento com suas versões e vínculos (mesma regra do Flask);
+    a remoção entra no log de alterações como tombstone.
+    """
+    documento_id: int = request.path_params["documento_id"]
+
+    async with banco_async.sessao() as sessao:
+        documento: Optional[Documento] = await sessao.get(Documento, documento_id)
+        if documento is None:
+            return JSONResponse({"erro": "Documento não encontrado."}, 404)
+
+        try:
+            await sessao.run_sync(excluir_documento, documento)
+            await sessao.commit()
+            return JSONResponse({"mensagem": "Documento removido com sucesso.", "id": documento_id}, 200)
+        except Exception as e:
+            await sessao.rollback()
+            logger.exception("Erro ao remover documento")
+            return JSONResponse({"erro": f"Erro interno ao remover documento. {str(e)}"}, 500)
+
+
+# Rotas na mesma ordem/caminhos do documento_bp
+rotas_documentos: List[Route] = [
+    Route("/documentos", listar_documentos, methods=["GET"]),
+    Route("/documentos", cadastrar_documento, methods=["POST"]),
+    Route("/home", listar_alertas, methods=["GET"]),
+    Route("/documentos/alteracoes", listar_alteracoes, methods=["GET"]),
+    Route("/documentos/{documento_id:int}", remover_documento, methods=["DELETE"]),
+]
@@ -1,232 +1,423 @@
 # itatchi/backend/routes/documentos_routes.py
 # Rotas da API REST para Documentos (Listar, Cadastrar, Listar Alertas/Home).
+# As consultas ficam em logic/documentos.py (compartilhadas com app_asgi.py).
 
-from flask import Blueprint, jsonify, request, Response
-from datetime import datetime, date
-from typing import Any, Dict, List, Optional, Tuple
+import heapq
+import logging
+from itertools import islice
+
+from flask import Blueprint, jsonify, request, Response, stream_with_context
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 # from itatchi.backend.database.connection import db
 # from itatchi.backend.models.models import Documento, Filial, TipoDocumento
 # from ..logic.status_calculator import calcular_status
 
-from database.connection import db
-from models.models import Documento, Filial, TipoDocumento
-from logic.status_calculator import calcular_status
+from database.shards import mapa_shards, mesclar_ordenado
+from models.models import Documento
+from logic.admissao import ESCRITA, controle_admissao
+from logic.gravacao_em_grupo import CadastroNaoGravado, ResultadoDesconhecido, gravacao_em_grupo
+from logic.status_calculator import atualizar_status_pendentes, obter_horizonte_alerta
+from logic.renovacao import montar_seletor, renovar_documentos
+from logic.documentos import (
+    LOTE_LEITURA, MIMETYPE_NDJSON, RegistroDocumento, RegistroHome, consultar_documentos,
+    contar_documentos, consultar_home, excluir_documento, iterar_documentos, ler_data,
+    ler_token_composto, linhas_ndjson, mesclar_alteracoes, montar_alteracoes, montar_documento,
+    quer_ndjson, separar_alertas,
+)
+
 
 documento_bp = Blueprint('documento_bp', __name__)
+logger = logging.getLogger(__name__)
 
 # -----------------------------
 # GET /documentos (lista simples)
 # -----------------------------
 @documento_bp.route('/documentos', methods=['GET'])
-def listar_documentos() -> Response:
+@controle_admissao.limitar()
+def listar_documentos() -> Tuple[Response, int]:
     """
     Lista todos os documentos, com filtros opcionais por status e título.
-    
-    Recalcula e atualiza o status de cada documento no banco antes de retornar.
+
+    Recalcula e atualiza no banco o status dos documentos desatualizados antes de retornar.
+    Com sharding ativo (SHARD_MAP), consulta todos os shards em paralelo e mescla
+    os resultados ordenados por validade.
 
     Query Params:
         - status (str, opcional): Filtra por status_calc ('A_VENCER', 'VENCIDO').
         - titulo (str, opcional): Filtra por parte do título (case-insensitive).
-        
+        - pagina, por_pagina (int, opcionais): Paginação (sem eles, retorna tudo).
+          Com paginação, o total vem no header X-Total-Count.
+
+    Headers:
+        - Accept: application/x-ndjson (opcional): Sem paginação, transmite a lista
+          completa em NDJSON (um documento por linha), lida do cursor sob demanda.
+
     Retorna:
-        - JSON: Lista de documentos detalhados.
+        - JSON: Lista de documentos detalhados, ordenada por validade.
     """
-    query = Documento.query
-
     status_filtro: Optional[str] = request.args.get('status')
     titulo_filtro: Optional[str] = request.args.get('titulo')
 
-    # 1. Filtro por título (executado no banco de dados)
-    if titulo_filtro:
-        query = query.filter(Documento.titulo.ilike(f'%{titulo_filtro}%'))
+    try:
+        pagina: Optional[int] = int(request.args['pagina']) if 'pagina' in request.args else None
+        por_pagina: int = int(request.args.get('por_pagina', 50))
+    except ValueError:
+        return jsonify({"erro": "Parâmetros 'pagina' e 'por_pagina' devem ser números inteiros."}), 400
+    if por_pagina <= 0:
+        return jsonify({"erro": "Parâmetro 'por_pagina' deve ser maior que zero."}), 400
+
+    inicio: int = (max(1, pagina) - 1) * por_pagina if pagina else 0
+    fim: Optional[int] = inicio + por_pagina if pagina else None
+
+    # Lido aqui (contexto da aplicação) e repassado aos shards
+    horizonte: int = obter_horizonte_alerta()
+
+    if pagina is None and quer_ndjson(request.headers.get('Accept')):
+        return _transmitir_documentos(titulo_filtro, status_filtro, horizonte), 200
+
+    def consultar(sessao) -> Tuple[List[RegistroDocumento], int]:
+        # 1. Atualiza os status vencidos pela passagem do tempo (seleção feita no banco)
+        atualizar_status_pendentes(sessao, horizonte)
+        # 2. Filtros e ordenação no banco; cada shard só devolve até o fim da página pedida
+        itens = consultar_documentos(sessao, titulo_filtro, status_filtro, limite=fim)
+        total = contar_documentos(sessao, titulo_filtro, status_filtro) if pagina else len(itens)
+        return itens, total
+
+    resultados = mapa_shards.em_todos(consultar)
+    lista: List[Dict[str, Any]] = [
+        r.para_json() for r in mesclar_ordenado(
+            [itens for itens, _ in resultados], chave=lambda r: r.chave, inicio=inicio, fim=fim
+        )
+    ]
+
+    resposta = jsonify(lista)
+    if pagina:
+        resposta.headers["X-Total-Count"] = str(sum(total for _, total in resultados))
+    return resposta, 200
+
+
+def _transmitir_documentos(titulo: Optional[str], status: Optional[str], horizonte: int) -> Response:
+    """
+    Resposta NDJSON em streaming: o primeiro lote sai assim que é lido do banco e a
+    memória fica limitada a um lote, qualquer que seja o tamanho da tabela.
+    Com sharding, os cursores de cada shard são mesclados por validade sob demanda.
+    """
+    # Status atualizados antes do primeiro byte (o UPDATE não pode ficar no meio do stream)
+    mapa_shards.em_todos(lambda sessao: atualizar_status_pendentes(sessao, horizonte))
+
+    def gerar() -> Iterator[str]:
+        with mapa_shards.sessoes_de_todos() as sessoes:
+            fluxos = [iterar_documentos(sessao, titulo, status) for sessao in sessoes]
+            registros = heapq.merge(*fluxos, key=lambda r: r.chave) if len(fluxos) > 1 else fluxos[0]
+            while lote := list(islice(registros, LOTE_LEITURA)):
+                yield linhas_ndjson(lote)
+
+    # stream_with_context mantém o contexto da app (db.session) vivo durante o envio
+    return Response(stream_with_context(gerar()), mimetype=MIMETYPE_NDJSON)
+
 
-    documentos: List[Documento] = query.all()
+# -----------------------------
+# GET /alertas (grupos paginados)
+# -----------------------------
+# Grupo exibido na Central de Alertas -> parâmetro com a página pedida
+GRUPOS_ALERTA: Dict[str, str] = {"VENCIDO": "pagina_vencidos", "A_VENCER": "pagina_a_vencer"}
+POR_PAGINA_MAX = 200
 
-    # 2. Recalcula e atualiza o status de todos os documentos
-    houve_mudanca = False
-    for d in documentos:
-        nova_situacao: str = calcular_status(d.validade)
-        if nova_situacao != d.status_calc:
-            d.status_calc = nova_situacao
-            houve_mudanca = True
 
-    if houve_mudanca:
-        db.session.commit()
+@documento_bp.route('/alertas', methods=['GET'])
+@controle_admissao.limitar()
+def listar_alertas_paginados() -> Tuple[Response, int]:
+    """
+    Uma página de cada grupo de alerta (VENCIDO e A_VENCER) com o total do grupo.
 
-    # 3. Filtro por status (aplicado em memória após o recalculo)
-    if status_filtro:
-        documentos = [d for d in documentos if d.status_calc == status_filtro]
+    O navegador só recebe as linhas que vai exibir, qualquer que seja a quantidade
+    de documentos vencidos; cada grupo pagina de forma independente.
 
-    # 4. Monta a resposta com dados detalhados (incluindo Filial e Tipo)
-    lista: List[Dict[str, Any]] = []
-    for d in documentos:
-        filial: Optional[Filial] = Filial.query.get(d.filial_id)
-        tipo: Optional[TipoDocumento] = TipoDocumento.query.get(d.tipo_id)
+    Query Params:
+        - pagina_vencidos, pagina_a_vencer (int, opcionais): Página de cada grupo (padrão 1).
+        - por_pagina (int, opcional): Linhas por página (padrão 25, máximo 200).
+        - titulo (str, opcional): Filtra por parte do título.
 
-        lista.append({
-            "id": d.id,
-            "titulo": d.titulo,
-            "responsavel": d.responsavel,
-            "filial": filial.nome if filial else "",
-            "tipo": tipo.nome if tipo else "",
-            "validade": str(d.validade) if d.validade else "Sem Validade",
-            "status": d.status_calc,
-        })
+    Retorna:
+        - JSON: { "VENCIDO": {itens, total, pagina, por_pagina}, "A_VENCER": {...} },
+          itens ordenados por validade.
+    """
+    titulo_filtro: Optional[str] = request.args.get('titulo')
+    try:
+        por_pagina: int = min(max(1, int(request.args.get('por_pagina', 25))), POR_PAGINA_MAX)
+        paginas: Dict[str, int] = {
+            status: max(1, int(request.args.get(parametro, 1))) for status, parametro in GRUPOS_ALERTA.items()
+        }
+    except ValueError:
+        return jsonify({"erro": "Parâmetros de página devem ser números inteiros."}), 400
+
+    horizonte: int = obter_horizonte_alerta()
+
+    def consultar(sessao) -> Dict[str, Tuple[List[RegistroDocumento], int]]:
+        atualizar_status_pendentes(sessao, horizonte)
+        # Cada shard devolve só até o fim da página pedida de cada grupo
+        return {
+            status: (
+                consultar_documentos(sessao, titulo_filtro, status, limite=pagina * por_pagina),
+                contar_documentos(sessao, titulo_filtro, status),
+            )
+            for status, pagina in paginas.items()
+        }
 
-    return jsonify(lista)
+    resultados = mapa_shards.em_todos(consultar)
+
+    grupos: Dict[str, Dict[str, Any]] = {}
+    for status, pagina in paginas.items():
+        inicio = (pagina - 1) * por_pagina
+        itens = mesclar_ordenado(
+            [r[status][0] for r in resultados], chave=lambda r: r.chave, inicio=inicio, fim=inicio + por_pagina
+        )
+        grupos[status] = {
+            "itens": [r.para_json() for r in itens],
+            "total": sum(r[status][1] for r in resultados),
+            "pagina": pagina,
+            "por_pagina": por_pagina,
+        }
+    return jsonify(grupos), 200
 
 
 # -----------------------------
 # POST /documentos (cadastro)
 # -----------------------------
 @documento_bp.route('/documentos', methods=['POST'])
+@controle_admissao.limitar(ESCRITA)
 def cadastrar_documento() -> Tuple[Response, int]:
     """
     Cadastra um novo documento no sistema.
-    
+
     Body JSON (obrigatórios): titulo, responsavel, filial_id, tipo_id.
-    
+
+    Com GRUPO_COMMIT=1, cadastros simultâneos são gravados em lote (um commit
+    por lote); a resposta continua individual e só sai depois do commit.
+
     Retorna:
         - JSON: Mensagem de sucesso e ID (201 Created).
         - JSON: Mensagem de erro (400 Bad Request ou 500 Internal Error).
+        - Commit em grupo com espera esgotada: 503 + Retry-After se o cadastro saiu
+          da fila sem ser gravado (repetir é seguro); 504 com "resultado_desconhecido"
+          se o lote já estava gravando (conferir antes de repetir).
     """
     dados: Dict[str, Any] = request.get_json() or {}
-    print("JSON recebido no /documentos:", dados)  # LOG PARA DEBUG
 
-    # 1. Validação mínima de campos obrigatórios
-    required_fields = ['titulo', 'responsavel', 'filial_id', 'tipo_id']
-    if not all(k in dados for k in required_fields):
-         return jsonify({"erro": "Campos obrigatórios (titulo, responsavel, filial_id, tipo_id) ausentes."}), 400
+    # 1. Validação, conversão de datas e cálculo do status
+    novo_documento, erro = montar_documento(dados, obter_horizonte_alerta())
+    if erro:
+        return jsonify({"erro": erro}), 400
+
+    # 2a. Commit em grupo (GRUPO_COMMIT=1): entra no próximo lote e espera o commit dele
+    if gravacao_em_grupo.ativo:
+        try:
+            gravado: Dict[str, Any] = gravacao_em_grupo.gravar(novo_documento)
+        except CadastroNaoGravado as e:
+            logger.warning("Cadastro retirado da fila do commit em grupo: %s", e)
+            resposta = jsonify({"erro": str(e)})
+            resposta.headers["Retry-After"] = "1"
+            return resposta, 503
+        except ResultadoDesconhecido as e:
+            logger.error("Cadastro com resultado desconhecido no commit em grupo: %s", e)
+            return jsonify({"erro": str(e), "resultado_desconhecido": True}), 504
+        except Exception as e:
+            logger.exception("Erro ao salvar documento")
+            return jsonify({"erro": f"Erro interno ao salvar documento. {str(e)}"}), 500
+        return jsonify({
+            "mensagem": "Documento cadastrado com sucesso.",
+            "status": gravado["status"],
+            "id": gravado["id"]
+        }), 201
+
+    # 2b. Salva no banco de dados (no shard da filial, se houver sharding)
+    with mapa_shards.sessao_da_filial(novo_documento.filial_id) as sessao:
+        try:
+            sessao.add(novo_documento)
+            sessao.commit()
 
-    # 2. Conversão e validação de datas
-    data_validade: Optional[date] = None
-    data_emissao: Optional[date] = None
+            return jsonify({
+                "mensagem": "Documento cadastrado com sucesso.",
+                "status": novo_documento.status_calc,
+                "id": novo_documento.id
+            }), 201
 
-    try:
-        if dados.get('validade'):
-            data_validade = datetime.strptime(dados['validade'], '%Y-%m-%d').date()
-        
-        if dados.get('emissao'):
-            data_emissao = datetime.strptime(dados['emissao'], '%Y-%m-%d').date()
+        except Exception as e:
+            # Em caso de erro, reverte a transação
+            sessao.rollback()
+            logger.exception("Erro ao salvar documento")
+            return jsonify({"erro": f"Erro interno ao salvar documento. {str(e)}"}), 500
 
-    except ValueError:
-        return jsonify({"erro": "Formato de data inválido. Use YYYY-MM-DD."}), 400
-
-    # 3. Executa a lógica de cálculo de status
-    status_calculado: str = calcular_status(data_validade)
-    
-    # 4. Cria o novo objeto Documento
-    novo_documento = Documento(
-        filial_id=dados.get('filial_id'),
-        tipo_id=dados.get('tipo_id'),
-        titulo=dados.get('titulo'),
-        numero=dados.get('numero'),
-        responsavel=dados.get('responsavel'),
-        emissao=data_emissao,
-        validade=data_validade,
-        sem_validade=dados.get('sem_validade', False),
-        orgao_emissor=dados.get('orgao_emissor'),
-        observacoes=dados.get('observacoes'),
-        caminho_atual=dados.get('caminho_atual'),
-        status_calc=status_calculado 
-    )
+
+# -----------------------------
+# POST /documentos/renovacao (renovação em lote)
+# -----------------------------
+@documento_bp.route('/documentos/renovacao', methods=['POST'])
+@controle_admissao.limitar(ESCRITA)
+def renovar_lote() -> Tuple[Response, int]:
+    """
+    Renova um lote de documentos de uma vez (ex: todas as CNHs de uma filial).
+
+    A nova validade é 'emissao' + TipoDocumento.prazo_padrao_dias e o status é
+    recalculado no próprio UPDATE. O estado anterior de cada documento vai para
+    o histórico (versao) na mesma transação.
+
+    Body JSON:
+        - emissao (str, obrigatório): Nova data de emissão (YYYY-MM-DD).
+        - ids (list[int]), filial_id, tipo_id, validade_de, validade_ate (opcionais,
+          ao menos um): Seleção do lote (combinados com E).
+        - motivo (str, opcional): Texto gravado no histórico.
+
+    Retorna:
+        - JSON: { selecionados, renovados, ignorados, versoes_criadas, por_status }
+          (ignorados = SEM_VALIDADE ou tipo sem prazo padrão).
+    """
+    dados: Dict[str, Any] = request.get_json() or {}
 
     try:
-        # 5. Salva no banco de dados
-        db.session.add(novo_documento)
-        db.session.commit()
-        
-        return jsonify({
-            "mensagem": "Documento cadastrado com sucesso.",
-            "status": novo_documento.status_calc,
-            "id": novo_documento.id
-        }), 201
+        emissao: Optional[date] = ler_data(dados.get('emissao'))
+        criterios = montar_seletor(dados)
+    except (TypeError, ValueError) as e:
+        return jsonify({"erro": f"Parâmetros inválidos: {e}"}), 400
+    if emissao is None:
+        return jsonify({"erro": "Campo obrigatório 'emissao' ausente (YYYY-MM-DD)."}), 400
+
+    horizonte: int = obter_horizonte_alerta()
+
+    def renovar(sessao) -> Dict[str, Any]:
+        # Cada shard renova a sua parte do lote na sua própria transação
+        try:
+            resultado = renovar_documentos(sessao, criterios, emissao, horizonte, dados.get('motivo'))
+            sessao.commit()
+            return resultado
+        except Exception:
+            sessao.rollback()
+            raise
 
+    try:
+        resultados = mapa_shards.em_todos(renovar)
     except Exception as e:
-        # Em caso de erro, reverte a transação
-        db.session.rollback()
-        print("Erro ao salvar documento:", e)
-        return jsonify({"erro": f"Erro interno ao salvar documento. {str(e)}"}), 500
+        logger.exception("Erro na renovação em lote")
+        return jsonify({"erro": f"Erro interno na renovação. {str(e)}"}), 500
+
+    total: Dict[str, Any] = {"selecionados": 0, "renovados": 0, "ignorados": 0, "versoes_criadas": 0, "por_status": {}}
+    for resultado in resultados:
+        for campo in ("selecionados", "renovados", "ignorados", "versoes_criadas"):
+            total[campo] += resultado[campo]
+        for status, quantidade in resultado["por_status"].items():
+            total["por_status"][status] = total["por_status"].get(status, 0) + quantidade
+    return jsonify(total), 200
 
 
 # -----------------------------
 # GET /home (para Home/Alertas)
 # -----------------------------
 @documento_bp.route("/home", methods=["GET"])
+@controle_admissao.limitar()
 def listar_alertas() -> Tuple[Response, int]:
     """
     Lista documentos para a tela inicial (Central de Consultas), com filtros de período e categoria.
-    
+
     Query Params:
         - categoria (str, opcional): Filtra pela categoria do TipoDocumento.
         - inicio (str, opcional): Data de validade mínima (YYYY-MM-DD).
         - fim (str, opcional): Data de validade máxima (YYYY-MM-DD).
-        
+
     Retorna:
         - JSON:
             - documentos_relacionados: Todos os documentos encontrados no período/categoria.
             - proximos_vencimento: Subset que possui status 'A_VENCER' ou 'VENCIDO'.
     """
     categoria: Optional[str] = request.args.get("categoria")
-    inicio_str: Optional[str] = request.args.get("inicio")
-    fim_str: Optional[str] = request.args.get("fim")
 
-    # 1. Monta a query, juntando com TipoDocumento para poder filtrar pela categoria
-    query = Documento.query.join(TipoDocumento, Documento.tipo_id == TipoDocumento.id)
+    # 1. Valida o período de validade
+    try:
+        data_inicio: Optional[date] = ler_data(request.args.get("inicio"))
+        data_fim: Optional[date] = ler_data(request.args.get("fim"))
+    except ValueError:
+        return jsonify({"erro": "Parâmetros de data inválidos. Use YYYY-MM-DD."}), 400
+
+    # Lido aqui (contexto da aplicação) e repassado aos shards
+    horizonte: int = obter_horizonte_alerta()
 
-    # 2. Filtro por categoria (se diferente de "Todas")
-    if categoria and categoria.lower() != "todas":
-        query = query.filter(TipoDocumento.categoria == categoria)
+    def consultar(sessao) -> List[RegistroHome]:
+        # 2. Atualiza os status vencidos pela passagem do tempo (seleção feita no banco)
+        atualizar_status_pendentes(sessao, horizonte)
+        # 3. Filtra por categoria/período no banco
+        return consultar_home(sessao, categoria, data_inicio, data_fim)
 
-    # 3. Filtro por período de validade
+    # 4. Consulta os shards em paralelo e mescla pela validade
+    resultados = mapa_shards.em_todos(consultar)
+    registros: List[RegistroHome] = mesclar_ordenado(resultados, chave=lambda r: r.chave)
+
+    # 5. Monta o payload de retorno (com o subset de alertas)
+    return jsonify(separar_alertas(registros)), 200
+
+
+# -----------------------------
+# GET /documentos/alteracoes (feed incremental)
+# -----------------------------
+@documento_bp.route("/documentos/alteracoes", methods=["GET"])
+@controle_admissao.limitar()
+def listar_alteracoes() -> Tuple[Response, int]:
+    """
+    Retorna apenas os documentos inseridos/alterados desde um token, mais um novo token.
+
+    Sem 'desde' (ou desde=0), devolve o retrato completo para o cliente montar
+    sua cópia local. Documentos que não existem mais aparecem em 'removidos'.
+    O token fica antes das alterações dos últimos ALTERACOES_JANELA_SEGUNDOS: elas
+    voltam na chamada seguinte e o cliente as substitui pelo id.
+
+    Com sharding, cada shard tem o seu log: o token é composto ("t1-t2-...", um
+    por shard) e os shards são consultados em paralelo. Se um deles precisar do
+    retrato completo (log recriado), todos mandam o retrato completo.
+
+    Query Params:
+        - desde (str, opcional): Token devolvido pela chamada anterior.
+
+    Retorna:
+        - JSON: { documentos: [...], removidos: [ids], token: int | str, completo: bool }
+    """
     try:
-        if inicio_str:
-            data_inicio: date = datetime.strptime(inicio_str, "%Y-%m-%d").date()
-            query = query.filter(Documento.validade >= data_inicio)
-        if fim_str:
-            data_fim: date = datetime.strptime(fim_str, "%Y-%m-%d").date()
-            query = query.filter(Documento.validade <= data_fim)
+        tokens: List[Optional[int]] = ler_token_composto(request.args.get("desde"), mapa_shards.total())
     except ValueError:
-        return jsonify({"erro": "Parâmetros de data inválidos. Use YYYY-MM-DD."}), 400
+        return jsonify({"erro": "Parâmetro 'desde' deve ser o token devolvido pela chamada anterior."}), 400
 
-    documentos: List[Documento] = query.all()
-
-    # 4. Recalcula e atualiza o status de todos os documentos do período
-    houve_mudanca = False
-    for d in documentos:
-        nova_situacao: str = calcular_status(d.validade)
-        if nova_situacao != d.status_calc:
-            d.status_calc = nova_situacao
-            houve_mudanca = True
-
-    if houve_mudanca:
-        db.session.commit()
-
-    # 5. Monta o payload de retorno
-    documentos_relacionados: List[Dict[str, Any]] = []
-    proximos_vencimento: List[Dict[str, Any]] = []
-
-    for d in documentos:
-        item = {
-            "id": d.id,
-            "titulo": d.titulo,
-            "tipo_id": d.tipo_id,
-            "filial_id": d.filial_id,
-            "validade": d.validade.isoformat() if d.validade else None,
-            "status": d.status_calc,
-            "responsavel": d.responsavel,
-        }
+    horizonte: int = obter_horizonte_alerta()
 
-        documentos_relacionados.append(item)
+    def montar(sessao, desde: Optional[int]) -> Dict[str, Any]:
+        return montar_alteracoes(sessao, desde, horizonte)
 
-        # Separa o subset de alertas
-        if d.status_calc in ("A_VENCER", "VENCIDO"):
-            proximos_vencimento.append(item)
+    resultados = mapa_shards.em_cada(montar, tokens)
+    if any(r["completo"] for r in resultados) and not all(r["completo"] for r in resultados):
+        # O cliente descarta a cópia inteira no retrato completo: vale para todos os shards
+        resultados = mapa_shards.em_cada(montar, [None] * len(resultados))
+    return jsonify(mesclar_alteracoes(resultados)), 200
 
-    return jsonify(
-        {
-            "documentos_relacionados": documentos_relacionados,
-            "proximos_vencimento": proximos_vencimento,
-        }
-    )
\ No newline at end of file
+
+# -----------------------------
+# DELETE /documentos/<id> (remoção)
+# -----------------------------
+@documento_bp.route("/documentos/<int:documento_id>", methods=["DELETE"])
+def remover_documento(documento_id: int) -> Tuple[Response, int]:
+    """
+    Remove um documento com suas versões e vínculos (o rollup das entidades
+    vinculadas é recalculado). A remoção é registrada no log de alterações,
+    então os clientes do feed incremental recebem o tombstone.
+    """
+    # O id diz em que shard o documento está (faixa de ids por shard)
+    with mapa_shards.sessao_do_id(documento_id) as sessao:
+        documento: Optional[Documento] = sessao.get(Documento, documento_id)
+        if documento is None:
+            return jsonify({"erro": "Documento não encontrado."}), 404
+
+        try:
+            excluir_documento(sessao, documento)
+            sessao.commit()
+            return jsonify({"mensagem": "Documento removido com sucesso.", "id": documento_id}), 200
+        except Exception as e:
+            sessao.rollback()
+            logger.exception("Erro ao remover documento")
+            return jsonify({"erro": f"Erro interno ao remover documento. {str(e)}"}), 500
\ No newline at end of file
@@ -0,0 +1,63 @@
+# itatchi/backend/routes/eventos_async_routes.py
+# Versão assíncrona (ASGI/Starlette) do canal SSE de routes/eventos_routes.py.
+# Cada ouvinte é um async generator no event loop alimentado pelo barramento:
+# conexões ociosas não ocupam thread do servidor.
+
+import asyncio
+from typing import AsyncIterator, List
+
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from logic.eventos import HEARTBEAT_SEGUNDOS, FluxoSSE, barramento
+
+
+# -----------------------------
+# GET /eventos (stream SSE)
+# -----------------------------
+async def stream_eventos(request: Request) -> Response:
+    """
+    Mesmo contrato do GET /eventos da app Flask (eventos de todos os shards,
+    reposição com Last-Event-ID). O histórico é lido numa thread do pool;
+    depois disso o ouvinte só espera a sua asyncio.Queue.
+    """
+    # Assina antes da reposição (mesma ordem da versão Flask)
+    fila = barramento.assinar_async()
+    try:
+        cursor, pendentes = await asyncio.to_thread(
+            barramento.retomar,
+            request.headers.get("last-event-id") or request.query_params.get("desde"),
+        )
+    except Exception:
+        barramento.cancelar(fila)
+        raise
+    fluxo = FluxoSSE(cursor, pendentes)
+
+    async def gerar() -> AsyncIterator[str]:
+        try:
+            for texto in fluxo.inicio():
+                yield texto
+            while True:
+                try:
+                    evento = await asyncio.wait_for(fila.get(), HEARTBEAT_SEGUNDOS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                texto = fluxo.formatar(evento)
+                if texto is not None:
+                    yield texto
+        finally:
+            # Cliente desconectado: o Starlette cancela o generator
+            barramento.cancelar(fila)
+
+    return StreamingResponse(
+        gerar(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+rotas_eventos: List[Route] = [
+    Route("/eventos", stream_eventos, methods=["GET"]),
+]
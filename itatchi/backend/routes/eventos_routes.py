@@ -0,0 +1,64 @@
+# itatchi/backend/routes/eventos_routes.py
+# Canal Server-Sent Events (SSE) com atualizações de documentos para a Central de Alertas.
+
+import queue
+from typing import Iterator
+
+from flask import Blueprint, Response, request
+
+from logic.eventos import HEARTBEAT_SEGUNDOS, FluxoSSE, barramento
+
+eventos_bp = Blueprint('eventos_bp', __name__)
+
+
+# -----------------------------
+# GET /eventos (stream SSE)
+# -----------------------------
+@eventos_bp.route("/eventos", methods=["GET"])
+def stream_eventos() -> Response:
+    """
+    Abre um stream SSE com eventos compactos de documentos (de todos os shards).
+
+    Eventos: documento_criado, status_alterado, documento_removido e
+    limiar_alerta (documento atingiu hoje um dos dias de alerta configurados).
+
+    Cada stream aberto aqui ocupa uma thread do servidor enquanto o cliente estiver
+    conectado (o servidor de desenvolvimento usa uma thread por conexão). Com
+    BACKEND_MODO=asgi, o /eventos é atendido pela versão assíncrona
+    (routes/eventos_async_routes.py), em que um ouvinte ocioso não ocupa thread.
+
+    Headers:
+        - Last-Event-ID (opcional): Reenvia o que foi perdido desde esse id ao reconectar.
+    """
+    # Assina antes da reposição: o que for publicado enquanto o histórico é lido
+    # fica na fila em vez de se perder entre as duas etapas
+    fila = barramento.assinar()
+    try:
+        cursor, pendentes = barramento.retomar(
+            request.headers.get("Last-Event-ID") or request.args.get("desde")
+        )
+    except Exception:
+        barramento.cancelar(fila)
+        raise
+    fluxo = FluxoSSE(cursor, pendentes)
+
+    def gerar() -> Iterator[str]:
+        try:
+            yield from fluxo.inicio()
+            while True:
+                try:
+                    evento = fila.get(timeout=HEARTBEAT_SEGUNDOS)
+                except queue.Empty:
+                    yield ": ping\n\n"
+                    continue
+                texto = fluxo.formatar(evento)
+                if texto is not None:
+                    yield texto
+        finally:
+            barramento.cancelar(fila)
+
+    return Response(
+        gerar(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,55 @@
+# itatchi/backend/routes/metricas_routes.py
+# Rotas de monitoramento do processo (admissão, commit em grupo, fotografia diária e prontidão).
+
+from typing import Tuple
+
+from flask import Blueprint, jsonify, Response
+
+from logic.admissao import controle_admissao
+from logic.gravacao_em_grupo import gravacao_em_grupo
+from logic.prontidao import prontidao
+from logic.tendencias import fotografia_diaria
+
+metricas_bp = Blueprint('metricas_bp', __name__)
+
+
+# -----------------------------
+# GET /metricas
+# -----------------------------
+@metricas_bp.route("/metricas", methods=["GET"])
+def metricas() -> Tuple[Response, int]:
+    """
+    Contadores do controle de admissão, do commit em grupo e da fotografia
+    diária de status DESTE processo (cada réplica tem os seus).
+
+    Retorna:
+        - JSON: { admissao: { ativos, na_fila, admitidos, rejeitados_cliente,
+          descartados_fila_cheia, descartados_espera, limites, ... },
+          grupo_commit: { ativo, na_fila, lotes, documentos, maior_lote, ... },
+          tendencias: { ativo, ultima: {data, datas_gravadas, shards_com_outra_replica, ms} } }
+    """
+    return jsonify({
+        "admissao": controle_admissao.metricas(),
+        "grupo_commit": gravacao_em_grupo.metricas(),
+        "tendencias": fotografia_diaria.estado(),
+    }), 200
+
+
+# -----------------------------
+# GET /pronto (readiness)
+# -----------------------------
+@metricas_bp.route("/pronto", methods=["GET"])
+def pronto() -> Tuple[Response, int]:
+    """
+    Sonda de prontidão: 200 quando o aquecimento (pool e caches) terminou, 503 antes.
+    A rota "/" continua respondendo desde a subida (processo vivo).
+
+    Retorna:
+        - JSON: { pronto, segundos_desde_subida, etapas_ms, tentativas, erro }
+    """
+    estado = prontidao.estado()
+    if not estado["pronto"]:
+        resposta = jsonify(estado)
+        resposta.headers["Retry-After"] = "1"
+        return resposta, 503
+    return jsonify(estado), 200
@@ -0,0 +1,40 @@
+# itatchi/backend/routes/referencias_routes.py
+# Rota dos dados de referência, com ETag e Cache-Control para o cache dos clientes.
+
+import os
+
+from flask import Blueprint, jsonify, request, Response
+
+from database.connection import db
+from logic.referencias import carregar_referencias
+
+referencias_bp = Blueprint('referencias_bp', __name__)
+
+# Tempo (s) em que o cliente pode reutilizar a resposta sem revalidar
+REFERENCIAS_MAX_AGE: int = int(os.getenv("REFERENCIAS_MAX_AGE", "300"))
+
+
+# -----------------------------
+# GET /referencias
+# -----------------------------
+@referencias_bp.route("/referencias", methods=["GET"])
+def obter_referencias() -> Response:
+    """
+    Filiais, tipos de documento e categorias usados nos formulários e filtros.
+
+    A resposta leva ETag forte e 'Cache-Control: max-age'. Depois que expira, o
+    cliente revalida com If-None-Match e recebe 304 sem corpo se nada mudou.
+
+    Retorna:
+        - JSON: { filiais: [{id, nome, codigo}],
+                  tipos: [{id, nome, categoria, obrigatorio, prazo_padrao_dias}],
+                  categorias: [str] }
+    """
+    dados, etag = carregar_referencias(db.session)
+
+    resposta = jsonify(dados)
+    resposta.set_etag(etag)
+    resposta.cache_control.public = True
+    resposta.cache_control.max_age = REFERENCIAS_MAX_AGE
+    # Converte em 304 (sem corpo) quando o If-None-Match bate com o ETag
+    return resposta.make_conditional(request)
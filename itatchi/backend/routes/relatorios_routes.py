@@ -0,0 +1,88 @@
+# itatchi/backend/routes/relatorios_routes.py
+# Rotas da fila de relatórios (submissão, progresso e download do Excel).
+
+from typing import Any, Dict, Tuple
+
+from flask import Blueprint, jsonify, request, Response, send_file
+
+from database.shards import mapa_shards
+from logic.admissao import controle_admissao
+from logic.relatorios import CONCLUIDO, ID_JOB_RE, fila_relatorios, normalizar_filtros
+from logic.status_calculator import atualizar_status_pendentes, obter_horizonte_alerta
+
+relatorios_bp = Blueprint('relatorios_bp', __name__)
+
+MIMETYPE_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _com_url(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Estado do job para o cliente, com o link de download quando pronto."""
+    return {**job, "arquivo_url": f"/relatorios/{job['id']}/arquivo" if job["status"] == CONCLUIDO else None}
+
+
+# -----------------------------
+# POST /relatorios (submissão)
+# -----------------------------
+@relatorios_bp.route("/relatorios", methods=["POST"])
+@controle_admissao.limitar()
+def submeter_relatorio() -> Tuple[Response, int]:
+    """
+    Enfileira a geração do relatório Excel e devolve o job na hora.
+
+    Body JSON (todos opcionais):
+        - categoria (str): Categoria do TipoDocumento ("Todas" = sem filtro).
+        - inicio, fim (str): Período de validade (YYYY-MM-DD).
+        - status (list[str]): Status incluídos (vazio = todos).
+        - filial_id (int): Restringe a uma filial.
+
+    Retorna:
+        - JSON do job (202 Accepted), ou 200 se o mesmo relatório já estiver
+          pronto para a versão atual dos dados.
+    """
+    try:
+        filtros = normalizar_filtros(request.get_json() or {})
+    except (TypeError, ValueError) as e:
+        return jsonify({"erro": f"Filtros inválidos: {e}"}), 400
+
+    # Status vencidos pela passagem do tempo mudam a versão dos dados antes do hash
+    horizonte: int = obter_horizonte_alerta()
+    mapa_shards.em_todos(lambda sessao: atualizar_status_pendentes(sessao, horizonte))
+
+    job = fila_relatorios.submeter(filtros)
+    return jsonify(_com_url(job)), 200 if job["status"] == CONCLUIDO else 202
+
+
+# -----------------------------
+# GET /relatorios/<id> (progresso)
+# -----------------------------
+@relatorios_bp.route("/relatorios/<job_id>", methods=["GET"])
+def consultar_relatorio(job_id: str) -> Tuple[Response, int]:
+    """Retorna status (NA_FILA, PROCESSANDO, CONCLUIDO, ERRO), progresso (0-100) e etapa do job."""
+    job = fila_relatorios.obter(job_id) if ID_JOB_RE.match(job_id) else None
+    if job is None:
+        return jsonify({"erro": "Relatório não encontrado."}), 404
+    return jsonify(_com_url(job)), 200
+
+
+# -----------------------------
+# GET /relatorios/<id>/arquivo (download)
+# -----------------------------
+@relatorios_bp.route("/relatorios/<job_id>/arquivo", methods=["GET"])
+def baixar_relatorio(job_id: str):
+    """Envia o .xlsx pronto (409 se o job ainda não terminou)."""
+    job = fila_relatorios.obter(job_id) if ID_JOB_RE.match(job_id) else None
+    if job is None:
+        return jsonify({"erro": "Relatório não encontrado."}), 404
+
+    caminho = fila_relatorios.caminho_arquivo(job_id)
+    if job["status"] != CONCLUIDO or not caminho.is_file():
+        return jsonify({"erro": "Relatório ainda não está pronto.", "status": job["status"]}), 409
+
+    return send_file(
+        caminho,
+        mimetype=MIMETYPE_XLSX,
+        as_attachment=True,
+        download_name=f"relatorio_{job_id}.xlsx",
+        conditional=True,
+        max_age=0,
+    )
@@ -0,0 +1,92 @@
+# itatchi/backend/routes/tendencias_routes.py
+# Rota das séries de tendência (contagens diárias por status, lidas da tabela status_diario).
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+from flask import Blueprint, jsonify, request, Response
+
+from database.shards import mapa_shards
+from logic.admissao import controle_admissao
+from logic.tendencias import DIMENSOES, consultar_tendencias
+
+tendencias_bp = Blueprint('tendencias_bp', __name__)
+
+# Intervalo máximo de uma consulta (cerca de 3 anos)
+TENDENCIAS_MAX_DIAS = 1096
+
+STATUS_VALIDOS = ("VIGENTE", "A_VENCER", "VENCIDO", "SEM_VALIDADE")
+
+
+# -----------------------------
+# GET /tendencias
+# -----------------------------
+@tendencias_bp.route("/tendencias", methods=["GET"])
+@controle_admissao.limitar()
+def listar_tendencias() -> Tuple[Response, int]:
+    """
+    Quantidade de documentos por status em cada dia do intervalo.
+
+    Os números vêm da fotografia diária (status_diario), não dos documentos: o
+    custo não depende do tamanho do histórico nem do número de documentos.
+    Datas anteriores à primeira fotografia foram estimadas a partir da validade.
+
+    Query Params:
+        - inicio, fim (str, opcionais): Intervalo YYYY-MM-DD (padrão: últimos 365 dias até hoje).
+        - agrupar (str, opcional): "filial", "categoria" ou "filial,categoria" para
+          manter as séries separadas (padrão: soma geral por status).
+        - filial_id (int), categoria (str) (opcionais): Filtros.
+        - status (str, opcional): Lista separada por vírgula (ex: "VENCIDO,A_VENCER").
+
+    Retorna:
+        - JSON: { inicio, fim, agrupar, linhas: [{data, status, [filial_id], [categoria], quantidade}] },
+          linhas ordenadas por data.
+    """
+    try:
+        fim: date = date.fromisoformat(request.args["fim"]) if request.args.get("fim") else date.today()
+        inicio: date = (
+            date.fromisoformat(request.args["inicio"]) if request.args.get("inicio")
+            else fim - timedelta(days=364)
+        )
+        filial_id = int(request.args["filial_id"]) if request.args.get("filial_id") else None
+    except ValueError:
+        return jsonify({"erro": "Use datas no formato YYYY-MM-DD e filial_id inteiro."}), 400
+
+    if fim < inicio:
+        return jsonify({"erro": "A data final não pode ser menor que a data inicial."}), 400
+    if (fim - inicio).days >= TENDENCIAS_MAX_DIAS:
+        return jsonify({"erro": f"Intervalo máximo de {TENDENCIAS_MAX_DIAS} dias."}), 400
+
+    agrupar: List[str] = [d for d in (request.args.get("agrupar") or "").split(",") if d]
+    status: List[str] = [s for s in (request.args.get("status") or "").split(",") if s]
+    if any(d not in DIMENSOES for d in agrupar) or any(s not in STATUS_VALIDOS for s in status):
+        return jsonify({
+            "erro": f"agrupar aceita {', '.join(DIMENSOES)}; status aceita {', '.join(STATUS_VALIDOS)}."
+        }), 400
+    categoria = request.args.get("categoria")
+
+    resultados = mapa_shards.em_todos(lambda sessao: consultar_tendencias(
+        sessao, inicio, fim, agrupar, filial_id, categoria, status
+    ))
+
+    # Soma as linhas de mesma chave vindas de shards diferentes
+    somas: Dict[Tuple[Any, ...], int] = defaultdict(int)
+    for linhas in resultados:
+        for *chave, quantidade in linhas:
+            somas[tuple(chave)] += int(quantidade or 0)
+
+    nomes = ["data", "status", *("filial_id" if d == "filial" else d for d in agrupar)]
+    linhas_json: List[Dict[str, Any]] = []
+    for chave in sorted(somas):
+        linha = dict(zip(nomes, chave))
+        linha["data"] = linha["data"].isoformat()
+        linha["quantidade"] = somas[chave]
+        linhas_json.append(linha)
+
+    return jsonify({
+        "inicio": inicio.isoformat(),
+        "fim": fim.isoformat(),
+        "agrupar": agrupar,
+        "linhas": linhas_json,
+    }), 200
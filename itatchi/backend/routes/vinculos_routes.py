@@ -0,0 +1,167 @@
+# itatchi/backend/routes/vinculos_routes.py
+# Rotas de vínculos (documento ↔ MOTORISTA/VEICULO/LOCAL) e consulta de conformidade por entidade.
+
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Blueprint, jsonify, request, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database.shards import mapa_shards
+from models.models import ConformidadeEntidade, Documento, Vinculo
+# Importado também para registrar o listener que mantém o rollup de conformidade
+from logic.conformidade import GRAVIDADE_STATUS
+
+vinculos_bp = Blueprint('vinculos_bp', __name__)
+logger = logging.getLogger(__name__)
+
+TIPOS_ALVO = ("MOTORISTA", "VEICULO", "LOCAL")
+
+
+# -----------------------------
+# POST /vinculos (cadastro)
+# -----------------------------
+@vinculos_bp.route("/vinculos", methods=["POST"])
+def criar_vinculo() -> Tuple[Response, int]:
+    """
+    Vincula um documento a uma entidade.
+
+    Body JSON (obrigatórios): documento_id, tipo_alvo (MOTORISTA, VEICULO, LOCAL), alvo_id.
+    """
+    dados: Dict[str, Any] = request.get_json() or {}
+
+    if not all(dados.get(k) for k in ("documento_id", "tipo_alvo", "alvo_id")):
+        return jsonify({"erro": "Campos obrigatórios (documento_id, tipo_alvo, alvo_id) ausentes."}), 400
+
+    tipo_alvo: str = str(dados["tipo_alvo"]).upper()
+    if tipo_alvo not in TIPOS_ALVO:
+        return jsonify({"erro": f"tipo_alvo inválido. Use um de: {', '.join(TIPOS_ALVO)}."}), 400
+
+    try:
+        documento_id = int(dados["documento_id"])
+    except (TypeError, ValueError):
+        return jsonify({"erro": "Campo 'documento_id' deve ser um número inteiro."}), 400
+
+    # O vínculo fica no shard do documento (o rollup da entidade é por shard)
+    with mapa_shards.sessao_do_id(documento_id) as sessao:
+        if sessao.get(Documento, documento_id) is None:
+            return jsonify({"erro": "Documento não encontrado."}), 404
+
+        vinculo = Vinculo(
+            documento_id=documento_id,
+            tipo_alvo=tipo_alvo,
+            alvo_id=str(dados["alvo_id"]),
+        )
+
+        try:
+            # O rollup da entidade é atualizado na mesma transação (listener after_flush)
+            sessao.add(vinculo)
+            sessao.commit()
+            return jsonify({"mensagem": "Vínculo criado com sucesso.", "id": vinculo.id}), 201
+        except Exception as e:
+            sessao.rollback()
+            logger.exception("Erro ao salvar vínculo")
+            return jsonify({"erro": f"Erro interno ao salvar vínculo. {str(e)}"}), 500
+
+
+# -----------------------------
+# DELETE /vinculos/<id>
+# -----------------------------
+@vinculos_bp.route("/vinculos/<int:vinculo_id>", methods=["DELETE"])
+def remover_vinculo(vinculo_id: int) -> Tuple[Response, int]:
+    """Remove um vínculo (o rollup da entidade é recalculado)."""
+    # Vínculo e documento estão no mesmo shard; o id do vínculo também diz qual
+    with mapa_shards.sessao_do_id(vinculo_id) as sessao:
+        vinculo: Optional[Vinculo] = sessao.get(Vinculo, vinculo_id)
+        if vinculo is None:
+            return jsonify({"erro": "Vínculo não encontrado."}), 404
+
+        try:
+            sessao.delete(vinculo)
+            sessao.commit()
+            return jsonify({"mensagem": "Vínculo removido com sucesso.", "id": vinculo_id}), 200
+        except Exception as e:
+            sessao.rollback()
+            logger.exception("Erro ao remover vínculo")
+            return jsonify({"erro": f"Erro interno ao remover vínculo. {str(e)}"}), 500
+
+
+# -----------------------------
+# GET /entidades/<tipo>/<id>/documentos
+# -----------------------------
+@vinculos_bp.route("/entidades/<tipo_alvo>/<alvo_id>/documentos", methods=["GET"])
+def listar_documentos_entidade(tipo_alvo: str, alvo_id: str) -> Tuple[Response, int]:
+    """
+    Lista os documentos vinculados à entidade (consulta pelo índice tipo_alvo/alvo_id).
+    Com sharding, a entidade pode ter documentos em vários shards: todos são consultados.
+    """
+    def consultar(sessao: Session) -> List[Dict[str, Any]]:
+        stmt = (
+            select(Documento.id, Documento.titulo, Documento.tipo_id, Documento.filial_id,
+                   Documento.validade, Documento.status_calc)
+            .join(Vinculo, Vinculo.documento_id == Documento.id)
+            .where(Vinculo.tipo_alvo == tipo_alvo.upper(), Vinculo.alvo_id == alvo_id)
+        )
+        return [
+            {
+                "id": doc_id,
+                "titulo": titulo,
+                "tipo_id": tipo_id,
+                "filial_id": filial_id,
+                "validade": validade.isoformat() if validade else None,
+                "status": status,
+            }
+            for doc_id, titulo, tipo_id, filial_id, validade, status in sessao.execute(stmt)
+        ]
+
+    lista: List[Dict[str, Any]] = [d for parte in mapa_shards.em_todos(consultar) for d in parte]
+    return jsonify(lista), 200
+
+
+# -----------------------------
+# GET /entidades/<tipo>/<id>/conformidade (O(1) pelo rollup)
+# -----------------------------
+@vinculos_bp.route("/entidades/<tipo_alvo>/<alvo_id>/conformidade", methods=["GET"])
+def consultar_conformidade(tipo_alvo: str, alvo_id: str) -> Tuple[Response, int]:
+    """
+    Responde "a entidade está em conformidade?" lendo uma única linha do rollup
+    (chave primária tipo_alvo + alvo_id) por shard, sem varrer os documentos.
+
+    Retorna:
+        - JSON: pior_status, proximo_vencimento, total_documentos e 'conforme'
+          (True se nenhum documento vinculado está VENCIDO, contando os que
+          venceram depois da última atualização do rollup).
+    """
+    tipo_alvo = tipo_alvo.upper()
+    if tipo_alvo not in TIPOS_ALVO:
+        return jsonify({"erro": f"tipo_alvo inválido. Use um de: {', '.join(TIPOS_ALVO)}."}), 400
+
+    def consultar(sessao: Session) -> Optional[Tuple[Optional[str], Any, int]]:
+        resumo: Optional[ConformidadeEntidade] = sessao.get(ConformidadeEntidade, (tipo_alvo, alvo_id))
+        if resumo is None:
+            return None
+        return resumo.pior_status, resumo.proximo_vencimento, resumo.total_documentos
+
+    # Uma linha do rollup por shard que tem documentos da entidade: pior status, menor vencimento, soma
+    resumos = [r for r in mapa_shards.em_todos(consultar) if r is not None]
+    if not resumos:
+        return jsonify({"erro": "Entidade sem documentos vinculados."}), 404
+
+    pior_status: Optional[str] = max((r[0] for r in resumos), key=lambda st: GRAVIDADE_STATUS.get(st, 0))
+    vencimentos = [r[1] for r in resumos if r[1] is not None]
+    proximo_vencimento = min(vencimentos) if vencimentos else None
+    # O rollup só muda quando um documento/vínculo é gravado: um vencimento que já
+    # passou desde então significa um documento VENCIDO que o resumo ainda não reflete
+    if proximo_vencimento is not None and proximo_vencimento < date.today():
+        pior_status = "VENCIDO"
+
+    return jsonify({
+        "tipo_alvo": tipo_alvo,
+        "alvo_id": alvo_id,
+        "conforme": pior_status != "VENCIDO",
+        "pior_status": pior_status,
+        "proximo_vencimento": proximo_vencimento.isoformat() if proximo_vencimento else None,
+        "total_documentos": sum(r[2] for r in resumos),
+    }), 200
\ No newline at end of file
@@ -0,0 +1,55 @@
+# itatchi/backend/tests/conftest.py
+# Aplicação de teste: SQLite temporário com chaves estrangeiras ligadas (como no MySQL).
+#
+# Execução (na pasta backend):  python -m pytest tests
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+PASTA = tempfile.mkdtemp(prefix="itatchi-testes-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(PASTA, 'itatchi.db')}",
+    "ARQUIVOS_DIR": os.path.join(PASTA, "arquivos"),
+    "RELATORIOS_DIR": os.path.join(PASTA, "relatorios"),
+    "PRONTIDAO_AQUECER": "0",
+    "ADMISSAO_MAX_GLOBAL": "0",
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+
+@event.listens_for(Engine, "connect")
+def _ligar_chaves_estrangeiras(conexao, _registro) -> None:
+    # SQLite só verifica FOREIGN KEY com o pragma (o MySQL verifica sempre);
+    # vale também para o engine assíncrono (aiosqlite) do app_asgi
+    if "sqlite" in type(conexao).__module__:
+        cursor = conexao.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+from app_backend import app as aplicacao  # noqa: E402
+from database.connection import db  # noqa: E402
+from models.models import Filial, Parametro, TipoDocumento  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app():
+    with aplicacao.app_context():
+        db.session.add_all([
+            Filial(id=1, nome="Matriz São Paulo", codigo="SP01"),
+            TipoDocumento(id=1, categoria="Pessoas", nome="CNH", obrigatorio=True, prazo_padrao_dias=365),
+            Parametro(dias_alerta_json="[30]"),
+        ])
+        db.session.commit()
+    return aplicacao
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,38 @@
+# itatchi/backend/tests/test_alteracoes.py
+# Feed incremental: o token fica antes das entradas recentes do log.
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import update
+
+from database.connection import db
+from models.models import DocumentoAlteracao
+
+
+def _cadastrar(client, titulo: str) -> int:
+    resposta = client.post("/documentos", json={
+        "titulo": titulo, "responsavel": "Ana", "filial_id": 1, "tipo_id": 1,
+        "validade": (date.today() + timedelta(days=400)).isoformat(),
+    })
+    assert resposta.status_code == 201
+    return resposta.get_json()["id"]
+
+
+def test_token_nao_passa_das_entradas_recentes(app, client):
+    antigo = _cadastrar(client, "Antigo")
+    with app.app_context():
+        # Tudo o que já existe no log passa a ser "antigo" (fora da janela)
+        db.session.execute(update(DocumentoAlteracao).values(criado_em=datetime.utcnow() - timedelta(hours=1)))
+        db.session.commit()
+        ultimo_antigo = db.session.query(db.func.max(DocumentoAlteracao.id)).scalar()
+    recente = _cadastrar(client, "Recente")
+
+    feed = client.get("/documentos/alteracoes").get_json()
+    assert feed["token"] == ultimo_antigo
+    assert {antigo, recente} <= {d["id"] for d in feed["documentos"]}
+
+    # A próxima leitura relê a entrada recente (uma transação que confirmasse
+    # depois, com id menor que ela, também seria lida aqui)
+    delta = client.get(f"/documentos/alteracoes?desde={feed['token']}").get_json()
+    assert not delta["completo"]
+    assert [d["id"] for d in delta["documentos"]] == [recente]
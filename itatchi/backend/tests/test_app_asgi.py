@@ -0,0 +1,44 @@
+# itatchi/backend/tests/test_app_asgi.py
+# BACKEND_MODO=asgi: toda URL usada pelo frontend responde pela app ASGI (rotas assíncronas ou Flask montado).
+
+from datetime import date, timedelta
+
+import pytest
+from starlette.testclient import TestClient
+
+
+@pytest.fixture
+def asgi(app):
+    import app_asgi
+
+    with TestClient(app_asgi.app) as cliente:
+        yield cliente
+
+
+def test_urls_do_frontend_respondem_no_modo_asgi(asgi):
+    cadastro = asgi.post("/documentos", json={
+        "titulo": "Alvará ASGI", "responsavel": "Ana", "filial_id": 1, "tipo_id": 1,
+        "validade": (date.today() + timedelta(days=20)).isoformat(),
+    })
+    assert cadastro.status_code == 201, cadastro.text
+    documento_id = cadastro.json()["id"]
+
+    assert asgi.post(f"/documentos/{documento_id}/arquivo", content=b"pdf").status_code == 201
+    assert asgi.post("/vinculos", json={
+        "documento_id": documento_id, "tipo_alvo": "VEICULO", "alvo_id": "asgi-1",
+    }).status_code == 201
+    assert asgi.post("/documentos/renovacao", json={
+        "ids": [documento_id], "emissao": date.today().isoformat(),
+    }).status_code == 200
+
+    job = asgi.post("/relatorios", json={})
+    assert job.status_code in (200, 201, 202), job.text
+
+    for url in (
+        "/documentos", "/documentos/alteracoes", "/home", "/alertas", "/referencias",
+        "/conformidade/matriz", "/documentos/busca?q=alvara", "/tendencias",
+        f"/relatorios/{job.json()['id']}", f"/documentos/{documento_id}/arquivo",
+        f"/documentos/{documento_id}/versoes", "/entidades/VEICULO/asgi-1/conformidade", "/pronto",
+    ):
+        resposta = asgi.get(url)
+        assert resposta.status_code == 200, (url, resposta.status_code, resposta.text[:200])
@@ -0,0 +1,83 @@
+# itatchi/backend/tests/test_arquivos.py
+# Upload de arquivos: corpo vazio e falha ao registrar a versão não deixam blob no disco;
+# numeração de versões compartilhada com a renovação em lote.
+
+import hashlib
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from database.connection import db
+from logic.arquivos import armazem
+from models.models import Documento, Versao
+
+
+def _cadastrar(client) -> int:
+    resposta = client.post("/documentos", json={
+        "titulo": "CNH", "responsavel": "Ana", "filial_id": 1, "tipo_id": 1,
+        "validade": (date.today() + timedelta(days=100)).isoformat(),
+    })
+    assert resposta.status_code == 201
+    return resposta.get_json()["id"]
+
+
+def _blobs() -> set:
+    return {p.name for p in armazem.raiz.glob("*/*/*") if p.is_file()}
+
+
+def test_upload_vazio_nao_grava_blob(client):
+    documento_id = _cadastrar(client)
+    antes = _blobs()
+
+    resposta = client.post(f"/documentos/{documento_id}/arquivo", data=b"")
+
+    assert resposta.status_code == 400
+    assert _blobs() == antes
+
+
+def test_commit_com_erro_descarta_blob_novo(client, monkeypatch):
+    documento_id = _cadastrar(client)
+    conteudo = b"conteudo que nunca foi registrado"
+
+    def falhar(*_args, **_kwargs):
+        raise RuntimeError("banco fora")
+
+    monkeypatch.setattr(Versao, "__init__", falhar)
+    resposta = client.post(f"/documentos/{documento_id}/arquivo", data=conteudo)
+
+    assert resposta.status_code == 500
+    assert not armazem.existe(hashlib.sha256(conteudo).hexdigest())
+
+
+def test_numeracao_de_versoes_entre_upload_e_renovacao(app, client):
+    documento_id = _cadastrar(client)
+
+    def renovar() -> None:
+        resposta = client.post("/documentos/renovacao", json={
+            "ids": [documento_id], "emissao": date.today().isoformat(),
+        })
+        assert resposta.get_json()["renovados"] == 1
+
+    def estado() -> tuple:
+        with app.app_context():
+            documento = db.session.get(Documento, documento_id)
+            versoes = db.session.execute(
+                select(Versao.numero_versao, Versao.validade_anterior)
+                .where(Versao.documento_id == documento_id).order_by(Versao.id)
+            ).all()
+            return documento.versao_atual, documento.validade, versoes
+
+    # Toda alteração cria a versão versao_atual + 1; a renovação guarda o estado anterior nela
+    _, validade_original, _ = estado()
+    renovar()
+    assert estado()[0] == "2.0.0"
+
+    assert client.post(f"/documentos/{documento_id}/arquivo", data=b"v3").get_json()["versao"] == "3.0.0"
+    renovar()
+
+    versao_atual, _, versoes = estado()
+    assert versao_atual == "4.0.0"
+    numeros = [int(n.split(".")[0]) for n, _ in versoes]
+    assert numeros == [2, 3, 4]
+    assert len(set(numeros)) == len(numeros) and numeros == sorted(numeros)
+    assert versoes[0][1] == validade_original
@@ -0,0 +1,22 @@
+# itatchi/backend/tests/test_conformidade.py
+# GET /entidades/<tipo>/<id>/conformidade com rollup desatualizado pela passagem do tempo.
+
+from datetime import date, timedelta
+
+from database.connection import db
+from models.models import ConformidadeEntidade
+
+
+def test_vencimento_passado_no_rollup_nao_e_conforme(app, client):
+    # Rollup gravado quando o documento ainda estava vigente; a data passou desde então
+    with app.app_context():
+        db.session.add(ConformidadeEntidade(
+            tipo_alvo="LOCAL", alvo_id="rollup-antigo", pior_status="VIGENTE",
+            proximo_vencimento=date.today() - timedelta(days=1), total_documentos=1,
+        ))
+        db.session.commit()
+
+    resposta = client.get("/entidades/LOCAL/rollup-antigo/conformidade").get_json()
+
+    assert resposta["conforme"] is False
+    assert resposta["pior_status"] == "VENCIDO"
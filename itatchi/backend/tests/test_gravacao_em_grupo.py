@@ -0,0 +1,37 @@
+# itatchi/backend/tests/test_gravacao_em_grupo.py
+# Commit em grupo: espera esgotada com o pedido na fila cancela o cadastro (503, repetir é seguro).
+
+from sqlalchemy import func, select
+
+from database.connection import db
+from logic.gravacao_em_grupo import gravacao_em_grupo
+from models.models import Documento
+
+
+def _contar(app, titulo: str) -> int:
+    with app.app_context():
+        return db.session.execute(select(func.count(Documento.id)).where(Documento.titulo == titulo)).scalar()
+
+
+def test_espera_esgotada_na_fila_nao_grava(app, client, monkeypatch):
+    monkeypatch.setattr(gravacao_em_grupo, "ativo", True)
+    monkeypatch.setattr(gravacao_em_grupo, "timeout", 0.05)
+    # Sem gravadora: o pedido fica parado na fila até a espera esgotar
+    monkeypatch.setattr(gravacao_em_grupo, "_garantir_gravadora", lambda: None)
+    gravacao_em_grupo._app = app
+
+    resposta = client.post("/documentos", json={
+        "titulo": "Cancelado na fila", "responsavel": "Ana", "filial_id": 1, "tipo_id": 1,
+    })
+    assert resposta.status_code == 503
+    assert resposta.headers["Retry-After"] == "1"
+
+    # A gravadora sobe depois, descarta o cancelado e grava o pedido seguinte
+    monkeypatch.setattr(gravacao_em_grupo, "timeout", 30.0)
+    monkeypatch.delattr(gravacao_em_grupo, "_garantir_gravadora")
+    resposta = client.post("/documentos", json={
+        "titulo": "Gravado depois", "responsavel": "Ana", "filial_id": 1, "tipo_id": 1,
+    })
+    assert resposta.status_code == 201
+    assert _contar(app, "Cancelado na fila") == 0
+    assert _contar(app, "Gravado depois") == 1
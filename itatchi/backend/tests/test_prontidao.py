@@ -0,0 +1,53 @@
+# itatchi/backend/tests/test_prontidao.py
+# Prontidão: /pronto no modo ASGI (healthcheck do compose) e orçamentos de subida do backend e das páginas.
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from starlette.testclient import TestClient
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# Segundos por página (mediana da subida a frio); o backend mantém o orçamento padrão
+ORCAMENTO_PAGINAS = "backend.importacao=2,backend.pronto=10,*=5"
+
+
+def test_pronto_na_app_asgi(monkeypatch):
+    import app_asgi
+
+    monkeypatch.setenv("PRONTIDAO_AQUECER", "1")
+    with TestClient(app_asgi.app) as asgi:
+        for _ in range(100):
+            resposta = asgi.get("/pronto")
+            if resposta.status_code == 200:
+                break
+            assert resposta.status_code == 503
+            time.sleep(0.05)
+        assert resposta.status_code == 200
+        assert resposta.json()["pronto"] is True
+        # Mesmas etapas do Flask (pool e caches) + o pool do engine assíncrono
+        assert {"pool", "matriz", "busca", "pool_async"} <= set(resposta.json()["etapas_ms"])
+
+
+def _rodar_orcamento(*args: str) -> subprocess.CompletedProcess:
+    # Banco temporário próprio do benchmark (sem o DATABASE_URL dos testes)
+    env = {k: v for k, v in os.environ.items() if k not in ("DATABASE_URL", "PRONTIDAO_AQUECER")}
+    return subprocess.run(
+        [sys.executable, "-m", "benchmarks.inicializacao", "--repeticoes", "1", "--documentos", "200", *args],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=600,
+    )
+
+
+def test_orcamento_de_subida_do_backend():
+    processo = _rodar_orcamento("--sem-frontend")
+    assert processo.returncode == 0, processo.stdout + processo.stderr
+
+
+def test_orcamento_de_subida_das_paginas():
+    # Primeira execução de cada página (AppTest) contra o backend recém-subido; falha também se alguma levantar exceção
+    pytest.importorskip("streamlit")
+    processo = _rodar_orcamento("--orcamento", ORCAMENTO_PAGINAS)
+    assert processo.returncode == 0, processo.stdout + processo.stderr
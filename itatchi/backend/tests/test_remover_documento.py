@@ -0,0 +1,72 @@
+# itatchi/backend/tests/test_remover_documento.py
+# DELETE /documentos/<id> com versões, vínculos e rollup de conformidade.
+
+from datetime import date, timedelta
+
+import logic.alteracoes
+from database.connection import db
+from models.models import ConformidadeEntidade, Versao, Vinculo
+
+
+def _cadastrar(client, validade: date) -> int:
+    resposta = client.post("/documentos", json={
+        "titulo": "CNH", "responsavel": "Ana", "filial_id": 1, "tipo_id": 1,
+        "validade": validade.isoformat(),
+    })
+    assert resposta.status_code == 201
+    return resposta.get_json()["id"]
+
+
+def test_remove_documento_com_arquivo_e_vinculo(app, client, monkeypatch):
+    # Token sem janela de releitura: o delta depois do DELETE traz só o tombstone
+    monkeypatch.setattr(logic.alteracoes, "JANELA_TOKEN_SEGUNDOS", 0)
+    hoje = date.today()
+    removido = _cadastrar(client, hoje - timedelta(days=1))
+    mantido = _cadastrar(client, hoje + timedelta(days=200))
+
+    assert client.post(f"/documentos/{removido}/arquivo", data=b"conteudo").status_code == 201
+    for documento_id in (removido, mantido):
+        resposta = client.post("/vinculos", json={
+            "documento_id": documento_id, "tipo_alvo": "MOTORISTA", "alvo_id": "m1",
+        })
+        assert resposta.status_code == 201
+    antes = client.get("/entidades/MOTORISTA/m1/conformidade").get_json()
+    token = client.get("/documentos/alteracoes").get_json()["token"]
+
+    resposta = client.delete(f"/documentos/{removido}")
+
+    assert resposta.status_code == 200, resposta.get_json()
+    with app.app_context():
+        assert db.session.query(Versao).filter_by(documento_id=removido).count() == 0
+        assert db.session.query(Vinculo).filter_by(documento_id=removido).count() == 0
+        rollup = db.session.get(ConformidadeEntidade, ("MOTORISTA", "m1"))
+        assert rollup.total_documentos == 1
+        assert rollup.pior_status == "VIGENTE"
+    assert antes["pior_status"] == "VENCIDO"
+    assert removido in client.get(f"/documentos/alteracoes?desde={token}").get_json()["removidos"]
+
+
+def test_remover_ultimo_documento_apaga_rollup(app, client):
+    documento_id = _cadastrar(client, date.today() + timedelta(days=10))
+    client.post("/vinculos", json={"documento_id": documento_id, "tipo_alvo": "VEICULO", "alvo_id": "v1"})
+
+    assert client.delete(f"/documentos/{documento_id}").status_code == 200
+    with app.app_context():
+        assert db.session.get(ConformidadeEntidade, ("VEICULO", "v1")) is None
+
+
+def test_remove_documento_com_arquivo_pela_app_asgi(app, client):
+    from starlette.testclient import TestClient
+
+    import app_asgi
+
+    documento_id = _cadastrar(client, date.today() + timedelta(days=30))
+    assert client.post(f"/documentos/{documento_id}/arquivo", data=b"asgi").status_code == 201
+    client.post("/vinculos", json={"documento_id": documento_id, "tipo_alvo": "LOCAL", "alvo_id": "l1"})
+
+    with TestClient(app_asgi.app) as asgi:
+        resposta = asgi.delete(f"/documentos/{documento_id}")
+
+    assert resposta.status_code == 200, resposta.json()
+    with app.app_context():
+        assert db.session.get(ConformidadeEntidade, ("LOCAL", "l1")) is None
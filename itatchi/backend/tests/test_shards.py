@@ -0,0 +1,158 @@
+# itatchi/backend/tests/test_shards.py
+# Sharding por filial: ids por faixa, referências replicadas, feed com token composto e rotas por id.
+
+import asyncio
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+
+from database.connection import db
+from database.shards import FAIXA_IDS, mapa_shards
+from logic.eventos import barramento
+from models.models import Filial, TipoDocumento
+
+
+@pytest.fixture
+def sharding(app, monkeypatch, tmp_path):
+    """Filial 2 em um shard SQLite próprio; o banco dos testes é o shard padrão."""
+    with app.app_context():
+        if db.session.get(Filial, 2) is None:
+            db.session.add(Filial(id=2, nome="Campinas", codigo="CP01"))
+            db.session.commit()
+    monkeypatch.setenv("SHARD_MAP", f'{{"2": "sqlite:///{os.path.join(tmp_path, "filial2.db")}"}}')
+    mapa_shards.init_app(app)
+    yield mapa_shards
+    # Volta ao modo sem sharding para os demais testes
+    for engine in mapa_shards.engines():
+        engine.dispose()
+    mapa_shards.__init__()
+
+
+def _cadastrar(client, filial_id: int, dias: int) -> int:
+    resposta = client.post("/documentos", json={
+        "titulo": f"Doc filial {filial_id}", "responsavel": "Ana", "filial_id": filial_id, "tipo_id": 1,
+        "validade": (date.today() + timedelta(days=dias)).isoformat(),
+    })
+    assert resposta.status_code == 201, resposta.get_json()
+    return resposta.get_json()["id"]
+
+
+def test_ids_por_faixa_e_referencias_replicadas(sharding, client):
+    with sharding.sessao_da_filial(2) as sessao:
+        assert sessao.get(TipoDocumento, 1) is not None
+        assert sessao.get(Filial, 2) is not None
+
+    local = _cadastrar(client, 1, 10)
+    remoto = _cadastrar(client, 2, 10)
+
+    assert local < FAIXA_IDS <= remoto
+
+
+def test_feed_e_rotas_por_id_no_shard_dono(sharding, client):
+    feed = client.get("/documentos/alteracoes").get_json()
+    assert isinstance(feed["token"], str) and len(feed["token"].split("-")) == 2
+
+    remoto = _cadastrar(client, 2, -1)
+    assert client.post(f"/documentos/{remoto}/arquivo", data=b"pdf").status_code == 201
+    assert client.get(f"/documentos/{remoto}/versoes").get_json()[0]["numero_versao"] == "2.0.0"
+    assert client.post("/vinculos", json={
+        "documento_id": remoto, "tipo_alvo": "VEICULO", "alvo_id": "v-shard",
+    }).status_code == 201
+    assert client.get("/entidades/VEICULO/v-shard/conformidade").get_json()["pior_status"] == "VENCIDO"
+
+    # O feed repassa o token composto e recebe o documento do outro shard
+    ids = {d["id"] for d in client.get("/documentos/alteracoes").get_json()["documentos"]}
+    assert remoto in ids
+
+    assert client.delete(f"/documentos/{remoto}").status_code == 200
+    assert client.get(f"/documentos/{remoto}/arquivo").status_code == 404
+    assert client.get("/entidades/VEICULO/v-shard/conformidade").status_code == 404
+
+
+def test_busca_em_todos_os_shards(sharding, client):
+    for filial_id, titulo in ((1, "Alvara sanitario local"), (2, "Alvara sanitario remoto"), (2, "Alvara bombeiros")):
+        resposta = client.post("/documentos", json={
+            "titulo": titulo, "responsavel": "Ana", "filial_id": filial_id, "tipo_id": 1,
+        })
+        assert resposta.status_code == 201
+
+    resposta = client.get("/documentos/busca?q=alvara sanitario&por_pagina=1").get_json()
+    assert resposta["total"] >= 2
+    assert len(resposta["resultados"]) == 1
+
+    todos = client.get("/documentos/busca?q=alvara sanitario&por_pagina=100").get_json()["resultados"]
+    titulos = {r["titulo"] for r in todos}
+    assert {"Alvara sanitario local", "Alvara sanitario remoto"} <= titulos
+    assert any(r["id"] >= FAIXA_IDS for r in todos)
+    relevancias = [r["relevancia"] for r in todos]
+    assert relevancias == sorted(relevancias, reverse=True)
+
+
+@pytest.mark.parametrize("consulta", ["por_pagina=0&pagina=1", "por_pagina=-5&pagina=1", "por_pagina=x"])
+def test_por_pagina_invalido(client, consulta):
+    assert client.get(f"/documentos?{consulta}").status_code == 400
+
+
+@pytest.mark.parametrize("filial_id", ["abc", 0, -1, None])
+def test_filial_invalida(client, filial_id):
+    resposta = client.post("/documentos", json={
+        "titulo": "X", "responsavel": "Ana", "filial_id": filial_id, "tipo_id": 1,
+    })
+    assert resposta.status_code == 400
+
+
+async def _esperar_evento_sse(app_asgi, client, filial_id: int) -> dict:
+    """
+    Abre GET /eventos direto na app ASGI (o TestClient só devolve a resposta
+    inteira), cadastra um documento na filial e espera o seu documento_criado.
+    """
+    recebidos: asyncio.Queue = asyncio.Queue()
+    desconectar = asyncio.Event()
+
+    async def receive() -> dict:
+        await desconectar.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(mensagem: dict) -> None:
+        await recebidos.put(mensagem)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/eventos", "raw_path": b"/eventos", "root_path": "",
+        "query_string": b"", "headers": [], "client": ("testclient", 1), "server": ("testserver", 80),
+    }
+    tarefa = asyncio.create_task(app_asgi(scope, receive, send))
+    try:
+        inicio = await asyncio.wait_for(recebidos.get(), 10)
+        assert inicio["type"] == "http.response.start" and inicio["status"] == 200
+        # Primeiro pedaço (retry) só sai depois da assinatura e da posição inicial dos shards
+        assert b"retry:" in (await asyncio.wait_for(recebidos.get(), 10))["body"]
+
+        documento_id = await asyncio.to_thread(_cadastrar, client, filial_id, 10)
+        while True:
+            corpo = (await asyncio.wait_for(recebidos.get(), 10))["body"].decode()
+            for bloco in corpo.split("\n\n"):
+                linhas = dict(linha.split(": ", 1) for linha in bloco.splitlines() if ": " in linha)
+                if linhas.get("event") != "documento_criado":
+                    continue
+                evento = json.loads(linhas["data"])
+                if evento["id"] == documento_id:
+                    return {**evento, "sse_id": linhas["id"]}
+    finally:
+        desconectar.set()
+        await asyncio.wait_for(tarefa, 10)
+
+
+def test_eventos_do_shard_remoto_no_sse_assincrono(sharding, client, monkeypatch):
+    from app_asgi import app as app_asgi
+
+    monkeypatch.setattr(barramento, "intervalo", 0.1)
+    evento = asyncio.run(_esperar_evento_sse(app_asgi, client, 2))
+
+    # Evento do log do shard 2; o id SSE é o cursor composto (um seq por shard)
+    assert evento["shard"] == 1 and evento["id"] >= FAIXA_IDS
+    cursor = evento["sse_id"].split("-")
+    assert len(cursor) == 2 and int(cursor[1]) == evento["seq"]
+    assert barramento.total_assinantes() == 0
@@ -0,0 +1,39 @@
+# itatchi/backend/tests/test_tendencias.py
+# Fotografia diária: datas sem documentos ficam marcadas e o backfill não as recalcula.
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from database.connection import db
+from logic.tendencias import fotografar, trava_fotografia
+from models.models import StatusDiario, StatusDiarioData
+
+
+@pytest.fixture
+def sessao():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    db.metadata.create_all(engine)
+    with Session(engine) as sessao:
+        yield sessao
+    engine.dispose()
+
+
+def test_backfill_de_dias_vazios_roda_uma_vez(sessao):
+    hoje = date.today()
+
+    assert fotografar(sessao, hoje, 7, 30) == 8
+    assert sessao.execute(select(func.count()).select_from(StatusDiario)).scalar() == 0
+    assert sessao.execute(select(func.count()).select_from(StatusDiarioData)).scalar() == 8
+
+    # Rodadas seguintes regravam só hoje; na virada, só o dia novo falta
+    assert fotografar(sessao, hoje, 7, 30) == 1
+    assert fotografar(sessao, hoje + timedelta(days=1), 7, 30) == 1
+
+
+def test_trava_fora_do_mysql_sempre_obtida(sessao):
+    with trava_fotografia(sessao) as obtida:
+        assert obtida is True
@@ -5,14 +5,19 @@ import streamlit as st
 import requests
 from datetime import date, datetime
 import calendar
-import pandas as pd
 import math
-from io import BytesIO
 # Importa 'os' apenas se for estritamente necessário para outras partes do código
-from typing import List, Dict, Any, Optional, Generator, Tuple
+from typing import List, Dict, Any, Optional, Generator, Tuple, TYPE_CHECKING
+
+# pandas só é importado quando há resultado de busca (a primeira tela abre sem ele)
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Importa helpers
 from utils.ui_helpers import load_global_style, load_image_b64, setup_logo
+from utils.sincronizacao import sincronizar_documentos
+from utils.relatorios import acompanhar_relatorio, baixar_relatorio, submeter_relatorio
+from utils.referencias import obter_referencias, opcoes_categorias
 
 # 1. Configura a página (incluindo st.set_page_config e st.logo)
 setup_logo() 
@@ -40,17 +45,18 @@ col_cat, col_inicio, col_fim, col_extra, col_buscar, col_rel = st.columns(
     [2, 2, 2, 2, 1, 1]
 )
 
-CATEGORIAS: List[str] = [
-    "Todas",
-    "Regulatórios",
-    "Qualidade",
-    "Pessoas",
-    "Veículos",
-    "Locais",
-]
+# Categorias cadastradas no backend (cache por processo, revalidado por ETag)
+CATEGORIAS: List[str] = opcoes_categorias(obter_referencias(API_URL))
 
 categoria: str = col_cat.selectbox("Categoria", options=CATEGORIAS, index=0)
 
+# Sufixo do nome do arquivo do relatório conforme a opção "Algo a mais?"
+FILTRO_SLUG: Dict[str, str] = {
+    "Todos": "todos",
+    "Somente próximos ao vencimento": "a_vencer",
+    "Somente vencidos": "vencidos",
+}
+
 hoje: date = date.today()
 primeiro_dia_mes: date = hoje.replace(day=1)
 ultimo_dia_mes: date = date(
@@ -82,11 +88,11 @@ relatorio_placeholder = st.empty()
 # ==================================
 # 2. ESTADO GLOBAL (SESSION_STATE)
 # ==================================
-if "docs_relacionados" not in st.session_state:
-    st.session_state["docs_relacionados"] = []
-
-if "docs_proximos" not in st.session_state:
-    st.session_state["docs_proximos"] = []
+# Resultado da última busca: DataFrames já ordenados e dias com alerta por mês,
+# montados uma vez por busca (paginação e troca de mês só fatiam/renderizam)
+st.session_state.setdefault("df_relacionados", None)
+st.session_state.setdefault("df_proximos", None)
+st.session_state.setdefault("dias_alerta_por_mes", {})
 
 # Páginas de paginação
 st.session_state.setdefault("relacionados_page", 1)
@@ -98,79 +104,83 @@ st.session_state.setdefault("cal_page_home", 0)
 # ==================================
 
 def buscar_alertas():
-    """Chama o endpoint /home com filtros de categoria e período para popular as tabelas e o calendário."""
-    params: Dict[str, str] = {
-        "inicio": data_inicio.isoformat(),
-        "fim": data_fim.isoformat(),
-    }
-    if categoria != "Todas":
-        params["categoria"] = categoria
+    """
+    Filtra a cópia local de documentos por categoria e período para popular as tabelas e o calendário.
 
+    A cópia local é sincronizada com o backend por deltas (/documentos/alteracoes),
+    então uma nova busca não baixa novamente os documentos que não mudaram.
+    """
     try:
-        resp = requests.get(f"{API_URL}/home", params=params, timeout=10)
-
-        if resp.status_code == 200:
-            data: Dict[str, List[Dict[str, Any]]] = resp.json()
-            
-            docs_rel_all: List[Dict[str, Any]] = data.get("documentos_relacionados", [])
-            docs_prox_all: List[Dict[str, Any]] = data.get("proximos_vencimento", [])
-
-            # --- PRIORIDADE DE STATUS PARA ORDENAÇÃO ---
-            prioridade_status: Dict[str, int] = {"VENCIDO": 1, "A_VENCER": 2}
-
-            def sort_key(doc: Dict[str, Any]) -> Tuple[int, str]:
-                """Chave de ordenação: por status prioritário, depois por data de validade."""
-                status: Optional[str] = doc.get("status")
-                validade: str = doc.get("validade") or "9999-12-31"
-                return (prioridade_status.get(status, 99), validade)
-
-            # 1. Próximos ao vencimento: SEMPRE mostra todos (A_VENCER + VENCIDO), ordenados
-            docs_prox_ordenados: List[Dict[str, Any]] = sorted(docs_prox_all, key=sort_key)
-
-            # 2. Documentos relacionados: FILTRADOS conforme a opção "Algo a mais?"
-            if extra_opcao == "Todos":
-                docs_rel_filtrados: List[Dict[str, Any]] = sorted(docs_rel_all, key=sort_key)
-            elif extra_opcao == "Somente próximos ao vencimento":
-                docs_rel_filtrados = [
-                    d for d in docs_rel_all if d.get("status") == "A_VENCER"
-                ]
-                docs_rel_filtrados = sorted(docs_rel_filtrados, key=sort_key)
-            elif extra_opcao == "Somente vencidos":
-                docs_rel_filtrados = [
-                    d for d in docs_rel_all if d.get("status") == "VENCIDO"
-                ]
-                docs_rel_filtrados = sorted(docs_rel_filtrados, key=sort_key)
-            else:
-                docs_rel_filtrados = sorted(docs_rel_all, key=sort_key)
-
-            # Guarda nas variáveis de sessão e reseta paginações
-            st.session_state["docs_relacionados"] = docs_rel_filtrados
-            st.session_state["docs_proximos"] = docs_prox_ordenados
-            st.session_state["relacionados_page"] = 1
-            st.session_state["proximos_page"] = 1
-            st.session_state["cal_page_home"] = 0
-
-            st.success("Busca realizada com sucesso.")
-        else:
-            try:
-                payload: Dict[str, str] = resp.json()
-                msg: str = payload.get("erro", "Resposta JSON sem campo 'erro'.")
-            except ValueError:
-                msg = resp.text or "Resposta não JSON do servidor."
-
-            st.error(f"Erro ao buscar alertas (HTTP {resp.status_code}): {msg}")
-
+        documentos: Dict[int, Dict[str, Any]] = sincronizar_documentos(API_URL)
     except requests.exceptions.ConnectionError:
         st.error("Não foi possível conectar ao backend. Verifique se o Flask está rodando.")
+        return
+    except requests.exceptions.RequestException as e:
+        st.error(f"Erro ao buscar alertas: {e}")
+        return
     except Exception as e:
         st.error(f"Ocorreu um erro inesperado na busca: {e}")
+        return
 
+    # Mesmos critérios do endpoint /home: validade dentro do período e categoria do tipo
+    inicio_iso: str = data_inicio.isoformat()
+    fim_iso: str = data_fim.isoformat()
 
-def mostrar_tabela_paginada(df: pd.DataFrame, colunas: List[str], chave_prefixo: str, titulo: str):
+    docs_rel_all: List[Dict[str, Any]] = [
+        d for d in documentos.values()
+        if d.get("validade") and inicio_iso <= d["validade"] <= fim_iso
+        and (categoria == "Todas" or d.get("categoria") == categoria)
+    ]
+    docs_prox_all: List[Dict[str, Any]] = [
+        d for d in docs_rel_all if d.get("status") in ("A_VENCER", "VENCIDO")
+    ]
+
+    # --- PRIORIDADE DE STATUS PARA ORDENAÇÃO ---
+    prioridade_status: Dict[str, int] = {"VENCIDO": 1, "A_VENCER": 2}
+
+    def sort_key(doc: Dict[str, Any]) -> Tuple[int, str]:
+        """Chave de ordenação: por status prioritário, depois por data de validade."""
+        status: Optional[str] = doc.get("status")
+        validade: str = doc.get("validade") or "9999-12-31"
+        return (prioridade_status.get(status, 99), validade)
+
+    # 1. Próximos ao vencimento: SEMPRE mostra todos (A_VENCER + VENCIDO), ordenados
+    docs_prox_ordenados: List[Dict[str, Any]] = sorted(docs_prox_all, key=sort_key)
+
+    # 2. Documentos relacionados: FILTRADOS conforme a opção "Algo a mais?"
+    if extra_opcao == "Todos":
+        docs_rel_filtrados: List[Dict[str, Any]] = sorted(docs_rel_all, key=sort_key)
+    elif extra_opcao == "Somente próximos ao vencimento":
+        docs_rel_filtrados = [
+            d for d in docs_rel_all if d.get("status") == "A_VENCER"
+        ]
+        docs_rel_filtrados = sorted(docs_rel_filtrados, key=sort_key)
+    elif extra_opcao == "Somente vencidos":
+        docs_rel_filtrados = [
+            d for d in docs_rel_all if d.get("status") == "VENCIDO"
+        ]
+        docs_rel_filtrados = sorted(docs_rel_filtrados, key=sort_key)
+    else:
+        docs_rel_filtrados = sorted(docs_rel_all, key=sort_key)
+
+    import pandas as pd
+
+    # Guarda nas variáveis de sessão (DataFrames e dias do calendário, uma vez por busca) e reseta paginações
+    st.session_state["df_relacionados"] = pd.DataFrame(docs_rel_filtrados)
+    st.session_state["df_proximos"] = pd.DataFrame(docs_prox_ordenados)
+    st.session_state["dias_alerta_por_mes"] = agrupar_dias_alerta(docs_prox_ordenados)
+    st.session_state["relacionados_page"] = 1
+    st.session_state["proximos_page"] = 1
+    st.session_state["cal_page_home"] = 0
+
+    st.success("Busca realizada com sucesso.")
+
+
+def mostrar_tabela_paginada(df: Optional["pd.DataFrame"], colunas: List[str], chave_prefixo: str, titulo: str):
     """Renderiza tabela do Pandas com controles de paginação para 10 itens por página."""
     st.markdown(f"### {titulo}")
 
-    if df.empty:
+    if df is None or df.empty:
         st.info("Nenhum documento encontrado.")
         return
 
@@ -194,7 +204,7 @@ def mostrar_tabela_paginada(df: pd.DataFrame, colunas: List[str], chave_prefixo:
     # Aplica a paginação ao DataFrame
     start: int = (current_page - 1) * page_size
     end: int = start + page_size
-    df_page: pd.DataFrame = df.iloc[start:end]
+    df_page: "pd.DataFrame" = df.iloc[start:end]
 
     col_info.markdown(
         f"Página **{current_page}** de **{total_pages}** "
@@ -221,7 +231,62 @@ def iterar_meses(inicio: date, fim: date) -> Generator[Tuple[int, int], None, No
             mes += 1
 
 
-def desenhar_calendario(documentos_prox: List[Dict[str, Any]], inicio: date, fim: date):
+def agrupar_dias_alerta(documentos_prox: List[Dict[str, Any]]) -> Dict[Tuple[int, int], Tuple[int, ...]]:
+    """(ano, mês) -> dias (ordenados) com documentos próximos/vencidos. Calculado uma vez por busca."""
+    dias: Dict[Tuple[int, int], set] = {}
+    for d in documentos_prox:
+        validade_str: Optional[str] = d.get("validade")
+        if not validade_str:
+            continue
+        try:
+            dt_validade: date = datetime.fromisoformat(validade_str).date()
+        except (ValueError, TypeError):
+            continue
+        dias.setdefault((dt_validade.year, dt_validade.month), set()).add(dt_validade.day)
+    return {mes: tuple(sorted(d)) for mes, d in dias.items()}
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def montar_calendario_html(ano: int, mes: int, dias_com_alerta: Tuple[int, ...]) -> str:
+    """
+    HTML da tabela do mês com os dias de alerta marcados.
+    Cacheado por (mês, conjunto de dias): o mesmo mês com os mesmos alertas não é remontado.
+    """
+    # Usa o ícone Base64 se carregado, senão usa o fallback ⚠
+    if ALERT_ICON_B64:
+        marcador = f'<img src="data:image/png;base64,{ALERT_ICON_B64}" class="alert-icon" />'
+    else:
+        marcador = '<span class="alert-fallback">⚠</span>'
+
+    alertas = set(dias_com_alerta)
+    linhas: List[str] = []
+    for semana in calendar.monthcalendar(ano, mes):
+        tds: List[str] = []
+        for dia in semana:
+            if dia == 0:
+                tds.append('<td class="empty-cell"></td>')
+            elif dia in alertas:
+                tds.append(f'<td><div class="calendar-marker-cell">{marcador}<span>{dia}</span></div></td>')
+            else:
+                tds.append(f"<td><span class='day-number'>{dia}</span></td>")
+        linhas.append(f"<tr>{''.join(tds)}</tr>")
+
+    nomes_colunas: List[str] = ["Dom", "Seg", "Ter", "Qua", "Qui", "Sex", "Sáb"]
+    thead: str = "".join(f"<th>{c}</th>" for c in nomes_colunas)
+
+    return f"""
+    <table class="calendar-table">
+        <thead>
+            <tr>{thead}</tr>
+        </thead>
+        <tbody>
+            {''.join(linhas)}
+        </tbody>
+    </table>
+    """
+
+
+def desenhar_calendario(dias_alerta_por_mes: Dict[Tuple[int, int], Tuple[int, ...]], inicio: date, fim: date):
     """
     Desenha calendário interativo com paginação de mês.
     Marca dias com documentos próximos/vencidos usando o ícone de alerta.
@@ -236,7 +301,7 @@ def desenhar_calendario(documentos_prox: List[Dict[str, Any]], inicio: date, fim
     # Controles de paginação de mês
     col_prev, col_label, col_spacer, col_next = st.columns([1, 4, 3, 1])
 
-    idx: int = st.session_state.get("cal_page_home", 0)
+    idx: int = min(st.session_state.get("cal_page_home", 0), len(meses) - 1)
 
     with col_prev:
         if st.button("◀ mês", key="cal_home_prev") and idx > 0:
@@ -255,66 +320,7 @@ def desenhar_calendario(documentos_prox: List[Dict[str, Any]], inicio: date, fim
         unsafe_allow_html=True,
     )
 
-    # 1. Descobre dias com alerta nesse mês
-    dias_com_alerta: set[int] = set()
-    for d in documentos_prox:
-        validade_str: Optional[str] = d.get("validade")
-        if not validade_str:
-            continue
-        try:
-            dt_validade: date = datetime.fromisoformat(validade_str).date()
-        except (ValueError, TypeError):
-            continue
-
-        if dt_validade.year == ano and dt_validade.month == mes:
-            dias_com_alerta.add(dt_validade.day)
-
-    # 2. Monta matriz de células em HTML
-    matriz: List[List[int]] = calendar.monthcalendar(ano, mes)
-    linhas_html: str = ""
-    for semana in matriz:
-        tds: str = ""
-        for dia in semana:
-            if dia == 0:
-                tds += '<td class="empty-cell"></td>'
-            else:
-                if dia in dias_com_alerta:
-                    # Usa o ícone Base64 se carregado, senão usa o fallback ⚠
-                    if ALERT_ICON_B64:
-                        cell_content = f"""
-                        <div class="calendar-marker-cell">
-                            <img src="data:image/png;base64,{ALERT_ICON_B64}" class="alert-icon" />
-                            <span>{dia}</span>
-                        </div>
-                        """
-                    else:
-                        cell_content = f"""
-                        <div class="calendar-marker-cell">
-                            <span class="alert-fallback">⚠</span>
-                            <span>{dia}</span>
-                        </div>
-                        """
-                else:
-                    cell_content = f"<span class='day-number'>{dia}</span>"
-
-                tds += f"<td>{cell_content}</td>"
-        linhas_html += f"<tr>{tds}</tr>"
-
-    nomes_colunas: List[str] = ["Dom", "Seg", "Ter", "Qua", "Qui", "Sex", "Sáb"]
-    thead: str = "".join(f"<th>{c}</th>" for c in nomes_colunas)
-
-    tabela_html: str = f"""
-    <table class="calendar-table">
-        <thead>
-            <tr>{thead}</tr>
-        </thead>
-        <tbody>
-            {linhas_html}
-        </tbody>
-    </table>
-    """
-
-    st.markdown(tabela_html, unsafe_allow_html=True)
+    st.markdown(montar_calendario_html(ano, mes, dias_alerta_por_mes.get((ano, mes), ())), unsafe_allow_html=True)
     st.caption(
         "Dias marcados com o ícone indicam documentos próximos do vencimento ou já vencidos no período selecionado."
     )
@@ -332,19 +338,16 @@ col_esq, col_dir = st.columns([1, 2])
 
 # -------- COLUNA ESQUERDA (Tabelas) --------
 with col_esq:
-    docs_rel: List[Dict[str, Any]] = st.session_state["docs_relacionados"]
-    docs_prox: List[Dict[str, Any]] = st.session_state["docs_proximos"]
-
-    df_rel: pd.DataFrame = pd.DataFrame(docs_rel)
-    df_prox: pd.DataFrame = pd.DataFrame(docs_prox)
+    df_rel: Optional["pd.DataFrame"] = st.session_state["df_relacionados"]
+    df_prox: Optional["pd.DataFrame"] = st.session_state["df_proximos"]
 
     colunas_rel: List[str] = [
         c for c in ["titulo", "responsavel", "validade", "status"]
-        if c in df_rel.columns
+        if df_rel is not None and c in df_rel.columns
     ]
     colunas_prox: List[str] = [
         c for c in ["titulo", "validade", "status"]
-        if c in df_prox.columns
+        if df_prox is not None and c in df_prox.columns
     ]
 
     mostrar_tabela_paginada(
@@ -360,7 +363,7 @@ with col_esq:
 # -------- COLUNA DIREITA (CALENDÁRIO) --------
 with col_dir:
     desenhar_calendario(
-        st.session_state["docs_proximos"],
+        st.session_state["dias_alerta_por_mes"],
         data_inicio,
         data_fim
     )
@@ -368,60 +371,73 @@ with col_dir:
 # ==================================
 # 6. RELATÓRIO EM EXCEL
 # ==================================
-if botao_relatorio:
-    docs_rel: List[Dict[str, Any]] = st.session_state["docs_relacionados"]
-    docs_prox: List[Dict[str, Any]] = st.session_state["docs_proximos"]
-
-    # Sufixo do nome do arquivo conforme filtro
-    filtro_slug: str = {
-        "Todos": "todos",
-        "Somente próximos ao vencimento": "a_vencer",
-        "Somente vencidos": "vencidos",
-    }.get(extra_opcao, "todos")
+# O backend gera a planilha em segundo plano; a página só acompanha o job.
+# O id do job fica na sessão e o .xlsx baixado fica em cache por job: reruns (ex: clique
+# em "Baixar" ou na paginação) não geram, não consultam e não baixam de novo. O backend
+# só é consultado ao gerar o relatório ou no botão "Atualizar", e cada consulta espera no
+# máximo ESPERA_RELATORIO_SEGUNDOS (relatórios em cache ou pequenos terminam nela).
+ESPERA_RELATORIO_SEGUNDOS: float = 3.0
+relatorio_atualizar: bool = bool(st.session_state.get("relatorio_atualizar"))
 
+if botao_relatorio:
+    # Relacionados (conforme o filtro) + próximos ao vencimento (sempre todos do período)
+    status_relatorio: List[str] = [] if extra_opcao == "Todos" else ["A_VENCER", "VENCIDO"]
+    try:
+        job_novo: Dict[str, Any] = submeter_relatorio(API_URL, {
+            "categoria": categoria,
+            "inicio": data_inicio.isoformat(),
+            "fim": data_fim.isoformat(),
+            "status": status_relatorio,
+        })
+        st.session_state["relatorio_job"] = job_novo["id"]
+        st.session_state["relatorio_nome"] = (
+            f"relatorio_alertas_{FILTRO_SLUG.get(extra_opcao, 'todos')}_"
+            f"{data_inicio.strftime('%Y%m%d')}_a_{data_fim.strftime('%Y%m%d')}.xlsx"
+        )
+    except requests.exceptions.RequestException as e:
+        relatorio_placeholder.error(f"Erro ao solicitar o relatório: {e}")
+
+job_id: Optional[str] = st.session_state.get("relatorio_job")
+arquivo_cache: Dict[str, Any] = st.session_state.get("relatorio_arquivo") or {}
+
+if job_id:
     with relatorio_placeholder.container():
-        if not docs_rel and not docs_prox:
-            st.warning("Não há documentos para gerar relatório.")
-        else:
-            # Junta relacionados (já filtrados) + próximos (sempre todos do período)
-            todos: List[Dict[str, Any]] = (docs_rel or []) + (docs_prox or [])
-
-            # Remove duplicados por 'id', se existir (para evitar documentos em ambas as listas)
-            if todos and isinstance(todos[0], dict) and "id" in todos[0]:
-                dedup: Dict[Optional[int], Dict[str, Any]] = {}
-                for d in todos:
-                    did: Optional[int] = d.get("id")
-                    if did is not None and did not in dedup:
-                        dedup[did] = d
-                todos_final: List[Dict[str, Any]] = list(dedup.values())
-            else:
-                todos_final = todos
-
-            # Ordena pelo mesmo critério de prioridade da tela
-            prioridade_status: Dict[str, int] = {"VENCIDO": 1, "A_VENCER": 2}
+        if arquivo_cache.get("job") != job_id and (botao_relatorio or relatorio_atualizar):
+            barra = st.progress(0, text="Relatório na fila...")
 
-            def sort_key(doc: Dict[str, Any]) -> Tuple[int, str]:
-                status: Optional[str] = doc.get("status")
-                validade: str = doc.get("validade") or "9999-12-31"
-                return (prioridade_status.get(status, 99), validade)
-
-            todos_ordenados: List[Dict[str, Any]] = sorted(todos_final, key=sort_key)
-
-            df_full: pd.DataFrame = pd.DataFrame(todos_ordenados)
-
-            # Cria o buffer de memória para o Excel
-            buffer = BytesIO()
-            with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
-                df_full.to_excel(writer, index=False, sheet_name="Alertas")
-            buffer.seek(0)
+            def mostrar_progresso(job: Dict[str, Any]) -> None:
+                barra.progress(int(job.get("progresso", 0)), text=job.get("etapa") or job["status"])
 
+            try:
+                job_final: Optional[Dict[str, Any]] = acompanhar_relatorio(
+                    API_URL, job_id, mostrar_progresso, espera_max=ESPERA_RELATORIO_SEGUNDOS
+                )
+                if job_final is None:
+                    pass  # Ainda gerando: o aviso com o botão "Atualizar" aparece abaixo
+                elif job_final["status"] == "ERRO":
+                    st.error(f"Falha ao gerar o relatório: {job_final.get('erro')}")
+                    st.session_state.pop("relatorio_job", None)
+                    job_id = None
+                elif not job_final.get("documentos"):
+                    st.warning("Não há documentos para gerar relatório.")
+                    st.session_state.pop("relatorio_job", None)
+                    job_id = None
+                else:
+                    # Um download por job; os reruns seguintes usam os bytes guardados
+                    arquivo_cache = {"job": job_id, "dados": baixar_relatorio(API_URL, job_final)}
+                    st.session_state["relatorio_arquivo"] = arquivo_cache
+            except requests.exceptions.RequestException as e:
+                st.error(f"Erro ao acompanhar o relatório: {e}")
+            barra.empty()
+
+        if job_id and arquivo_cache.get("job") == job_id:
             st.success("Relatório gerado com sucesso! Clique no botão abaixo para baixar o arquivo.")
             st.download_button(
                 label="⬇️ Baixar relatório em Excel (.xlsx)",
-                data=buffer,
-                file_name=(
-                    f"relatorio_alertas_{filtro_slug}_"
-                    f"{data_inicio.strftime('%Y%m%d')}_a_{data_fim.strftime('%Y%m%d')}.xlsx"
-                ),
+                data=arquivo_cache["dados"],
+                file_name=st.session_state.get("relatorio_nome", "relatorio_alertas.xlsx"),
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            )
\ No newline at end of file
+            )
+        elif job_id:
+            st.info("O relatório ainda está sendo gerado. Clique em atualizar em alguns instantes.")
+            st.button("🔄 Atualizar", key="relatorio_atualizar")
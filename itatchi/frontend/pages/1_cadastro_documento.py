@@ -6,7 +6,8 @@ import requests
 from datetime import datetime, date
 from typing import Optional, Dict, Any
 
-from utils.ui_helpers import load_global_style, setup_logo
+from utils.referencias import obter_referencias, opcoes_filiais, opcoes_tipos
+from utils.ui_helpers import cabecalhos_cliente, load_global_style, setup_logo
 
 # --- CONFIGURAÇÃO GLOBAL / CSS E LOGO ---
 setup_logo() 
@@ -15,13 +16,10 @@ load_global_style()
 # URL do Backend Flask no container
 API_URL: str = os.getenv("API_URL", "http://localhost:5000")
 
-# --- Dados Iniciais Mockados (devem ser substituídos por chamadas à API) ---
-OPCOES_FILIAIS: Dict[int, str] = {1: "Matriz São Paulo"} 
-OPCOES_TIPOS: Dict[int, Dict[str, str]] = {
-    1: {"nome": "CNPJ", "categoria": "Regulatórios"},
-    2: {"nome": "ANTT", "categoria": "Veículos"},
-    3: {"nome": "CNH", "categoria": "Pessoas"}
-}
+# --- Dados de referência (cache por processo, revalidado por ETag no /referencias) ---
+referencias: Dict[str, Any] = obter_referencias(API_URL)
+OPCOES_FILIAIS: Dict[int, str] = opcoes_filiais(referencias)
+OPCOES_TIPOS: Dict[int, Dict[str, str]] = opcoes_tipos(referencias)
 
 def formatar_data(data: Optional[date]) -> Optional[str]:
     """Converte um objeto date ou datetime para o formato string YYYY-MM-DD exigido pela API."""
@@ -35,6 +33,10 @@ st.title("Cadastro de Informações")
 st.subheader("Preencha as informações principais para agendar seu lembrete.")
 st.markdown("---")
 
+if not OPCOES_FILIAIS or not OPCOES_TIPOS:
+    st.error("Não foi possível carregar filiais e tipos de documento do backend. Tente novamente em instantes.")
+    st.stop()
+
 with st.form(key='cadastro_documento_form'):
     # Campos Obrigatórios
     st.header("Dados Essenciais")
@@ -68,6 +70,7 @@ with st.form(key='cadastro_documento_form'):
     numero: Optional[str] = col6.text_input("Número do Documento", placeholder="000123/2025")
     orgao_emissor: Optional[str] = col7.text_input("Órgão Emissor", placeholder="Prefeitura de São Paulo")
     caminho_atual: Optional[str] = st.text_input("Caminho do Arquivo Local", placeholder="C:\\docs\\SP01\\Licenca.pdf")
+    arquivo = st.file_uploader("Arquivo do Documento (opcional)", help="O arquivo é enviado ao servidor e fica disponível para todas as filiais.")
     observacoes: Optional[str] = st.text_area("Observações / Anotações")
     
     st.markdown("---")
@@ -96,11 +99,25 @@ if submit_button:
 
         # 3. Chamada à API
         try:
-            response = requests.post(f"{API_URL}/documentos", json=payload)
+            response = requests.post(f"{API_URL}/documentos", json=payload, headers=cabecalhos_cliente())
             
             if response.status_code == 201:
                 data: Dict[str, Any] = response.json()
                 st.success(f"Documento cadastrado com sucesso! ID: {data['id']}. Status Calculado: **{data['status']}**")
+
+                # 4. Envia o arquivo (corpo bruto, lido em blocos pelo backend)
+                if arquivo is not None:
+                    resp_arquivo = requests.post(
+                        f"{API_URL}/documentos/{data['id']}/arquivo",
+                        params={"nome": arquivo.name},
+                        data=arquivo,
+                        headers={"Content-Type": arquivo.type or "application/octet-stream", **cabecalhos_cliente()},
+                    )
+                    if resp_arquivo.status_code == 201:
+                        st.info(f"Arquivo **{arquivo.name}** armazenado (versão {resp_arquivo.json()['versao']}).")
+                    else:
+                        st.warning(f"Documento salvo, mas o envio do arquivo falhou (Código {resp_arquivo.status_code}).")
+
                 st.balloons()
             else:
                 # Trata erros retornados pelo backend (ex: erro de validação de data, 400)
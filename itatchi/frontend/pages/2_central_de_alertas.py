@@ -1,13 +1,18 @@
 # itatchi/frontend/pages/2_central_de_alertas.py
 # Página Streamlit para a Central de Alertas (Visualização de VENCIDO e A_VENCER).
 
+import math
 import os
 import streamlit as st
 import requests
-import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
+
+# pandas só é importado ao montar uma tabela (sem alertas, a página abre sem ele)
+if TYPE_CHECKING:
+    import pandas as pd
 
 from utils.ui_helpers import load_global_style, setup_logo
+from utils.api_documentos import carregar_alertas, iterar_documentos
 
 # --- CONFIGURAÇÃO GLOBAL / CSS E LOGO ---
 setup_logo() 
@@ -17,86 +22,145 @@ API_URL = os.getenv("API_URL", "http://localhost:5000")
 
 st.title("Central de Alertas")
 
+# Linhas por página em cada grupo (só a página exibida vem do backend)
+POR_PAGINA = 25
+
+COLUNAS_EXIBICAO: List[str] = ['titulo', 'validade', 'responsavel', 'filial', 'tipo', 'Status de Alerta']
+
+# Estilo de cada valor da coluna 'Status de Alerta'
+ESTILOS_STATUS: Dict[str, str] = {
+    # Vermelho (Alto Alerta)
+    'VENCIDO': 'background-color: #ffcccc; color: #cc0000; font-weight: bold;',
+    # Amarelo (Alerta Moderado)
+    'A_VENCER': 'background-color: #ffecb3; color: #ff9800; font-weight: bold;',
+}
+
+# Grupo -> chave da página no session_state
+CHAVES_PAGINA: Dict[str, str] = {"VENCIDO": "alertas_pagina_vencidos", "A_VENCER": "alertas_pagina_a_vencer"}
+for _chave in CHAVES_PAGINA.values():
+    st.session_state.setdefault(_chave, 1)
+
 # --- FUNÇÕES DE BUSCA E ESTILO ---
 
-def carregar_documentos(status_lista: List[str]) -> List[Dict[str, Any]]:
-    """Busca documentos na API com base nos status fornecidos."""
-    data_total: List[Dict[str, Any]] = []
-    
+def carregar_grupos() -> Optional[Dict[str, Dict[str, Any]]]:
+    """Busca a página atual de cada grupo (VENCIDO e A_VENCER) com o total do grupo."""
     try:
-        for status in status_lista:
-            # Chama a API /documentos com o filtro de status
-            response = requests.get(f"{API_URL}/documentos", params={'status': status})
-            
-            if response.status_code == 200:
-                data = response.json()
-                data_total.extend(data)
-            else:
-                st.error(f"Erro ao buscar documentos {status} (Código {response.status_code}).")
-                
-        return data_total
-            
+        return carregar_alertas(
+            API_URL,
+            pagina_vencidos=st.session_state[CHAVES_PAGINA["VENCIDO"]],
+            pagina_a_vencer=st.session_state[CHAVES_PAGINA["A_VENCER"]],
+            por_pagina=POR_PAGINA,
+        )
     except requests.exceptions.ConnectionError:
         st.error("Erro de Conexão. Verifique se o Backend Flask está rodando em http://localhost:5000.")
-        return []
-
-def style_status(val: str) -> str:
-    """Função de estilo Pandas para aplicar cores à coluna 'Status de Alerta'."""
-    if val == 'VENCIDO':
-        # Vermelho (Alto Alerta)
-        return 'background-color: #ffcccc; color: #cc0000; font-weight: bold;' 
-    elif val == 'A_VENCER':
-        # Amarelo (Alerta Moderado)
-        return 'background-color: #ffecb3; color: #ff9800; font-weight: bold;' 
-    return ''
+    except requests.exceptions.RequestException as e:
+        st.error(f"Erro ao carregar alertas: {e}")
+    return None
 
-# --- LÓGICA PRINCIPAL ---
+def estilo_status(coluna: "pd.Series") -> "pd.Series":
+    """Estilo da coluna 'Status de Alerta' inteira de uma vez (map vetorizado, sem função por célula)."""
+    return coluna.map(ESTILOS_STATUS).fillna('')
 
-# 1. Carrega todos os documentos críticos
-documentos_criticos = carregar_documentos(['A_VENCER', 'VENCIDO'])
-
-if documentos_criticos:
-    df = pd.DataFrame(documentos_criticos)
-    
-    df = df.rename(columns={'status': 'Status de Alerta'})
-    
-    # 2. Define a prioridade e ordena: VENCIDO (1) > A_VENCER (2)
-    df['prioridade'] = df['Status de Alerta'].apply(lambda x: 1 if x == 'VENCIDO' else 2)
-    df = df.sort_values(by=['prioridade', 'validade'], ascending=[True, True])
-    
-    # 3. Separa DataFrames e define colunas de exibição
-    vencidos = df[df['Status de Alerta'] == 'VENCIDO'].drop(columns=['prioridade'])
-    a_vencer = df[df['Status de Alerta'] == 'A_VENCER'].drop(columns=['prioridade'])
-    
-    colunas_exibicao = ['titulo', 'validade', 'responsavel', 'filial', 'tipo', 'Status de Alerta']
-
-    # Seção 1: Documentos Vencidos
-    st.header("Documentos Vencidos")
-    if not vencidos.empty:
-        st.warning(f"**{len(vencidos)} documento(s) está(ão) VENCIDO(S)!** ")
-        st.dataframe(
-            vencidos[colunas_exibicao]
-                .style.applymap(style_status, subset=['Status de Alerta']),
-            use_container_width=True,
-            hide_index=True
-        )
+def mostrar_grupo(grupo: Dict[str, Any], status: str) -> None:
+    """Tabela da página atual do grupo, com navegação ◀ ▶ (cada clique busca só a nova página)."""
+    chave: str = CHAVES_PAGINA[status]
+    total_paginas: int = max(1, math.ceil(grupo["total"] / POR_PAGINA))
+    pagina: int = min(grupo["pagina"], total_paginas)
+
+    col_prev, col_info, col_next = st.columns([1, 4, 1])
+    if col_prev.button("◀", key=f"{chave}_prev", disabled=pagina <= 1):
+        st.session_state[chave] = pagina - 1
+        st.rerun()
+    if col_next.button("▶", key=f"{chave}_next", disabled=pagina >= total_paginas):
+        st.session_state[chave] = pagina + 1
+        st.rerun()
+    col_info.markdown(f"Página **{pagina}** de **{total_paginas}** (total de {grupo['total']} documentos).")
+
+    import pandas as pd
+    df = pd.DataFrame(grupo["itens"]).rename(columns={'status': 'Status de Alerta'})
+    st.dataframe(
+        df[COLUNAS_EXIBICAO].style.apply(estilo_status, subset=['Status de Alerta']),
+        use_container_width=True,
+        hide_index=True
+    )
+
+def mostrar_listagem_completa(titulo: str) -> None:
+    """
+    Exibe todos os documentos (filtrados por título) à medida que chegam do backend:
+    cada lote é acrescentado à tabela (add_rows), sem esperar o fim da transmissão.
+    """
+    import pandas as pd
+
+    LOTE = 500
+    tabela = None
+    lote: List[Dict[str, Any]] = []
+    total = 0
+
+    def descarregar() -> None:
+        nonlocal tabela
+        df_lote = pd.DataFrame(lote)
+        if tabela is None:
+            tabela = st.dataframe(df_lote, use_container_width=True, hide_index=True)
+        else:
+            tabela.add_rows(df_lote)
+        lote.clear()
+
+    try:
+        for doc in iterar_documentos(API_URL, titulo=titulo or None):
+            lote.append(doc)
+            total += 1
+            if len(lote) >= LOTE:
+                descarregar()
+        if lote:
+            descarregar()
+    except requests.exceptions.RequestException as e:
+        st.error(f"Erro ao carregar a listagem: {e}")
+        return
+
+    if total:
+        st.caption(f"{total} documento(s).")
     else:
-        st.success("Nenhum documento encontrado com status VENCIDO. ")
-
-    st.markdown("---")
-
-    # Seção 2: Próximos Vencimentos
-    st.header("Próximos Vencimentos")
-    if not a_vencer.empty:
-        st.info(f"**{len(a_vencer)} documento(s)** próximo(s) de vencer. ")
-        st.dataframe(
-            a_vencer[colunas_exibicao]
-                .style.applymap(style_status, subset=['Status de Alerta']),
-            use_container_width=True,
-            hide_index=True
-        )
+        st.info("Nenhum documento encontrado.")
+
+# --- LÓGICA PRINCIPAL ---
+
+# 1. Uma página de cada grupo, já ordenada por validade no backend
+grupos = carregar_grupos()
+
+if grupos is not None:
+    vencidos, a_vencer = grupos["VENCIDO"], grupos["A_VENCER"]
+
+    # Página guardada além do fim (ex: documentos renovados desde a última visita): volta ao início
+    for status, grupo in grupos.items():
+        if grupo["total"] and not grupo["itens"]:
+            st.session_state[CHAVES_PAGINA[status]] = 1
+            st.rerun()
+
+    if not vencidos["total"] and not a_vencer["total"]:
+        st.success("Tudo certo! Não há alertas de vencimento.")
     else:
-        st.info("Nenhum documento encontrado com status A VENCER. ")
+        # Seção 1: Documentos Vencidos
+        st.header("Documentos Vencidos")
+        if vencidos["total"]:
+            st.warning(f"**{vencidos['total']} documento(s) está(ão) VENCIDO(S)!** ")
+            mostrar_grupo(vencidos, "VENCIDO")
+        else:
+            st.success("Nenhum documento encontrado com status VENCIDO. ")
+
+        st.markdown("---")
+
+        # Seção 2: Próximos Vencimentos
+        st.header("Próximos Vencimentos")
+        if a_vencer["total"]:
+            st.info(f"**{a_vencer['total']} documento(s)** próximo(s) de vencer. ")
+            mostrar_grupo(a_vencer, "A_VENCER")
+        else:
+            st.info("Nenhum documento encontrado com status A VENCER. ")
+
+st.markdown("---")
 
-else:
-    st.success("Tudo certo! Não há alertas de vencimento.")
\ No newline at end of file
+# Seção 3: Todos os documentos (transmitidos em NDJSON, exibidos conforme chegam)
+with st.expander("Listagem completa de documentos"):
+    filtro_titulo = st.text_input("Filtrar por título", key="listagem_titulo")
+    if st.button("Carregar listagem", key="listagem_carregar"):
+        mostrar_listagem_completa(filtro_titulo)
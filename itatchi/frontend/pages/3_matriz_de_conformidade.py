@@ -0,0 +1,91 @@
+# itatchi/frontend/pages/3_matriz_de_conformidade.py
+# Página Streamlit com a matriz de conformidade (filial × tipo de documento obrigatório).
+
+import os
+import streamlit as st
+import requests
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+# pandas só é importado ao montar a tabela (sem matriz, a página abre sem ele)
+if TYPE_CHECKING:
+    import pandas as pd
+
+from utils.ui_helpers import cabecalhos_cliente, load_global_style, setup_logo
+
+# --- CONFIGURAÇÃO GLOBAL / CSS E LOGO ---
+setup_logo()
+load_global_style()
+
+API_URL: str = os.getenv("API_URL", "http://localhost:5000")
+
+# Rótulo exibido e estilo de cada estado da célula
+ROTULOS: Dict[str, str] = {
+    "VALIDO": "✅ Válido",
+    "A_VENCER": "⚠️ A vencer",
+    "AUSENTE": "❌ Ausente",
+}
+ESTILOS: Dict[str, str] = {
+    ROTULOS["VALIDO"]: "background-color: #d4edda; color: #155724;",
+    ROTULOS["A_VENCER"]: "background-color: #ffecb3; color: #ff9800; font-weight: bold;",
+    ROTULOS["AUSENTE"]: "background-color: #ffcccc; color: #cc0000; font-weight: bold;",
+}
+
+st.title("Matriz de Conformidade")
+st.caption("Documentos obrigatórios por filial: válido, próximo ao vencimento ou ausente/vencido.")
+st.markdown("---")
+
+# --- FUNÇÕES DE BUSCA E ESTILO ---
+
+def carregar_matriz() -> Optional[Dict[str, Any]]:
+    """Busca a matriz já agregada no backend (nenhum documento individual é baixado)."""
+    try:
+        response = requests.get(f"{API_URL}/conformidade/matriz", headers=cabecalhos_cliente(), timeout=10)
+        if response.status_code == 200:
+            return response.json()
+        st.error(f"Erro ao buscar a matriz de conformidade (Código {response.status_code}).")
+    except requests.exceptions.ConnectionError:
+        st.error("Erro de Conexão. Verifique se o Backend Flask está rodando em http://localhost:5000.")
+    return None
+
+def estilo_matriz(df: "pd.DataFrame") -> "pd.DataFrame":
+    """Estilo da tabela inteira de uma vez (substituição vetorizada, sem função por célula)."""
+    return df.replace(ESTILOS)
+
+def montar_tabela(matriz: Dict[str, Any]) -> "pd.DataFrame":
+    """Filiais nas linhas, tipos obrigatórios nas colunas, rótulos no lugar dos estados."""
+    import pandas as pd
+
+    colunas = [f"{t['nome']} ({t['categoria']})" for t in matriz["tipos"]]
+    df = pd.DataFrame(
+        matriz["celulas"],
+        index=[f["nome"] for f in matriz["filiais"]],
+        columns=colunas,
+    ).replace(ROTULOS)
+    df.index.name = "Filial"
+    return df
+
+# --- LÓGICA PRINCIPAL ---
+
+matriz = carregar_matriz()
+
+if matriz is not None:
+    if not matriz["filiais"] or not matriz["tipos"]:
+        st.info("Nenhuma filial ou tipo de documento obrigatório cadastrado.")
+    else:
+        resumo: Dict[str, int] = matriz["resumo"]
+        col_ok, col_alerta, col_ausente = st.columns(3)
+        col_ok.metric("Válidos", resumo.get("VALIDO", 0))
+        col_alerta.metric("A vencer", resumo.get("A_VENCER", 0))
+        col_ausente.metric("Ausentes / vencidos", resumo.get("AUSENTE", 0))
+
+        df = montar_tabela(matriz)
+
+        st.dataframe(
+            df.style.apply(estilo_matriz, axis=None),
+            use_container_width=True,
+        )
+
+        if resumo.get("AUSENTE", 0):
+            st.warning(f"**{resumo['AUSENTE']} documento(s) obrigatório(s)** ausente(s) ou vencido(s).")
+        else:
+            st.success("Todas as filiais possuem os documentos obrigatórios.")
\ No newline at end of file
@@ -0,0 +1,137 @@
+# itatchi/frontend/pages/4_tendencias.py
+# Página Streamlit com a evolução diária de documentos vencidos e a vencer (por filial e categoria).
+
+import os
+import streamlit as st
+import requests
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+# pandas só é importado ao montar o gráfico (sem fotografias no período, a página abre sem ele)
+if TYPE_CHECKING:
+    import pandas as pd
+
+from utils.api_documentos import carregar_tendencias
+from utils.referencias import obter_referencias, opcoes_categorias, opcoes_filiais
+from utils.ui_helpers import load_global_style, setup_logo
+
+# --- CONFIGURAÇÃO GLOBAL / CSS E LOGO ---
+setup_logo()
+load_global_style()
+
+API_URL: str = os.getenv("API_URL", "http://localhost:5000")
+
+STATUS: Dict[str, str] = {
+    "VENCIDO": "Vencidos",
+    "A_VENCER": "A vencer",
+    "VIGENTE": "Vigentes",
+    "SEM_VALIDADE": "Sem validade",
+}
+QUEBRAS: Dict[str, Optional[str]] = {"Total": None, "Filial": "filial", "Categoria": "categoria"}
+
+st.title("Tendências")
+st.caption(
+    "Quantidade de documentos em cada status, dia a dia. Os números vêm da fotografia diária do backend; "
+    "datas anteriores à primeira fotografia são estimadas a partir da validade."
+)
+st.markdown("---")
+
+referencias: Dict[str, Any] = obter_referencias(API_URL)
+OPCOES_FILIAIS: Dict[int, str] = opcoes_filiais(referencias)
+
+# --- FILTROS ---
+hoje = date.today()
+col_periodo, col_status = st.columns([1, 2])
+periodo = col_periodo.date_input("Período", value=(hoje - timedelta(days=364), hoje), max_value=hoje)
+status_escolhidos: List[str] = col_status.multiselect(
+    "Status", options=list(STATUS), default=["VENCIDO", "A_VENCER"], format_func=STATUS.get
+)
+
+col_quebra, col_filial, col_categoria = st.columns(3)
+quebra: str = col_quebra.radio("Quebrar por", options=list(QUEBRAS), horizontal=True)
+filial_id: Optional[int] = col_filial.selectbox(
+    "Filial", options=[None, *OPCOES_FILIAIS], format_func=lambda i: "Todas" if i is None else OPCOES_FILIAIS[i]
+)
+categoria: str = col_categoria.selectbox("Categoria", options=opcoes_categorias(referencias))
+
+# --- BUSCA ---
+
+@st.cache_data(ttl=300, show_spinner=False)
+def buscar_tendencias(
+    inicio: str, fim: str, status: Tuple[str, ...], agrupar: Optional[str],
+    filial_id: Optional[int], categoria: Optional[str],
+) -> List[Dict[str, Any]]:
+    """A série muda uma vez a cada fotografia do backend: 5 minutos de cache por combinação de filtros."""
+    return carregar_tendencias(API_URL, inicio, fim, list(status), agrupar, filial_id, categoria)
+
+def montar_grafico(linhas: List[Dict[str, Any]], agrupar: Optional[str]) -> "pd.DataFrame":
+    """Uma coluna por série (status, ou status · filial/categoria) e uma linha por dia."""
+    import pandas as pd
+
+    df = pd.DataFrame(linhas)
+    df["serie"] = df["status"].map(STATUS)
+    if agrupar == "filial":
+        df["serie"] += " · " + df["filial_id"].map(lambda i: OPCOES_FILIAIS.get(i, f"Filial {i}"))
+    elif agrupar == "categoria":
+        df["serie"] += " · " + df["categoria"]
+    df["data"] = pd.to_datetime(df["data"])
+
+    grafico = df.pivot_table(index="data", columns="serie", values="quantidade", aggfunc="sum")
+    # Dia sem linha de um status significa zero documentos nele (a tabela não grava zeros)
+    dias = pd.date_range(grafico.index.min(), grafico.index.max(), freq="D")
+    return grafico.reindex(dias).fillna(0).astype(int)
+
+def comparar_com_30_dias(linhas: List[Dict[str, Any]], status: List[str]) -> Dict[str, Tuple[int, Optional[int]]]:
+    """(quantidade no último dia, quantidade 30 dias antes ou None) de cada status, somando as séries."""
+    import pandas as pd
+
+    por_status = pd.DataFrame(linhas).pivot_table(
+        index="data", columns="status", values="quantidade", aggfunc="sum"
+    ).reindex(columns=status).fillna(0)
+    ultimo = por_status.index.max()
+    anterior = (pd.Timestamp(ultimo) - pd.Timedelta(days=30)).date().isoformat()
+    return {
+        s: (int(por_status.at[ultimo, s]), int(por_status.at[anterior, s]) if anterior in por_status.index else None)
+        for s in status
+    }
+
+# --- LÓGICA PRINCIPAL ---
+
+if not isinstance(periodo, tuple) or len(periodo) != 2:
+    st.info("Selecione a data inicial e a final do período.")
+elif not status_escolhidos:
+    st.info("Selecione ao menos um status.")
+else:
+    agrupar = QUEBRAS[quebra]
+    try:
+        linhas = buscar_tendencias(
+            periodo[0].isoformat(), periodo[1].isoformat(), tuple(status_escolhidos), agrupar,
+            filial_id, None if categoria == "Todas" else categoria,
+        )
+    except requests.exceptions.ConnectionError:
+        st.error("Erro de Conexão. Verifique se o Backend Flask está rodando em http://localhost:5000.")
+        linhas = None
+    except requests.exceptions.RequestException as e:
+        st.error(f"Erro ao buscar as tendências: {e}")
+        linhas = None
+
+    if linhas is not None and not linhas:
+        st.info("Nenhuma fotografia no período selecionado.")
+    elif linhas:
+        # Último dia do período x 30 dias antes, somando as séries de cada status
+        comparacao = comparar_com_30_dias(linhas, status_escolhidos)
+        colunas_metricas = st.columns(len(status_escolhidos))
+        for coluna, status in zip(colunas_metricas, status_escolhidos):
+            atual, base = comparacao[status]
+            coluna.metric(
+                STATUS[status], atual,
+                delta=None if base is None else atual - base,
+                delta_color="off" if status == "VIGENTE" else "inverse",
+                help="Variação em relação a 30 dias antes.",
+            )
+
+        grafico = montar_grafico(linhas, agrupar)
+        st.line_chart(grafico, use_container_width=True)
+
+        with st.expander("Ver tabela"):
+            st.dataframe(grafico.sort_index(ascending=False), use_container_width=True)
@@ -0,0 +1,100 @@
+# itatchi/frontend/utils/api_documentos.py
+# Clientes da listagem completa (GET /documentos em NDJSON, lida sob demanda), dos alertas paginados (GET /alertas)
+# e das séries de tendência (GET /tendencias).
+
+import json
+import requests
+from typing import Any, Dict, Iterator, List, Optional
+
+from utils.ui_helpers import cabecalhos_cliente
+
+MIMETYPE_NDJSON = "application/x-ndjson"
+
+
+def iterar_documentos(
+    api_url: str,
+    status: Optional[str] = None,
+    titulo: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Percorre os documentos à medida que chegam do backend, um por linha NDJSON,
+    sem esperar (nem guardar) a resposta inteira.
+
+    Raises:
+        requests.exceptions.RequestException: Em falha de conexão ou HTTP != 200.
+    """
+    params = {k: v for k, v in {"status": status, "titulo": titulo}.items() if v}
+    with requests.get(
+        f"{api_url}/documentos",
+        params=params,
+        headers={"Accept": MIMETYPE_NDJSON, **cabecalhos_cliente()},
+        stream=True,
+        timeout=(5, 60),
+    ) as resp:
+        resp.raise_for_status()
+
+        # Backend antigo (sem streaming) responde JSON normal: mesmo resultado, só que de uma vez
+        if not resp.headers.get("Content-Type", "").startswith(MIMETYPE_NDJSON):
+            yield from resp.json()
+            return
+
+        resp.encoding = "utf-8"
+        for linha in resp.iter_lines(decode_unicode=True):
+            if linha:
+                yield json.loads(linha)
+
+
+def carregar_alertas(
+    api_url: str,
+    pagina_vencidos: int = 1,
+    pagina_a_vencer: int = 1,
+    por_pagina: int = 25,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Uma página de cada grupo de alerta (GET /alertas): {"VENCIDO": {itens, total, ...}, "A_VENCER": {...}}.
+
+    Raises:
+        requests.exceptions.RequestException: Em falha de conexão ou HTTP != 200.
+    """
+    resp = requests.get(
+        f"{api_url}/alertas",
+        params={"pagina_vencidos": pagina_vencidos, "pagina_a_vencer": pagina_a_vencer, "por_pagina": por_pagina},
+        headers=cabecalhos_cliente(),
+        timeout=10,
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def carregar_tendencias(
+    api_url: str,
+    inicio: str,
+    fim: str,
+    status: List[str],
+    agrupar: Optional[str] = None,
+    filial_id: Optional[int] = None,
+    categoria: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Contagens diárias por status no intervalo (GET /tendencias), já agregadas no backend:
+    [{data, status, [filial_id | categoria], quantidade}].
+
+    Raises:
+        requests.exceptions.RequestException: Em falha de conexão ou HTTP != 200.
+    """
+    params = {
+        "inicio": inicio,
+        "fim": fim,
+        "status": ",".join(status),
+        "agrupar": agrupar,
+        "filial_id": filial_id,
+        "categoria": categoria,
+    }
+    resp = requests.get(
+        f"{api_url}/tendencias",
+        params={k: v for k, v in params.items() if v},
+        headers=cabecalhos_cliente(),
+        timeout=10,
+    )
+    resp.raise_for_status()
+    return resp.json()["linhas"]
@@ -0,0 +1,80 @@
+# itatchi/frontend/utils/referencias.py
+# Cache por processo dos dados de referência (/referencias), revalidado por ETag.
+
+import re
+import threading
+import time
+import streamlit as st
+import requests
+from typing import Any, Dict, List, Optional
+
+# Usado se o backend não mandar Cache-Control
+MAX_AGE_PADRAO = 300
+
+MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class CacheReferencias:
+    """
+    Uma cópia dos dados de referência para TODAS as sessões do processo Streamlit.
+
+    Dentro do max-age nenhuma requisição é feita. Depois dele, a cópia é revalidada
+    com If-None-Match: um 304 só renova o prazo (sem corpo, sem reprocessar nada).
+    Se o backend estiver fora, continua servindo a última cópia conhecida.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.dados: Optional[Dict[str, Any]] = None
+        self.etag: Optional[str] = None
+        self.expira_em: float = 0.0
+
+    def obter(self, api_url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self.dados is not None and time.monotonic() < self.expira_em:
+                return self.dados
+
+            headers: Dict[str, str] = {"If-None-Match": self.etag} if self.etag else {}
+            try:
+                resp = requests.get(f"{api_url}/referencias", headers=headers, timeout=5)
+            except requests.exceptions.RequestException:
+                return self.dados
+
+            if resp.status_code == 200:
+                self.dados = resp.json()
+                self.etag = resp.headers.get("ETag")
+            elif resp.status_code != 304:
+                return self.dados
+
+            achado = MAX_AGE_RE.search(resp.headers.get("Cache-Control", ""))
+            self.expira_em = time.monotonic() + (int(achado.group(1)) if achado else MAX_AGE_PADRAO)
+            return self.dados
+
+
+@st.cache_resource
+def _cache_referencias() -> CacheReferencias:
+    """Instância única por processo (compartilhada entre sessões e reruns)."""
+    return CacheReferencias()
+
+
+def obter_referencias(api_url: str) -> Dict[str, Any]:
+    """
+    Filiais, tipos e categorias cadastrados no backend.
+    Retorna listas vazias se o backend nunca respondeu (chamador decide o aviso).
+    """
+    return _cache_referencias().obter(api_url) or {"filiais": [], "tipos": [], "categorias": []}
+
+
+def opcoes_filiais(referencias: Dict[str, Any]) -> Dict[int, str]:
+    """{id: nome} para selectboxes."""
+    return {f["id"]: f["nome"] for f in referencias["filiais"]}
+
+
+def opcoes_tipos(referencias: Dict[str, Any]) -> Dict[int, Dict[str, str]]:
+    """{id: {nome, categoria}} para selectboxes."""
+    return {t["id"]: {"nome": t["nome"], "categoria": t["categoria"]} for t in referencias["tipos"]}
+
+
+def opcoes_categorias(referencias: Dict[str, Any]) -> List[str]:
+    """Categorias com a opção 'Todas' (sem filtro) no início."""
+    return ["Todas", *referencias["categorias"]]
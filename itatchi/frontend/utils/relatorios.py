@@ -0,0 +1,56 @@
+# itatchi/frontend/utils/relatorios.py
+# Cliente da fila de relatórios do backend (submete, acompanha e baixa o Excel).
+
+import time
+import requests
+from typing import Any, Callable, Dict, Optional
+
+from utils.ui_helpers import cabecalhos_cliente
+
+# Estados finais de um job no backend
+FINALIZADOS = ("CONCLUIDO", "ERRO")
+
+
+def submeter_relatorio(api_url: str, filtros: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pede o relatório ao backend e devolve o job (pronto na hora se já estiver em cache).
+
+    Raises:
+        requests.exceptions.RequestException: Em falha de conexão ou HTTP de erro.
+    """
+    resp = requests.post(f"{api_url}/relatorios", json=filtros, headers=cabecalhos_cliente(), timeout=10)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def acompanhar_relatorio(
+    api_url: str,
+    job_id: str,
+    ao_progredir: Callable[[Dict[str, Any]], None],
+    espera_max: float = 3.0,
+    intervalo: float = 0.5,
+) -> Optional[Dict[str, Any]]:
+    """
+    Consulta o job até terminar ou até 'espera_max' segundos (curto: o rerun do
+    Streamlit fica bloqueado enquanto isso), chamando 'ao_progredir' a cada leitura.
+    Retorna o job final, ou None se ainda não terminou; quem chama oferece o
+    "Atualizar" para a próxima consulta.
+    """
+    limite = time.monotonic() + espera_max
+    while True:
+        resp = requests.get(f"{api_url}/relatorios/{job_id}", headers=cabecalhos_cliente(), timeout=10)
+        resp.raise_for_status()
+        job: Dict[str, Any] = resp.json()
+        ao_progredir(job)
+        if job["status"] in FINALIZADOS:
+            return job
+        if time.monotonic() >= limite:
+            return None
+        time.sleep(intervalo)
+
+
+def baixar_relatorio(api_url: str, job: Dict[str, Any]) -> bytes:
+    """Conteúdo do .xlsx de um job CONCLUIDO."""
+    resp = requests.get(f"{api_url}{job['arquivo_url']}", headers=cabecalhos_cliente(), timeout=60)
+    resp.raise_for_status()
+    return resp.content
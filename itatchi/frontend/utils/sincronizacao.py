@@ -0,0 +1,46 @@
+# itatchi/frontend/utils/sincronizacao.py
+# Cópia local dos documentos (session_state) mantida por deltas do endpoint /documentos/alteracoes.
+
+import streamlit as st
+import requests
+from typing import Any, Dict, Union
+
+from utils.ui_helpers import cabecalhos_cliente
+
+# Chaves usadas no session_state
+CHAVE_DOCUMENTOS = "docs_locais"
+CHAVE_TOKEN = "docs_token"
+
+
+def sincronizar_documentos(api_url: str) -> Dict[int, Dict[str, Any]]:
+    """
+    Atualiza a cópia local de documentos com o que mudou no backend e a retorna.
+
+    Na primeira chamada da sessão (token 0) o backend devolve o retrato completo;
+    nas seguintes, apenas os documentos alterados e os ids removidos (tombstones).
+    O token é opaco: número com um banco, "t1-t2-..." com sharding no backend.
+
+    Raises:
+        requests.exceptions.RequestException: Em falha de conexão ou HTTP != 200.
+    """
+    documentos: Dict[int, Dict[str, Any]] = st.session_state.setdefault(CHAVE_DOCUMENTOS, {})
+    token: Union[int, str] = st.session_state.get(CHAVE_TOKEN, 0)
+
+    resp = requests.get(
+        f"{api_url}/documentos/alteracoes", params={"desde": token},
+        headers=cabecalhos_cliente(), timeout=10
+    )
+    resp.raise_for_status()
+    data: Dict[str, Any] = resp.json()
+
+    # Retrato completo substitui a cópia local (ex: primeira carga ou banco recriado)
+    if data.get("completo"):
+        documentos.clear()
+
+    for doc in data.get("documentos", []):
+        documentos[doc["id"]] = doc
+    for doc_id in data.get("removidos", []):
+        documentos.pop(doc_id, None)
+
+    st.session_state[CHAVE_TOKEN] = data.get("token", token)
+    return documentos
\ No newline at end of file
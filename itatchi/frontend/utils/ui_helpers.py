@@ -4,8 +4,9 @@
 import streamlit as st
 from pathlib import Path
 import base64
-from typing import Optional
+from typing import Dict, Optional
 import os
+import uuid
 
 # Define o diretório base como a pasta "frontend"
 BASE_DIR = Path(__file__).resolve().parent.parent      # .../itatchi/frontend
@@ -13,20 +14,43 @@ ASSETS_DIR = BASE_DIR / "assets"                       # .../itatchi/frontend/as
 # Caminho da logo
 LOGO_PATH = os.path.join(ASSETS_DIR, "logo_itatchi.png")
 
+# ----------------------------------
+# 0. LEITURA DOS ASSETS (CACHE POR PROCESSO)
+# ----------------------------------
+# Os arquivos são lidos uma vez por processo e compartilhados entre sessões e reruns.
+# O mtime entra na chave do cache: editar o arquivo invalida a cópia sem reiniciar.
+def _mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+@st.cache_resource(show_spinner=False)
+def _ler_css(path: str, mtime: Optional[float]) -> Optional[str]:
+    if mtime is None:
+        return None
+    with open(path, encoding="utf-8") as f:
+        return f"<style>{f.read()}</style>"
+
+@st.cache_resource(show_spinner=False)
+def _ler_imagem_b64(path: str, mtime: Optional[float]) -> Optional[str]:
+    if mtime is None:
+        return None
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode("utf-8")
+
 # ----------------------------------
 # 1. FUNÇÃO PARA APLICAR O CSS GLOBAL
 # ----------------------------------
 def load_global_style():
-    """Carrega o arquivo style.css e aplica o CSS customizado via st.markdown."""
+    """Aplica o style.css via st.markdown (o arquivo é lido uma vez por processo)."""
     css_path = BASE_DIR / "style.css"
 
-    try:
-        # Abre e lê o arquivo CSS
-        with open(css_path, encoding="utf-8") as f:
-            css = f"<style>{f.read()}</style>"
-            st.markdown(css, unsafe_allow_html=True)
-    except FileNotFoundError:
+    css = _ler_css(str(css_path), _mtime(css_path))
+    if css is None:
         st.warning(f"⚠️ Arquivo CSS não encontrado: {css_path}")
+        return
+    st.markdown(css, unsafe_allow_html=True)
 
 # ----------------------------------
 # 2. FUNÇÃO PARA CARREGAR IMAGEM EM BASE64
@@ -34,6 +58,7 @@ def load_global_style():
 def load_image_b64(filename: str) -> Optional[str]:
     """
     Carrega uma imagem da pasta 'assets' e retorna seu conteúdo em formato Base64.
+    A codificação é feita uma vez por processo (cache compartilhado entre sessões).
     
     Args:
         filename: O nome do arquivo de imagem (ex: 'logo.png').
@@ -42,13 +67,10 @@ def load_image_b64(filename: str) -> Optional[str]:
         A string Base64 da imagem, ou None se o arquivo não for encontrado.
     """
     path = ASSETS_DIR / filename
-    try:
-        # Abre o arquivo em modo binário (rb) e codifica para Base64
-        with open(path, "rb") as f:
-            return base64.b64encode(f.read()).decode("utf-8")
-    except FileNotFoundError:
+    imagem = _ler_imagem_b64(str(path), _mtime(path))
+    if imagem is None:
         st.warning(f"⚠️ Imagem não encontrada: {path}")
-        return None
+    return imagem
     
 # ----------------------------------
 # 3. FUNÇÃO PARA EXIBIR A LOGO
@@ -68,4 +90,16 @@ def setup_logo():
         st.sidebar.warning(f"⚠️ Arquivo da logo não encontrado em: {LOGO_PATH}")
         
     # Também configura a página aqui para garantir que st.set_page_config seja chamado primeiro
-    st.set_page_config(layout="wide", page_title="Itatchi - Gerenciamento de Documentos")
\ No newline at end of file
+    st.set_page_config(layout="wide", page_title="Itatchi - Gerenciamento de Documentos")
+
+# ----------------------------------
+# 4. IDENTIFICAÇÃO DA SESSÃO NO BACKEND
+# ----------------------------------
+def cabecalhos_cliente() -> Dict[str, str]:
+    """
+    Header X-Cliente-Id com um id por sessão do navegador. Todas as sessões saem do
+    mesmo IP (o servidor Streamlit), então é ele que o controle de admissão do
+    backend usa para limitar requisições simultâneas por usuário.
+    """
+    cliente_id: str = st.session_state.setdefault("cliente_id", uuid.uuid4().hex)
+    return {"X-Cliente-Id": cliente_id}
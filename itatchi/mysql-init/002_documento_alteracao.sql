@@ -0,0 +1,19 @@
+-- SISTEMA ITATCHI - Feed incremental de alterações
+
+USE itatchi_db;
+
+-- 7. Tabela: documento_alteracao
+-- Log sequencial de alterações em documentos. O id auto-incremento é o token
+-- monotônico usado por GET /documentos/alteracoes?desde=<token>.
+-- Sem FK para documento: a entrada precisa sobreviver à remoção (tombstone).
+CREATE TABLE documento_alteracao (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    documento_id INT NOT NULL,
+    operacao ENUM('INSERIDO','ATUALIZADO','STATUS','REMOVIDO') NOT NULL,
+    status VARCHAR(20),
+    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_alteracao_documento (documento_id)
+);
+
+-- Acelera a busca por documentos com status desatualizado
+CREATE INDEX idx_documento_validade_status ON documento (validade, status_calc);
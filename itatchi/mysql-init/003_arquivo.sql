@@ -0,0 +1,17 @@
+-- SISTEMA ITATCHI - Armazenamento de arquivos por conteúdo (SHA-256)
+
+USE itatchi_db;
+
+-- 8. Tabela: arquivo
+-- Um registro por conteúdo distinto. O arquivo em si fica em ARQUIVOS_DIR/ab/cd/<sha256>.
+-- versao.caminho_arquivo e documento.caminho_atual referenciam o blob como 'sha256:<hex>'.
+CREATE TABLE arquivo (
+    sha256 CHAR(64) PRIMARY KEY,
+    tamanho BIGINT NOT NULL,
+    tipo_conteudo VARCHAR(100),
+    nome_original VARCHAR(255),
+    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Histórico de versões é sempre consultado por documento
+CREATE INDEX idx_versao_documento ON versao (documento_id);
@@ -0,0 +1,41 @@
+-- SISTEMA ITATCHI - Vínculos indexados e rollup de conformidade por entidade
+
+USE itatchi_db;
+
+-- Consultas por entidade e por documento usam índices (sem varrer a tabela)
+CREATE INDEX idx_vinculo_alvo ON vinculo (tipo_alvo, alvo_id);
+CREATE INDEX idx_vinculo_documento ON vinculo (documento_id);
+
+-- 9. Tabela: conformidade_entidade
+-- Uma linha por entidade vinculada, mantida a cada escrita de documento/vínculo.
+-- Responde "o veículo X está em conformidade?" pela chave primária.
+CREATE TABLE conformidade_entidade (
+    tipo_alvo ENUM('MOTORISTA','VEICULO','LOCAL') NOT NULL,
+    alvo_id VARCHAR(100) NOT NULL,
+    pior_status ENUM('VIGENTE','A_VENCER','VENCIDO','SEM_VALIDADE'),
+    proximo_vencimento DATE,
+    total_documentos INT NOT NULL DEFAULT 0,
+    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (tipo_alvo, alvo_id)
+);
+
+-- Carga inicial do rollup para os vínculos já existentes (mesma regra de
+-- logic/conformidade.recalcular_entidades: pior status pela gravidade
+-- SEM_VALIDADE < VIGENTE < A_VENCER < VENCIDO e a menor validade a partir de hoje)
+INSERT INTO conformidade_entidade (tipo_alvo, alvo_id, pior_status, proximo_vencimento, total_documentos)
+SELECT
+    v.tipo_alvo,
+    v.alvo_id,
+    ELT(MAX(CASE d.status_calc
+                WHEN 'SEM_VALIDADE' THEN 1
+                WHEN 'A_VENCER' THEN 3
+                WHEN 'VENCIDO' THEN 4
+                ELSE 2
+            END),
+        'SEM_VALIDADE', 'VIGENTE', 'A_VENCER', 'VENCIDO'),
+    MIN(CASE WHEN d.validade >= CURDATE() THEN d.validade END),
+    COUNT(d.id)
+FROM vinculo v
+JOIN documento d ON d.id = v.documento_id
+WHERE v.alvo_id IS NOT NULL
+GROUP BY v.tipo_alvo, v.alvo_id;
@@ -0,0 +1,6 @@
+-- SISTEMA ITATCHI - Matriz de conformidade por filial
+
+USE itatchi_db;
+
+-- Agregação filial × tipo da matriz (/conformidade/matriz) lê só o índice
+CREATE INDEX idx_documento_filial_tipo_status ON documento (filial_id, tipo_id, status_calc);
@@ -0,0 +1,8 @@
+-- SISTEMA ITATCHI - Busca textual indexada
+
+USE itatchi_db;
+
+-- Índice FULLTEXT usado por GET /documentos/busca (MATCH ... AGAINST).
+-- O InnoDB mantém o índice a cada INSERT/UPDATE, sem rotina de reindexação.
+ALTER TABLE documento
+    ADD FULLTEXT INDEX ft_documento_busca (titulo, numero, orgao_emissor, observacoes);
@@ -0,0 +1,10 @@
+-- SISTEMA ITATCHI - Renovação em lote (POST /documentos/renovacao)
+
+USE itatchi_db;
+
+-- Estado anterior do documento guardado no histórico a cada renovação
+ALTER TABLE versao
+    ADD COLUMN emissao_anterior DATE NULL,
+    ADD COLUMN validade_anterior DATE NULL,
+    ADD COLUMN status_anterior VARCHAR(20) NULL;
+
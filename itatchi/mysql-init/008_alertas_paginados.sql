@@ -0,0 +1,7 @@
+-- SISTEMA ITATCHI - Central de Alertas paginada
+
+USE itatchi_db;
+
+-- Página de um grupo (/alertas: status = ? ORDER BY validade, id LIMIT n) e o total
+-- do grupo saem do índice, sem ordenar todos os documentos vencidos a cada página
+CREATE INDEX idx_documento_status_validade ON documento (status_calc, validade, id);
@@ -0,0 +1,17 @@
+-- SISTEMA ITATCHI - Fotografia diária de status (tendências)
+
+USE itatchi_db;
+
+-- 10. Tabela: status_diario
+-- Uma linha por (data, filial, categoria, status) com a contagem de documentos do dia.
+-- Gravada uma vez por dia (e preenchida para trás a partir da validade na primeira execução);
+-- /tendencias lê qualquer intervalo de datas como uma faixa da chave primária.
+-- Sem FK para filial: o histórico continua legível mesmo se a filial for removida.
+CREATE TABLE status_diario (
+    data DATE NOT NULL,
+    filial_id INT NOT NULL,
+    categoria VARCHAR(50) NOT NULL,
+    status ENUM('VIGENTE','A_VENCER','VENCIDO','SEM_VALIDADE') NOT NULL,
+    quantidade INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (data, filial_id, categoria, status)
+);
@@ -0,0 +1,16 @@
+-- SISTEMA ITATCHI - Datas já fotografadas (tendências)
+
+USE itatchi_db;
+
+-- 11. Tabela: status_diario_data
+-- Uma linha por data gravada na fotografia diária, mesmo quando não havia nenhum
+-- documento (status_diario não grava zeros); o backfill consulta esta tabela para
+-- saber quais datas faltam, em vez de recalcular os dias vazios a cada rodada.
+CREATE TABLE status_diario_data (
+    data DATE PRIMARY KEY,
+    gravado_em DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Datas que já têm fotografia antes desta tabela existir
+INSERT INTO status_diario_data (data)
+SELECT DISTINCT data FROM status_diario;